@@ -0,0 +1,167 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/benchmarks/sync_benchmark.py
+"""
+Banc d'essai de la synchronisation, sans Supabase : le serveur est un fichier SQLite (SQLiteTransport).
+
+    python -m benchmarks.sync_benchmark --rows 10000 --rows 100000 --rows 1000000
+
+Pour chaque volume, un poste A crée N lignes modifiées et les envoie (sync_up), puis un poste B,
+vierge, les reçoit toutes (sync_down). Ces deux cycles sont mesurés sans instantané ni vérification
+d'empreintes. Affiche le débit (lignes/s), le pic de mémoire Python (tracemalloc, désactivable avec
+--no-memory car il ralentit la mesure) et la durée par table.
+Un scénario séparé mesure ensuite l'initialisation par instantané : publication par le poste A,
+puis chargement par un poste C vierge (désactivable avec --no-snapshot).
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from database.connection_pool import PROJECT_ROOT, ConnectionPool
+from database.migrateur import appliquer_migrations
+from services import sync_service
+from services.sync_service import SyncService
+from services.sync_transport import SQLiteTransport
+
+NB_TYPES, NB_CHAMBRES, NB_PRODUITS = 5, 50, 20
+
+
+def creer_base_locale(db_path):
+    """Crée une base locale neuve (schéma + migrations) et retourne son pool."""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    local_pool = ConnectionPool(db_path)
+    conn = local_pool.connection(create=True)
+    try:
+        with open(os.path.join(PROJECT_ROOT, "database", "schema_hotel.sql"), "r", encoding="utf-8") as f:
+            conn.executescript(f.read())
+        appliquer_migrations(conn)
+    finally:
+        conn.close()
+    return local_pool
+
+
+def generer_changements(local_pool, nb_lignes):
+    """
+    Insère environ `nb_lignes` lignes cohérentes (clés étrangères respectées), réparties comme
+    l'activité réelle : clients, réservations, commandes et surtout lignes de commande.
+    Les triggers de l'outbox les inscrivent toutes comme changements à envoyer.
+    """
+    reste = max(nb_lignes - NB_TYPES - NB_CHAMBRES - NB_PRODUITS, 0)
+    nb_clients = nb_reservations = nb_commandes = max(reste // 5, 1)
+    nb_items = max(reste - 3 * nb_clients, 1)
+
+    with local_pool.transaction() as conn:
+        conn.executemany("INSERT INTO types_chambre (id, nom, prix_par_nuit) VALUES (?, ?, ?)",
+                         ((i, f"Type {i}", 10000 + 5000 * i) for i in range(1, NB_TYPES + 1)))
+        conn.executemany("INSERT INTO chambres (id, numero, type_id) VALUES (?, ?, ?)",
+                         ((i, str(100 + i), 1 + i % NB_TYPES) for i in range(1, NB_CHAMBRES + 1)))
+        conn.executemany("INSERT INTO produits (id, nom, categorie, prix_unitaire) VALUES (?, ?, 'Snack', ?)",
+                         ((i, f"Produit {i}", 500 + 100 * i) for i in range(1, NB_PRODUITS + 1)))
+        conn.executemany("INSERT INTO clients (id, nom, prenom, email) VALUES (?, ?, ?, ?)",
+                         ((i, f"Nom {i}", f"Prénom {i}", f"client{i}@exemple.com") for i in range(1, nb_clients + 1)))
+        conn.executemany("""
+            INSERT INTO reservations (id, client_id, chambre_id, date_arrivee, date_depart, statut, prix_total_nuitee_estime)
+            VALUES (?, ?, ?, '2025-01-01', '2025-01-03', 'check-out', 30000)
+        """, ((i, i, 1 + i % NB_CHAMBRES) for i in range(1, nb_reservations + 1)))
+        conn.executemany("INSERT INTO commandes (id, reservation_id, statut, lieu_consommation) VALUES (?, ?, 'Livré', 'Bar')",
+                         ((i, 1 + i % nb_reservations) for i in range(1, nb_commandes + 1)))
+        conn.executemany("""
+            INSERT INTO commande_items (id, commande_id, produit_id, quantite, prix_unitaire_capture)
+            VALUES (?, ?, ?, 1, 500)
+        """, ((i, 1 + i % nb_commandes, 1 + i % NB_PRODUITS) for i in range(1, nb_items + 1)))
+
+    return NB_TYPES + NB_CHAMBRES + NB_PRODUITS + nb_clients + nb_reservations + nb_commandes + nb_items
+
+
+def mesurer_cycle(service, memoire):
+    """Exécute un cycle complet de synchronisation ; retourne (résultat, durée en s, pic mémoire en octets)."""
+    if memoire:
+        tracemalloc.start()
+    debut = time.perf_counter()
+    resultat = service.synchronize()
+    duree = time.perf_counter() - debut
+    pic = 0
+    if memoire:
+        pic = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if not resultat.get("success"):
+        raise RuntimeError(resultat.get("error"))
+    return resultat, duree, pic
+
+
+def afficher(titre, nb_lignes, resultat, duree, pic):
+    print(f"\n  {titre} : {nb_lignes} lignes en {duree:.2f} s -> {nb_lignes / duree:,.0f} lignes/s"
+          + (f", pic mémoire {pic / 1024 / 1024:.1f} Mo" if pic else ""))
+    for table, t in resultat["timings"].items():
+        total = t.get("up", 0) + t.get("fetch", 0) + t.get("apply", 0)
+        if total >= 0.001:
+            print(f"    {table:<22} ↑ {t.get('up', 0):7.3f} s | ↓ {t.get('fetch', 0):7.3f} s + {t.get('apply', 0):7.3f} s")
+
+
+def mesurer_instantane(service_a, service_c, watermark):
+    """Mesure la publication d'un instantané par A puis son chargement par C ; retourne les deux durées."""
+    debut = time.perf_counter()
+    service_a.publish_snapshot(watermark)
+    publication = time.perf_counter() - debut
+    debut = time.perf_counter()
+    if service_c.bootstrap_from_snapshot() is None:
+        raise RuntimeError("Instantané non chargé par le poste vierge.")
+    return publication, time.perf_counter() - debut
+
+
+def executer(nb_lignes, dossier, memoire, instantane=True):
+    serveur = SQLiteTransport(os.path.join(dossier, "serveur.db"))
+    pool_a = creer_base_locale(os.path.join(dossier, "poste_a", "hotel.db"))
+    pool_b = creer_base_locale(os.path.join(dossier, "poste_b", "hotel.db"))
+    pool_c = creer_base_locale(os.path.join(dossier, "poste_c", "hotel.db"))
+    try:
+        nb_lignes = generer_changements(pool_a, nb_lignes)
+        print(f"\n=== {nb_lignes} lignes modifiées ===")
+
+        # Instantanés et vérification désactivés : seuls sync_up (A) et sync_down (B) sont mesurés.
+        service_a = SyncService(transport=serveur, local_pool=pool_a, snapshots=False, verification=False)
+        resultat, duree, pic = mesurer_cycle(service_a, memoire)
+        envoi = (resultat, duree, pic)
+
+        service_b = SyncService(transport=serveur, local_pool=pool_b, snapshots=False, verification=False)
+        resultat, duree, pic = mesurer_cycle(service_b, memoire)
+        reception = (resultat, duree, pic)
+
+        afficher("Envoi (poste A)", nb_lignes, *envoi)
+        afficher("Réception (poste B)", nb_lignes, *reception)
+
+        if instantane:
+            service_c = SyncService(transport=serveur, local_pool=pool_c)
+            publication, chargement = mesurer_instantane(service_a, service_c, service_a._get_last_sync_time())
+            taille = os.path.getsize(serveur.db_path + ".snapshot.gz")
+            print(f"\n  Instantané ({taille / 1024 / 1024:.1f} Mo compressé) : publication (poste A) {publication:.2f} s,"
+                  f" chargement (poste C) {chargement:.2f} s -> {nb_lignes / chargement:,.0f} lignes/s")
+    finally:
+        serveur.close()
+        pool_a.close_all()
+        pool_b.close_all()
+        pool_c.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai de la synchronisation (serveur SQLite local).")
+    parser.add_argument("--rows", type=int, action="append",
+                        help="Nombre de lignes modifiées (option répétable, défaut : 10000).")
+    parser.add_argument("--batch-size", type=int, default=sync_service.SYNC_BATCH_SIZE,
+                        help="Taille des lots envoyés par sync_up.")
+    parser.add_argument("--no-memory", action="store_true", help="Ne pas mesurer le pic mémoire (tracemalloc).")
+    parser.add_argument("--no-snapshot", action="store_true", help="Ne pas mesurer l'initialisation par instantané.")
+    args = parser.parse_args()
+
+    sync_service.SYNC_BATCH_SIZE = args.batch_size
+    for nb_lignes in args.rows or [10000]:
+        dossier = tempfile.mkdtemp(prefix="sync_bench_")
+        try:
+            executer(nb_lignes, dossier, not args.no_memory, not args.no_snapshot)
+        finally:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
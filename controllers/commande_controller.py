@@ -1,3 +1,4 @@
+from models.base_model import PAGE_SIZE, BaseModel
 from models.commande_model import CommandeModel
 
 
@@ -23,6 +24,18 @@ class CommandeController:
         except Exception as e:
             return {"success": False, "error": f"Erreur récupération commandes : {e}"}
 
+    @staticmethod
+    def liste_commandes_page(after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de commandes (keyset, voir CommandeModel.get_page).
+        `next` est la clé à passer en `after` pour la page suivante (None : dernière page).
+        """
+        try:
+            rows = CommandeModel.get_page(after, limit, filtre, ordre)
+            return {"success": True, "data": rows, "next": BaseModel.cle_suivante(rows, CommandeModel.CLE_PAGE, limit)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération commandes : {e}"}
+
 
     @staticmethod
     def modifier_statut(commande_id, nouveau_statut):
@@ -1,15 +1,10 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/controllers/facture_controller.py
 
+import json
 from datetime import date, datetime
+from models.base_model import BaseModel
 from models.facture_item_model import FactureItemModel
 from models.facture_model import FactureModel
-from models.reservation_model import ReservationModel
-from models.chambre_model import ChambreModel
-from controllers.hotel_info_controller import HotelInfoController
-from controllers.commande_controller import CommandeController
-from controllers.commande_item_controller import CommandeItemController
-# --- AJOUT : Importer le contrôleur des services demandés ---
-from controllers.service_demande_controller import ServiceDemandeController
 
 
 class FactureController:
@@ -35,6 +30,22 @@ class FactureController:
         except Exception as e:
             return {"success": False, "error": f"Erreur récupération facture : {e}"}
 
+    @staticmethod
+    def get_donnees_pdf(reservation_ids):
+        """Données des factures PDF de plusieurs réservations, chargées en lot (voir FactureModel.get_donnees_pdf)."""
+        try:
+            return {"success": True, "data": FactureModel.get_donnees_pdf(reservation_ids)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération des données des factures : {e}"}
+
+    @staticmethod
+    def reservations_facturees(debut, fin):
+        """Réservations facturées dont le départ tombe dans [debut, fin) (dates "AAAA-MM-JJ")."""
+        try:
+            return {"success": True, "data": FactureModel.reservations_facturees(debut, fin)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération des réservations facturées : {e}"}
+
     @staticmethod
     def mettre_a_jour_montants(facture_id, montant_total_ht, montant_total_tva, montant_total_ttc, montant_paye):
         if not facture_id or not isinstance(facture_id, int) or facture_id <= 0:
@@ -62,132 +73,219 @@ class FactureController:
 
 
     @staticmethod
-    def generer_et_mettre_a_jour_facture(reservation_id):
+    def calculer_facture(donnees):
+        """
+        Calcul pur (sans accès à la base) de la facture à partir des données agrégées
+        renvoyées par FactureModel.get_donnees_facturation.
+        Retourne (details, lignes) : le dictionnaire de détails affiché par l'UI et les lignes de facture.
+        """
+        tva_hebergement_rate = donnees["tva_hebergement"]
+        tva_restauration_rate = donnees["tva_restauration"]
+        # Pour l'instant, on applique la TVA de l'hébergement aux services.
+        # On pourrait ajouter un champ tva_services dans hotel_info pour plus de précision.
+        tva_services_rate = tva_hebergement_rate
+        tdt_par_personne = donnees["tdt_par_personne"]
+        prix_par_nuit = donnees["prix_par_nuit"]
+
+        # 1. Calculer les coûts HT
+        date_arrivee = datetime.fromisoformat(donnees["date_arrivee"]).date()
+        date_depart_effective = date.today() if donnees["statut"] == "check-in" else datetime.fromisoformat(
+            donnees["date_depart"]).date()
+        nb_nuits = max(1, (date_depart_effective - date_arrivee).days)
+        nb_adultes = donnees["nb_adultes"] if donnees["nb_adultes"] is not None else 1
+        montant_nuitee_ht = nb_nuits * prix_par_nuit
+        montant_consommation_ht = donnees["montant_consommation_ht"]
+        services_demandes = donnees["services"]
+        montant_services_ht = sum(s["quantite"] * s["prix_capture"] for s in services_demandes)
+
+        # 2. Calculer les taxes et les totaux
+        tva_hebergement = montant_nuitee_ht * tva_hebergement_rate
+        tva_restauration = montant_consommation_ht * tva_restauration_rate
+        tva_services = montant_services_ht * tva_services_rate # Taxe sur les services
+        montant_tdt = nb_adultes * nb_nuits * tdt_par_personne
+
+        total_ht = montant_nuitee_ht + montant_consommation_ht + montant_services_ht
+        total_tva = tva_hebergement + tva_restauration + tva_services
+        total_ttc = total_ht + total_tva + montant_tdt
+
+        # 3. Lignes détaillées de la facture
+        lignes = [{
+            "description": "Hébergement", "quantite": nb_nuits, "prix_unitaire_ht": prix_par_nuit,
+            "montant_ht": montant_nuitee_ht, "montant_tva": tva_hebergement,
+            "montant_ttc": montant_nuitee_ht + tva_hebergement,
+        }]
+        if montant_consommation_ht > 0:
+            lignes.append({
+                "description": "Consommations (Bar/Restaurant)", "quantite": 1,
+                "prix_unitaire_ht": montant_consommation_ht, "montant_ht": montant_consommation_ht,
+                "montant_tva": tva_restauration, "montant_ttc": montant_consommation_ht + tva_restauration,
+            })
+        if montant_tdt > 0:
+            lignes.append({
+                "description": "Taxe de Développement Touristique", "quantite": 1,
+                "prix_unitaire_ht": montant_tdt, "montant_ht": montant_tdt, "montant_tva": 0,
+                "montant_ttc": montant_tdt,
+            })
+        for service in services_demandes:
+            service_ht = service["quantite"] * service["prix_capture"]
+            service_tva = service_ht * tva_services_rate
+            lignes.append({
+                "description": f"Service: {service['nom_service']}", "quantite": service["quantite"],
+                "prix_unitaire_ht": service["prix_capture"], "montant_ht": service_ht,
+                "montant_tva": service_tva, "montant_ttc": service_ht + service_tva,
+                "service_demande_id": service["id"],
+            })
+
+        details = {
+            "montant_nuitee_ht": montant_nuitee_ht, "tva_hebergement": tva_hebergement,
+            "tva_hebergement_rate": tva_hebergement_rate,
+            "montant_consommation_ht": montant_consommation_ht,
+            "tva_restauration": tva_restauration, "tva_restauration_rate": tva_restauration_rate,
+            "montant_services_ht": montant_services_ht,
+            "tva_services": tva_services,
+            "montant_tdt": montant_tdt,
+            "total_ht": total_ht, "total_tva": total_tva, "total_ttc": total_ttc,
+        }
+        return details, lignes
+
+    @staticmethod
+    def generer_et_mettre_a_jour_facture(reservation_id, forcer=False):
         """
         LA MÉTHODE CENTRALE DE CALCUL.
-        Elle calcule tout (Hébergement, Consommations ET SERVICES), nettoie les anciennes lignes,
-        recrée les nouvelles, met à jour les totaux de la facture ET RETOURNE LES DÉTAILS.
+        Elle calcule tout (Hébergement, Consommations ET SERVICES), met à jour les lignes
+        et les totaux de la facture ET RETOURNE LES DÉTAILS.
+        - Les montants sont agrégés en SQL par une seule requête (FactureModel.get_donnees_facturation).
+        - Si rien n'a changé depuis le dernier calcul (drapeau a_recalculer tenu par des triggers,
+          même jour pour un séjour en cours), les détails mémorisés sont renvoyés sans aucune écriture.
+        - Sinon, seules les lignes dont les montants ont changé sont réécrites.
         """
         try:
-            # 1. Récupérer toutes les informations de base
-            resa = ReservationModel.get_by_id(reservation_id)
-            if not resa:
-                return {"success": False, "error": "Réservation introuvable."}
-
-            hotel_info_resp = HotelInfoController.get_info()
-            hotel_info = hotel_info_resp.get("data", {})
-            tva_hebergement_rate = hotel_info.get('tva_hebergement', 0.10)
-            tva_restauration_rate = hotel_info.get('tva_restauration', 0.18)
-            # Pour l'instant, on applique la TVA de l'hébergement aux services.
-            # On pourrait ajouter un champ tva_services dans hotel_info pour plus de précision.
-            tva_services_rate = tva_hebergement_rate
-            tdt_par_personne = hotel_info.get('tdt_par_personne', 0)
-
-            chambre = ChambreModel.get_by_id(resa['chambre_id'])
-            if not chambre:
-                return {"success": False, "error": "Chambre de la réservation introuvable."}
-
-            # 2. Calculer les coûts HT
-            date_arrivee = datetime.fromisoformat(resa["date_arrivee"]).date()
-            date_depart_effective = date.today() if resa["statut"] == "check-in" else datetime.fromisoformat(
-                resa["date_depart"]).date()
-            nb_nuits = max(1, (date_depart_effective - date_arrivee).days)
-            nb_adultes = resa.get("nb_adultes", 1)
-            montant_nuitee_ht = nb_nuits * chambre["prix_par_nuit"]
-
-            montant_consommation_ht = 0
-            commandes_resp = CommandeController.liste_commandes_par_reservation(reservation_id)
-            if commandes_resp.get("success"):
-                for commande in commandes_resp["data"]:
-                    if commande["statut"] == "Annulé": continue
-                    items_resp = CommandeItemController.liste_items(commande["id"])
-                    if items_resp.get("success"):
-                        for item in items_resp["data"]:
-                            montant_consommation_ht += item["quantite"] * item["prix_unitaire_capture"]
-
-            # --- AJOUT : Calcul du coût des services ---
-            montant_services_ht = 0
-            services_demandes_resp = ServiceDemandeController.lister_par_reservation(reservation_id)
-            services_demandes = []
-            if services_demandes_resp.get("success"):
-                services_demandes = services_demandes_resp.get("data", [])
-                for service in services_demandes:
-                    montant_services_ht += service["quantite"] * service["prix_capture"]
-            # --- FIN DE L'AJOUT ---
-
-            # 3. Calculer les taxes et les totaux
-            tva_hebergement = montant_nuitee_ht * tva_hebergement_rate
-            tva_restauration = montant_consommation_ht * tva_restauration_rate
-            tva_services = montant_services_ht * tva_services_rate # Taxe sur les services
-            montant_tdt = nb_adultes * nb_nuits * tdt_par_personne
-
-            total_ht = montant_nuitee_ht + montant_consommation_ht + montant_services_ht # Ajout des services
-            total_tva = tva_hebergement + tva_restauration + tva_services # Ajout de la TVA des services
-            total_ttc = total_ht + total_tva + montant_tdt
-
-            # 4. Créer ou récupérer la facture
-            facture_resp = FactureController.get_facture_par_reservation(reservation_id)
-            if not facture_resp.get("success"): return facture_resp
-
-            facture_data = facture_resp.get("data")
-            if not facture_data:
-                facture_creation_resp = FactureController.creer_facture(reservation_id)
-                if not facture_creation_resp.get("success"): return facture_creation_resp
-                facture_id = facture_creation_resp["facture_id"]
-                montant_paye_existant = 0
-            else:
-                facture_id = facture_data["id"]
-                montant_paye_existant = facture_data.get("montant_paye", 0)
-
-            # 5. Nettoyer la facture de ses anciennes lignes pour éviter les doublons
-            FactureItemModel.delete_by_facture(facture_id)
-
-            # 6. Créer les NOUVELLES lignes de facture détaillées
-            FactureItemModel.create(facture_id, "Hébergement", nb_nuits, chambre["prix_par_nuit"], montant_nuitee_ht,
-                                    tva_hebergement, montant_nuitee_ht + tva_hebergement)
-            if montant_consommation_ht > 0:
-                FactureItemModel.create(facture_id, "Consommations (Bar/Restaurant)", 1, montant_consommation_ht,
-                                        montant_consommation_ht, tva_restauration,
-                                        montant_consommation_ht + tva_restauration)
-            if montant_tdt > 0:
-                FactureItemModel.create(facture_id, "Taxe de Développement Touristique", 1, montant_tdt, montant_tdt, 0,
-                                        montant_tdt)
-
-            # --- AJOUT : Créer les lignes de facture pour chaque service ---
-            for service in services_demandes:
-                service_ht = service["quantite"] * service["prix_capture"]
-                service_tva = service_ht * tva_services_rate
-                service_ttc = service_ht + service_tva
-                FactureItemModel.create(
-                    facture_id,
-                    f"Service: {service['nom_service']}",
-                    service['quantite'],
-                    service['prix_capture'], # prix_unitaire_ht
-                    service_ht,              # montant_ht
-                    service_tva,             # montant_tva
-                    service_ttc,             # montant_ttc
-                    service_demande_id=service['id']
-                )
-            # --- FIN DE L'AJOUT ---
-
-            # 7. Mettre à jour les totaux de la facture principale, en conservant le montant déjà payé
-            FactureController.mettre_a_jour_montants(facture_id, total_ht, total_tva, total_ttc, montant_paye_existant)
-
-            # --- MODIFICATION : On retourne les détails calculés, y compris les services ---
-            details = {
-                "montant_nuitee_ht": montant_nuitee_ht, "tva_hebergement": tva_hebergement,
-                "tva_hebergement_rate": tva_hebergement_rate,
-                "montant_consommation_ht": montant_consommation_ht,
-                "tva_restauration": tva_restauration, "tva_restauration_rate": tva_restauration_rate,
-                "montant_services_ht": montant_services_ht, # Ajout
-                "tva_services": tva_services,             # Ajout
-                "montant_tdt": montant_tdt,
-                "total_ht": total_ht, "total_tva": total_tva, "total_ttc": total_ttc,
-            }
-            return {"success": True, "data": details, "message": "Facture mise à jour avec les derniers calculs."}
+            if not forcer:
+                details = FactureController._details_si_a_jour(reservation_id)
+                if details is not None:
+                    return {"success": True, "data": details, "message": "Facture déjà à jour."}
+
+            # Toute la mise à jour se fait dans une seule unité de travail :
+            # une seule connexion, un seul COMMIT, et rien n'est écrit si une étape échoue.
+            with BaseModel.transaction():
+                # 1. Récupérer toutes les informations de base (un seul aller-retour)
+                donnees = FactureModel.get_donnees_facturation(reservation_id)
+                if not donnees:
+                    return {"success": False, "error": "Réservation introuvable."}
+                if donnees["prix_par_nuit"] is None:
+                    return {"success": False, "error": "Chambre de la réservation introuvable."}
+
+                # 2. Calculer les montants et les lignes
+                details, lignes = FactureController.calculer_facture(donnees)
+
+                # 3. Créer ou récupérer la facture
+                facture_id = donnees["facture_id"]
+                if not facture_id:
+                    facture_id = FactureModel.create(reservation_id)
+                    lignes_existantes = []
+                else:
+                    lignes_existantes = FactureItemModel.get_by_facture(facture_id)
+
+                # 4. N'écrire que les lignes qui ont changé
+                FactureController._appliquer_lignes(facture_id, lignes, lignes_existantes)
+
+                # 5. Mettre à jour les totaux s'ils ont bougé, en conservant le montant déjà payé
+                totaux = (details["total_ht"], details["total_tva"], details["total_ttc"])
+                totaux_actuels = (donnees["montant_total_ht"], donnees["montant_total_tva"], donnees["montant_total_ttc"])
+                if not donnees["facture_id"] or not FactureController._montants_egaux(totaux, totaux_actuels):
+                    FactureModel.update_montants(facture_id, *totaux, donnees["montant_paye"])
+
+                FactureModel.enregistrer_etat(reservation_id, details)
+                return {"success": True, "data": details, "message": "Facture mise à jour avec les derniers calculs."}
 
         except Exception as e:
             # On peut ajouter un print pour un débogage plus facile en cas de problème
             import traceback
             traceback.print_exc()
             return {"success": False, "error": f"Erreur lors de la génération de la facture : {e}"}
+
+    @staticmethod
+    def factures_a_recalculer(reservation_ids):
+        """
+        Parmi `reservation_ids`, celles dont la facture a changé depuis son dernier calcul
+        (même règle que generer_et_mettre_a_jour_facture), lues en une requête par lot.
+        """
+        try:
+            etats = FactureModel.get_etats(reservation_ids)
+            return {"success": True, "data": [reservation_id for reservation_id in dict.fromkeys(reservation_ids)
+                                              if FactureController._details_etat(etats.get(reservation_id)) is None]}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération des états des factures : {e}"}
+
+    @staticmethod
+    def recalculer_factures(reservation_ids):
+        """
+        Recalcule les factures de `reservation_ids` dans une seule unité de travail :
+        un seul passage par le thread d'écriture au lieu d'un par facture.
+        Une facture en échec est annulée seule (SAVEPOINT) ; le résultat donne {reservation_id: erreur}.
+        """
+        erreurs = {}
+        try:
+            with BaseModel.transaction():
+                for reservation_id in reservation_ids:
+                    calcul = FactureController.generer_et_mettre_a_jour_facture(reservation_id, forcer=True)
+                    if not calcul.get("success"):
+                        erreurs[reservation_id] = calcul.get("error")
+            return {"success": True, "data": erreurs}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur lors du recalcul des factures : {e}"}
+
+    @staticmethod
+    def _details_si_a_jour(reservation_id):
+        """Retourne les détails mémorisés si la facture est propre, sinon None."""
+        return FactureController._details_etat(FactureModel.get_etat(reservation_id))
+
+    @staticmethod
+    def _details_etat(etat):
+        """Détails mémorisés dans l'état de calcul `etat` s'il est à jour, sinon None."""
+        if not etat or etat["a_recalculer"] or not etat["details"]:
+            return None
+        # Pour un séjour en cours, le nombre de nuits avance chaque jour
+        if etat["statut"] == "check-in" and etat["date_calcul"] != date.today().isoformat():
+            return None
+        return json.loads(etat["details"])
+
+    @staticmethod
+    def _montants_egaux(a, b):
+        return all(y is not None and abs(x - y) < 0.005 for x, y in zip(a, b))
+
+    @staticmethod
+    def _appliquer_lignes(facture_id, lignes, lignes_existantes):
+        """
+        Compare les lignes calculées aux lignes en base et n'écrit que la différence :
+        mise à jour des lignes modifiées, ajout des nouvelles, suppression de celles qui ont disparu.
+        Une ligne est identifiée par son service demandé, ou à défaut par sa description.
+        """
+        def cle(ligne):
+            if ligne.get("service_demande_id"):
+                return "service", ligne["service_demande_id"]
+            return "ligne", ligne["description"]
+
+        champs = ("quantite", "prix_unitaire_ht", "montant_ht", "montant_tva", "montant_ttc")
+        existantes = {}
+        a_supprimer = []
+        for ligne in lignes_existantes:
+            if cle(ligne) in existantes:
+                a_supprimer.append(ligne["id"])  # doublon hérité des anciens recalculs complets
+            else:
+                existantes[cle(ligne)] = ligne
+
+        a_creer = []
+        for ligne in lignes:
+            actuelle = existantes.pop(cle(ligne), None)
+            if actuelle is None:
+                a_creer.append(ligne)
+            elif actuelle["description"] != ligne["description"] or not FactureController._montants_egaux(
+                    [ligne[c] for c in champs], [actuelle[c] for c in champs]):
+                FactureItemModel.update_ligne(actuelle["id"], ligne)
+
+        a_supprimer.extend(l["id"] for l in existantes.values())
+        for item_id in a_supprimer:
+            FactureItemModel.delete(item_id)
+        if a_creer:
+            FactureItemModel.create_many(facture_id, a_creer)
@@ -0,0 +1,54 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/controllers/kpi_controller.py
+from datetime import date, timedelta
+
+from models.kpi_model import KpiModel
+
+
+class KpiController:
+    """Indicateurs des tableaux de bord, par rôle. `jour` (date) vaut aujourd'hui par défaut."""
+
+    @staticmethod
+    def indicateurs_admin(jour=None):
+        jour = jour or date.today()
+        try:
+            occupation = KpiModel.occupation()
+            return {"success": True, "data": {
+                "revenue_today": KpiModel.revenus(jour.isoformat(), (jour + timedelta(days=1)).isoformat()),
+                "total_revenue": KpiModel.revenus(),
+                "occupancy_rate": (occupation["occupees"] / occupation["chambres"] * 100)
+                if occupation["chambres"] > 0 else 0,
+                "unresolved_problems": KpiModel.problemes_en_attente(),
+            }}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de calcul des indicateurs : {e}"}
+
+    @staticmethod
+    def indicateurs_reception(jour=None):
+        jour = jour or date.today()
+        try:
+            occupation = KpiModel.occupation()
+            mouvements = KpiModel.mouvements(jour.isoformat())
+            return {"success": True, "data": {
+                "arrivals_today": mouvements["arrivees"],
+                "departures_today": mouvements["departs"],
+                "occupied_rooms": occupation["occupees"],
+                "available_rooms": occupation["chambres"] - occupation["occupees"],
+            }}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de calcul des indicateurs : {e}"}
+
+    @staticmethod
+    def indicateurs_bar(jour=None):
+        """Ventes du jour, de la semaine (depuis lundi) et du mois, et commandes du jour."""
+        jour = jour or date.today()
+        demain = (jour + timedelta(days=1)).isoformat()
+        try:
+            du_jour = KpiModel.ventes(jour.isoformat(), demain)
+            return {"success": True, "data": {
+                "sales_today": du_jour["montant"],
+                "sales_week": KpiModel.ventes((jour - timedelta(days=jour.weekday())).isoformat(), demain)["montant"],
+                "sales_month": KpiModel.ventes(jour.replace(day=1).isoformat(), demain)["montant"],
+                "orders_today": du_jour["commandes"],
+            }}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de calcul des indicateurs : {e}"}
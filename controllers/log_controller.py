@@ -1,4 +1,5 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/controllers/log_controller.py
+from models.base_model import PAGE_SIZE, BaseModel
 from models.log_model import LogModel
 
 class LogController:
@@ -44,4 +45,16 @@ class LogController:
         except Exception as e:
             # Ce cas est peu probable, car le modèle gère déjà les erreurs,
             # mais c'est une bonne pratique.
-            return {"success": False, "error": f"Erreur lors de la récupération des logs : {e}"}
\ No newline at end of file
+            return {"success": False, "error": f"Erreur lors de la récupération des logs : {e}"}
+
+    @staticmethod
+    def get_logs_page(after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de logs (keyset, voir LogModel.get_page).
+        `next` est la clé à passer en `after` pour la page suivante (None : dernière page).
+        """
+        try:
+            rows = LogModel.get_page(after, limit, filtre, ordre)
+            return {"success": True, "data": rows, "next": BaseModel.cle_suivante(rows, LogModel.CLE_PAGE, limit)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur lors de la récupération des logs : {e}"}
@@ -1,4 +1,5 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/controllers/paiement_controller.py
+from models.base_model import PAGE_SIZE, BaseModel
 from models.paiement_model import PaiementModel
 from models.facture_model import FactureModel
 
@@ -55,4 +56,16 @@ class PaiementController:
             paiements = PaiementModel.get_all()
             return {"success": True, "data": paiements}
         except Exception as e:
-            return {"success": False, "error": f"Erreur récupération paiements : {e}"}
\ No newline at end of file
+            return {"success": False, "error": f"Erreur récupération paiements : {e}"}
+
+    @staticmethod
+    def get_paiements_page(after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de paiements (keyset, voir PaiementModel.get_page).
+        `next` est la clé à passer en `after` pour la page suivante (None : dernière page).
+        """
+        try:
+            rows = PaiementModel.get_page(after, limit, filtre, ordre)
+            return {"success": True, "data": rows, "next": BaseModel.cle_suivante(rows, PaiementModel.CLE_PAGE, limit)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération paiements : {e}"}
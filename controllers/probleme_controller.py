@@ -1,3 +1,4 @@
+from models.base_model import PAGE_SIZE, BaseModel
 from models.probleme_model import ProblemeModel
 
 
@@ -28,6 +29,18 @@ class ProblemeController:
         except Exception as e:
             return {"success": False, "error": f"Erreur récupération des problèmes : {e}"}
 
+    @staticmethod
+    def liste_problemes_page(after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de problèmes (keyset, voir ProblemeModel.get_page).
+        `next` est la clé à passer en `after` pour la page suivante (None : dernière page).
+        """
+        try:
+            rows = ProblemeModel.get_page(after, limit, filtre, ordre)
+            return {"success": True, "data": rows, "next": BaseModel.cle_suivante(rows, ProblemeModel.CLE_PAGE, limit)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération des problèmes : {e}"}
+
     @staticmethod
     def get_probleme(probleme_id):
         if not probleme_id or not isinstance(probleme_id, int):
@@ -0,0 +1,33 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/controllers/recherche_controller.py
+from models.recherche_model import RechercheModel
+
+
+class RechercheController:
+    """Recherche plein texte (index FTS5) pour les champs de recherche « au fil de la frappe »."""
+
+    @staticmethod
+    def rechercher(terme, limit=10):
+        """Recherche globale : les meilleurs résultats de chaque type, classés par pertinence."""
+        try:
+            return {"success": True, "data": {
+                "clients": RechercheModel.clients(terme, limit),
+                "reservations": RechercheModel.reservations(terme, limit),
+                "problemes": RechercheModel.problemes(terme, limit),
+            }}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de recherche : {e}"}
+
+    @staticmethod
+    def rechercher_clients(terme, limit=200):
+        try:
+            return {"success": True, "data": RechercheModel.clients(terme, limit)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de recherche des clients : {e}"}
+
+    @staticmethod
+    def filtrer_reservations(terme, ids):
+        """Parmi les réservations `ids` (déjà affichées), celles qui correspondent à la saisie."""
+        try:
+            return {"success": True, "data": RechercheModel.ids_reservations(terme, list(ids))}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de recherche des réservations : {e}"}
@@ -1,6 +1,7 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/controllers/reservation_controller.py
 
 from datetime import datetime, date
+from models.base_model import PAGE_SIZE, BaseModel
 from models.reservation_model import ReservationModel
 from models.chambre_model import ChambreModel
 from models.client_model import ClientModel
@@ -15,9 +16,12 @@ class ReservationController:
     def create(self, client_id, chambre_id, date_arrivee, date_depart, nb_adultes=1, nb_enfants=0):
         """Valide les données métier et délègue la création complète au modèle."""
         try:
+            # La disponibilité se juge sur les dates demandées, pas sur le statut actuel de la chambre
             chambre = ChambreModel.get_by_id(chambre_id)
-            if not chambre or chambre['statut'] != 'libre':
+            if not chambre or chambre['statut'] == 'hors service':
                 return {"success": False, "error": "Chambre non disponible ou introuvable."}
+            if ReservationModel.has_conflit(chambre_id, date_arrivee, date_depart):
+                return {"success": False, "error": "La chambre est déjà réservée sur cette période."}
 
             client = ClientModel.get_by_id(client_id)
             if not client:
@@ -82,7 +86,11 @@ class ReservationController:
             if not resa or resa['statut'] != 'check-in':
                 return {"success": False, "error": "Impossible de faire le check-out (statut incorrect)."}
 
-            # 2. Vérifier que la facture est soldée
+            # 2. Vérifier que la facture est soldée (après l'avoir remise à jour si elle a changé depuis
+            # le dernier calcul : consommations ajoutées, nuit supplémentaire...)
+            calc_resp = FactureController.generer_et_mettre_a_jour_facture(reservation_id)
+            if not calc_resp.get("success"):
+                return calc_resp
             facture_resp = FactureController.get_facture_par_reservation(reservation_id)
             if not facture_resp.get("success") or not facture_resp.get("data"):
                 return {"success": False, "error": "Facture introuvable pour la vérification."}
@@ -136,6 +144,18 @@ class ReservationController:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def list_reservations_page(after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de réservations (keyset, voir ReservationModel.get_page).
+        `next` est la clé à passer en `after` pour la page suivante (None : dernière page).
+        """
+        try:
+            rows = ReservationModel.get_page(after, limit, filtre, ordre)
+            return {"success": True, "data": rows, "next": BaseModel.cle_suivante(rows, ReservationModel.CLE_PAGE, limit)}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
     @staticmethod
     def get_by_id(reservation_id):
         try:
@@ -148,15 +168,5 @@ class ReservationController:
 
     @staticmethod
     def check_conflit(chambre_id, date_arrivee, date_depart, exclude_id=None):
-        resas = ReservationModel.list({"chambre_id": chambre_id, "statuts": ["réservée", "check-in"]})
-        d_arr = datetime.strptime(date_arrivee, "%Y-%m-%d").date()
-        d_dep = datetime.strptime(date_depart, "%Y-%m-%d").date()
-        for r in resas:
-            if exclude_id and r["id"] == exclude_id:
-                continue
-            r_arr = datetime.strptime(r["date_arrivee"], "%Y-%m-%d").date()
-            r_dep = datetime.strptime(r["date_depart"], "%Y-%m-%d").date()
-            # Logique de chevauchement
-            if not (d_dep <= r_arr or d_arr >= r_dep):
-                return True
-        return False
\ No newline at end of file
+        """Vrai si la chambre est déjà prise sur [date_arrivee, date_depart) (requête indexée)."""
+        return ReservationModel.has_conflit(chambre_id, date_arrivee, date_depart, exclude_id)
@@ -1,3 +1,4 @@
+from models.base_model import PAGE_SIZE, BaseModel
 from models.service_demande_model import ServiceDemandeModel
 
 class ServiceDemandeController:
@@ -20,6 +21,18 @@ class ServiceDemandeController:
         except Exception as e:
             return {"success": False, "error": f"Erreur récupération demandes : {e}"}
 
+    @staticmethod
+    def lister_demandes_page(after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de demandes de service (keyset, voir ServiceDemandeModel.get_page).
+        `next` est la clé à passer en `after` pour la page suivante (None : dernière page).
+        """
+        try:
+            rows = ServiceDemandeModel.get_page(after, limit, filtre, ordre)
+            return {"success": True, "data": rows, "next": BaseModel.cle_suivante(rows, ServiceDemandeModel.CLE_PAGE, limit)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur récupération demandes : {e}"}
+
     @staticmethod
     def lister_par_reservation(reservation_id):
         if not reservation_id or reservation_id <= 0:
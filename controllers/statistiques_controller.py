@@ -1,24 +1,76 @@
+from datetime import date
+
 from models.base_model import BaseModel
+from models.statistique_model import StatistiqueModel
 import logging
 
 class StatistiquesController(BaseModel):
+    """
+    Statistiques de la page Statistiques. Les séries (réservations, revenus, ventes...) sont lues dans les
+    agrégats journaliers par StatistiqueModel, sur des intervalles [debut, fin) de la colonne jour.
+    """
+
+    @staticmethod
+    def _date(valeur):
+        return valeur if isinstance(valeur, date) else date.fromisoformat(str(valeur)[:10])
 
     @classmethod
-    def get_nombre_reservations_par_mois(cls, annee):
+    def serie(cls, mesure, debut, fin, granularite="mois"):
+        """Série de la mesure sur [debut, fin) par jour, semaine, mois ou année (périodes vides à 0)."""
         try:
-            with cls.connect() as conn:
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT strftime('%m', date_arrivee) AS mois, COUNT(*) 
-                    FROM reservations 
-                    WHERE strftime('%Y', date_arrivee) = ? 
-                    GROUP BY mois
-                """, (str(annee),))
-                rows = cur.fetchall()
+            return {"success": True, "data": StatistiqueModel.serie(
+                mesure, cls._date(debut), cls._date(fin), granularite)}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de calcul des statistiques : {e}"}
+
+    @classmethod
+    def comparer(cls, mesure, debut, fin, reference="precedente", granularite=None):
+        """
+        Compare la mesure sur [debut, fin) à une période de référence : "precedente" (même durée, juste avant),
+        "annee" (mêmes dates un an plus tôt) ou un couple (debut, fin) quelconque.
+        Retourne les deux totaux, l'écart et la variation en % (None si la référence est nulle) ;
+        avec une granularité, aussi les deux séries, alignées période par période.
+        """
+        try:
+            debut, fin = cls._date(debut), cls._date(fin)
+            if reference == "precedente":
+                ref_debut, ref_fin = debut - (fin - debut), debut
+            elif reference == "annee":
+                ref_debut, ref_fin = cls._annee_precedente(debut), cls._annee_precedente(fin)
+            else:
+                ref_debut, ref_fin = (cls._date(d) for d in reference)
+            valeur = StatistiqueModel.total(mesure, debut, fin)
+            valeur_ref = StatistiqueModel.total(mesure, ref_debut, ref_fin)
+            data = {
+                "periode": {"debut": debut.isoformat(), "fin": fin.isoformat(), "valeur": valeur},
+                "reference": {"debut": ref_debut.isoformat(), "fin": ref_fin.isoformat(), "valeur": valeur_ref},
+                "ecart": valeur - valeur_ref,
+                "variation": (valeur - valeur_ref) / valeur_ref * 100 if valeur_ref else None,
+            }
+            if granularite:
+                data["periode"]["serie"] = StatistiqueModel.serie(mesure, debut, fin, granularite)
+                data["reference"]["serie"] = StatistiqueModel.serie(mesure, ref_debut, ref_fin, granularite)
+            return {"success": True, "data": data}
+        except Exception as e:
+            return {"success": False, "error": f"Erreur de comparaison des statistiques : {e}"}
 
-            result = {int(mois): count for mois, count in rows}
-            # Compléter avec 0 pour mois absents
-            return {m: result.get(m, 0) for m in range(1, 13)}
+    @staticmethod
+    def _annee_precedente(jour):
+        try:
+            return jour.replace(year=jour.year - 1)
+        except ValueError:  # 29 février
+            return jour.replace(year=jour.year - 1, day=28)
+
+    @classmethod
+    def _par_mois(cls, mesure, annee):
+        """Valeurs d'une année, par numéro de mois (1 à 12)."""
+        serie = StatistiqueModel.serie(mesure, date(int(annee), 1, 1), date(int(annee) + 1, 1, 1), "mois")
+        return {int(point["periode"][5:7]): point["valeur"] for point in serie}
+
+    @classmethod
+    def get_nombre_reservations_par_mois(cls, annee):
+        try:
+            return cls._par_mois("reservations", annee)
         except Exception as e:
             logging.error(f"Erreur get_nombre_reservations_par_mois: {e}")
             return {m: 0 for m in range(1, 13)}
@@ -26,18 +78,7 @@ class StatistiquesController(BaseModel):
     @classmethod
     def get_revenu_total_par_mois(cls, annee):
         try:
-            with cls.connect() as conn:
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT strftime('%m', date_facture) AS mois, SUM(montant_total)
-                    FROM factures
-                    WHERE strftime('%Y', date_facture) = ? AND statut_paiement = 'payé'
-                    GROUP BY mois
-                """, (str(annee),))
-                rows = cur.fetchall()
-
-            result = {int(mois): total if total is not None else 0 for mois, total in rows}
-            return {m: result.get(m, 0) for m in range(1, 13)}
+            return cls._par_mois("revenus", annee)
         except Exception as e:
             logging.error(f"Erreur get_revenu_total_par_mois: {e}")
             return {m: 0 for m in range(1, 13)}
@@ -67,11 +108,10 @@ class StatistiquesController(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute("""
-                    SELECT tc.id, tc.nom, COUNT(r.id) AS nb_reservations
+                    SELECT tc.id, tc.nom, COALESCE(s.nb_reservations, 0) AS nb_reservations
                     FROM types_chambre tc
-                    LEFT JOIN chambres c ON c.type_id = tc.id
-                    LEFT JOIN reservations r ON r.chambre_id = c.id
-                    GROUP BY tc.id, tc.nom
+                    LEFT JOIN (SELECT type_id, SUM(nb_reservations) AS nb_reservations
+                               FROM stats_reservations_jour GROUP BY type_id) s ON s.type_id = tc.id
                     ORDER BY nb_reservations DESC
                     LIMIT ?
                 """, (limit,))
@@ -88,11 +128,11 @@ class StatistiquesController(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute("""
-                    SELECT c.id, c.nom, c.prenom, COUNT(r.id) AS nb_reservations
-                    FROM clients c
-                    LEFT JOIN reservations r ON r.client_id = c.id
-                    GROUP BY c.id, c.nom, c.prenom
-                    ORDER BY nb_reservations DESC
+                    SELECT c.id, c.nom, c.prenom, s.nb_reservations
+                    FROM stats_clients s
+                    JOIN clients c ON c.id = s.client_id
+                    WHERE c.is_deleted = 0
+                    ORDER BY s.nb_reservations DESC
                     LIMIT ?
                 """, (limit,))
                 rows = cur.fetchall()
@@ -0,0 +1,103 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/database/cache.py
+import copy
+import threading
+
+from database.connection_pool import pool
+
+
+class ReferenceCache:
+    """
+    Cache en mémoire des données de référence (infos de l'hôtel, types de chambre, chambres,
+    produits, services), relues à chaque facture, PDF ou ouverture de dialogue.
+    Chaque table a un numéro de version, incrémenté par invalider() à chaque écriture (modèles,
+    synchronisation, instantané). Une entrée garde les versions de ses tables au moment où sa lecture
+    a commencé : si l'une a changé depuis, l'entrée est relue, et une lecture concurrente d'une
+    écriture n'est pas gardée : une valeur périmée n'est jamais servie.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._generation = 0
+        self._entries = {}
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0}
+        # Tables écrites par la transaction en cours du thread, pas encore visibles des autres
+        self._local = threading.local()
+
+    def _versions_de(self, tables):
+        return (self._generation,) + tuple(self._versions.get(table, 0) for table in tables)
+
+    def lire(self, tables, cle, charger):
+        """
+        Retourne la valeur en cache pour `cle` si les `tables` dont elle dépend n'ont pas changé,
+        sinon l'obtient avec `charger()` et la garde. L'appelant reçoit une copie qu'il peut modifier.
+        Un thread qui a écrit dans l'une des `tables` sans avoir encore validé lit directement
+        la base : ses écritures ne sont pas partagées avant le COMMIT.
+        """
+        if set(tables) & getattr(self._local, "en_attente", set()):
+            with self._lock:
+                self._counters["misses"] += 1
+            return charger()
+        with self._lock:
+            versions = self._versions_de(tables)
+            entree = self._entries.get(cle)
+            if entree is not None and entree[0] == versions:
+                self._counters["hits"] += 1
+                return copy.deepcopy(entree[1])
+            self._counters["misses"] += 1
+
+        valeur = charger()
+        with self._lock:
+            # Une écriture survenue pendant le chargement a pu le rendre périmé : il n'est alors pas gardé.
+            if self._versions_de(tables) == versions:
+                self._entries[cle] = (versions, valeur, tables)
+        return copy.deepcopy(valeur)
+
+    def _incrementer(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            self._entries = {cle: entree for cle, entree in self._entries.items()
+                             if not set(entree[2]) & set(tables)}
+            self._counters["invalidations"] += 1
+
+    def invalider(self, *tables):
+        """
+        Signale que les `tables` ont changé. Dans une unité de travail, la version n'est incrémentée
+        qu'à la fin de la transaction, quand l'écriture est validée (ou annulée) ; d'ici là, le thread
+        lit ces tables sans passer par le cache.
+        """
+        if not self.pool.in_transaction():
+            self._incrementer(tables)
+            return
+        en_attente = getattr(self._local, "en_attente", None)
+        if en_attente is None:
+            en_attente = self._local.en_attente = set()
+        premiere = not en_attente
+        en_attente.update(tables)
+        if premiere:
+            self.pool.on_transaction_end(self._fin_transaction)
+
+    def _fin_transaction(self):
+        en_attente, self._local.en_attente = self._local.en_attente, set()
+        self._incrementer(tuple(en_attente))
+
+    def vider(self):
+        """Invalide toutes les entrées (après le chargement d'un instantané, par exemple)."""
+        with self._lock:
+            self._generation += 1
+            self._entries = {}
+            self._counters["invalidations"] += 1
+
+    def stats(self):
+        """Retourne les compteurs de succès, d'échecs et d'invalidations, et le nombre d'entrées."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        lectures = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lectures if lectures else 0.0
+        return stats
+
+
+cache = ReferenceCache(pool)
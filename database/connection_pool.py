@@ -0,0 +1,264 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/database/connection_pool.py
+import atexit
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from database.writer import DatabaseWriter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(PROJECT_ROOT, "hotel.db")
+
+# Réglages appliqués une seule fois, à l'ouverture physique de chaque connexion.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -16000;",      # ~16 Mo de cache de pages
+    "PRAGMA mmap_size = 268435456;",    # 256 Mo de lecture mappée en mémoire
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA busy_timeout = 5000;",     # attend le verrou jusqu'à 5 s au lieu d'échouer aussitôt
+)
+
+
+class PooledConnection:
+    """
+    Enveloppe d'une connexion sqlite3 prêtée par le pool.
+    Elle se comporte comme une connexion classique (cursor, execute, commit...),
+    mais `close()` et la sortie d'un bloc `with` la rendent au pool au lieu de la fermer.
+    À l'intérieur d'une unité de travail (`pool.transaction()`), commit() et rollback()
+    sont différés : seule la transaction englobante valide ou annule.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._refs = 0
+        self._tx_depth = 0
+        self._foreign_keys = True
+        self._end_callbacks = []
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Même sémantique que `with sqlite3.Connection` : commit si tout va bien, sinon rollback.
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self._pool.release(self)
+        return False
+
+    def commit(self):
+        if self._tx_depth == 0:
+            self._raw.commit()
+
+    def rollback(self):
+        if self._tx_depth == 0:
+            self._raw.rollback()
+
+    def close(self):
+        """Rend la connexion au pool (la connexion physique reste ouverte)."""
+        self._pool.release(self)
+
+
+class ConnectionPool:
+    """
+    Pool de connexions SQLite.
+    - Chaque thread reçoit sa propre connexion ; les appels imbriqués du même thread la réutilisent.
+    - Une connexion libérée retourne dans une réserve et sert au prochain emprunt, quel que soit le thread.
+    - Les PRAGMA (WAL, synchronous, cache...) ne sont exécutés qu'à l'ouverture physique.
+    """
+
+    def __init__(self, db_path=DB_PATH, max_idle=4):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {"opened": 0, "reused": 0, "released": 0, "closed": 0}
+        self._writer = None
+
+    def _open(self, create=False):
+        if not create and not os.path.exists(self.db_path):
+            raise FileNotFoundError(f"Fichier base de données introuvable : {self.db_path}")
+
+        # check_same_thread=False : une connexion libérée peut resservir dans un autre thread,
+        # le pool garantit qu'elle n'est jamais utilisée par deux threads à la fois.
+        raw = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            raw.execute(pragma)
+        raw.row_factory = sqlite3.Row
+        with self._lock:
+            self._counters["opened"] += 1
+        return PooledConnection(self, raw)
+
+    def connection(self, create=False, foreign_keys=None):
+        """
+        Emprunte une connexion pour le thread courant.
+        À utiliser avec `with pool.connection() as conn:` ou suivi d'un `conn.close()`.
+        `foreign_keys` : True / False pour exiger les clés étrangères activées / désactivées,
+        None pour accepter le réglage de la connexion déjà empruntée par le thread (activées sinon).
+        Le PRAGMA ne pouvant changer pour un emprunt imbriqué, un réglage contraire lève une RuntimeError.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            if foreign_keys is not None and foreign_keys != conn._foreign_keys:
+                raise RuntimeError(
+                    f"Connexion déjà empruntée par ce thread avec foreign_keys={conn._foreign_keys}, "
+                    f"foreign_keys={foreign_keys} demandé.")
+            conn._refs += 1
+            with self._lock:
+                self._counters["reused"] += 1
+            return conn
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None:
+                self._counters["reused"] += 1
+        if conn is None:
+            conn = self._open(create)
+
+        if foreign_keys is False:
+            conn._raw.execute("PRAGMA foreign_keys = OFF;")
+            conn._foreign_keys = False
+
+        conn._refs = 1
+        self._local.conn = conn
+        return conn
+
+    @property
+    def writer(self):
+        """Thread d'écriture unique de ce pool (voir database/writer.py), démarré au premier usage."""
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = DatabaseWriter(self)
+        return self._writer
+
+    def in_transaction(self):
+        """Vrai si le thread courant a une transaction ouverte sur sa connexion."""
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and (conn._tx_depth > 0 or conn._raw.in_transaction)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unité de travail : tous les appels aux modèles faits dans le bloc partagent la
+        connexion du thread et sont validés par un seul COMMIT à la sortie (rollback si exception).
+        Les transactions imbriquées deviennent des SAVEPOINT.
+        Hors du thread d'écriture, l'unité de travail est un travail de sa file (writer.exclusif()) :
+        elle attend la fin du lot en cours au lieu de lui disputer le verrou d'écriture.
+        """
+        if not self.in_transaction() and not self.writer.in_writer_thread():
+            with self.writer.exclusif():
+                with self._transaction() as conn:
+                    yield conn
+        else:
+            with self._transaction() as conn:
+                yield conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self.connection()
+        savepoint = None
+        try:
+            if conn._tx_depth == 0:
+                if not conn._raw.in_transaction:
+                    # IMMEDIATE : le verrou d'écriture est pris d'emblée, pas d'escalade en cours de route.
+                    conn._raw.execute("BEGIN IMMEDIATE")
+            else:
+                savepoint = f"uow_{conn._tx_depth}"
+                conn._raw.execute(f"SAVEPOINT {savepoint}")
+            conn._tx_depth += 1
+            try:
+                yield conn
+            except BaseException:
+                conn._tx_depth -= 1
+                if savepoint:
+                    conn._raw.execute(f"ROLLBACK TO {savepoint}")
+                    conn._raw.execute(f"RELEASE {savepoint}")
+                else:
+                    conn._raw.rollback()
+                raise
+            conn._tx_depth -= 1
+            if savepoint:
+                conn._raw.execute(f"RELEASE {savepoint}")
+            else:
+                conn._raw.commit()
+        finally:
+            if savepoint is None and conn._tx_depth == 0:
+                callbacks, conn._end_callbacks = conn._end_callbacks, []
+                for callback in callbacks:
+                    callback()
+            self.release(conn)
+
+    def on_transaction_end(self, callback):
+        """
+        Appelle `callback` à la fin (COMMIT ou ROLLBACK) de l'unité de travail du thread courant,
+        ou tout de suite s'il n'y en a pas. Sert à signaler une écriture une fois visible des autres threads.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn._tx_depth == 0:
+            callback()
+        else:
+            conn._end_callbacks.append(callback)
+
+    def release(self, conn):
+        """Rend une connexion empruntée. Elle n'est recyclée qu'au dernier emprunt du thread."""
+        conn._refs -= 1
+        if conn._refs > 0:
+            return
+
+        self._local.conn = None
+        try:
+            # Tout travail non validé est abandonné, comme lors d'un close() sqlite3.
+            if conn._raw.in_transaction:
+                conn._raw.rollback()
+            if not conn._foreign_keys:
+                conn._raw.execute("PRAGMA foreign_keys = ON;")
+                conn._foreign_keys = True
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._counters["released"] += 1
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    def _discard(self, conn):
+        try:
+            conn._raw.close()
+        finally:
+            with self._lock:
+                self._counters["closed"] += 1
+
+    def close_all(self):
+        """Ferme toutes les connexions au repos (à appeler à la fermeture de l'application)."""
+        if self._writer is not None:
+            self._writer.stop()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Retourne les compteurs d'ouverture et de réutilisation du pool."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["idle"] = len(self._idle)
+        return stats
+
+
+pool = ConnectionPool()
+atexit.register(pool.close_all)
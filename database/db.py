@@ -3,28 +3,21 @@ import sqlite3
 import os
 from werkzeug.security import generate_password_hash
 
-# Le chemin absolu est une excellente pratique, on le conserve.
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(PROJECT_ROOT, "hotel.db")
+from database.connection_pool import DB_PATH, PROJECT_ROOT, pool
+from database.migrateur import appliquer_migrations
 
 
 def get_connection():
     """
-    Établit et retourne une connexion à la base de données.
+    Emprunte une connexion au pool partagé avec les modèles.
     Cette connexion est configurée pour :
     1. Forcer les contraintes de clé étrangère (CRUCIAL pour l'intégrité des données).
     2. Retourner les résultats sous forme de lignes de type dictionnaire.
+    3. Utiliser le journal WAL et les réglages de cache du pool.
+    `conn.close()` (ou la sortie d'un bloc `with`) rend la connexion au pool.
     """
-    conn = sqlite3.connect(DB_PATH)
-
-    # --- AMÉLIORATION CRUCIALE ---
-    # Force SQLite à respecter les règles de clé étrangère définies dans votre schéma.
-    # Cela empêche, par exemple, de supprimer une chambre si elle a des réservations.
-    conn.execute("PRAGMA foreign_keys = ON;")
-
-    # Permet d'accéder aux colonnes par leur nom (ex: row['numero'])
-    conn.row_factory = sqlite3.Row
-    return conn
+    # create=True : init_db() l'utilise justement pour créer le fichier.
+    return pool.connection(create=True)
 
 
 def init_db():
@@ -57,6 +50,23 @@ def init_db():
     else:
         print("ℹ️ Base de données déjà existante.")
 
+    appliquer_migrations_locales()
+
+
+def appliquer_migrations_locales():
+    """
+    Met le schéma local à jour (colonnes, tables locales, triggers, index) sur une base neuve
+    comme sur une base existante. Seules les migrations pas encore appliquées sont exécutées.
+    """
+    conn = get_connection()
+    try:
+        for migration in appliquer_migrations(conn):
+            print(f"✅ Migration appliquée : {migration}")
+    except Exception as e:
+        print(f"❌ {e}")
+    finally:
+        conn.close()
+
 
 def create_default_users(conn):
     """Crée un ensemble d'utilisateurs par défaut dans la base de données."""
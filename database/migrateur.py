@@ -0,0 +1,107 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/database/migrateur.py
+import os
+import sqlite3
+
+from database.connection_pool import DB_PATH, PROJECT_ROOT
+
+MIGRATIONS_DIR = os.path.join(PROJECT_ROOT, "database", "migrations")
+
+
+def _colonnes_facturation(conn):
+    """Ajoute les colonnes HT/TVA/TTC aux bases créées avant leur introduction (ancien addddd.py)."""
+    colonnes = {
+        "factures": [
+            ("montant_total_ht", "REAL", 0.0),
+            ("montant_total_tva", "REAL", 0.0),
+            ("montant_total_ttc", "REAL", 0.0),
+        ],
+        "facture_items": [
+            ("prix_unitaire_ht", "REAL", 0.0),
+            ("montant_ht", "REAL", 0.0),
+            ("montant_tva", "REAL", 0.0),
+            ("montant_ttc", "REAL", 0.0),
+        ],
+    }
+    for nom_table, colonnes_table in colonnes.items():
+        existantes = {col[1] for col in conn.execute(f"PRAGMA table_info({nom_table})")}
+        for nom_col, type_sql, defaut in colonnes_table:
+            if nom_col not in existantes:
+                conn.execute(f"ALTER TABLE {nom_table} ADD COLUMN {nom_col} {type_sql} NOT NULL DEFAULT {defaut}")
+
+
+def _amorcer_outbox(conn):
+    """
+    Inscrit dans l'outbox les lignes modifiées depuis la dernière synchro mais pas encore envoyées,
+    détectées une dernière fois avec l'ancienne méthode (updated_at > marque de la table).
+    """
+    try:
+        with open(os.path.join(os.path.dirname(DB_PATH), ".last_sync"), "r") as f:
+            derniere_synchro = f.read().strip()
+    except FileNotFoundError:
+        derniere_synchro = "1970-01-01T00:00:00+00:00"
+
+    tables = [row[0] for row in conn.execute(
+        "SELECT DISTINCT tbl_name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_outbox_%'")]
+    for table in tables:
+        marque = conn.execute("SELECT updated_at FROM sync_marques WHERE table_nom = ? AND sens = 'up'",
+                              (table,)).fetchone()
+        # replace() : les dates CURRENT_TIMESTAMP ("AAAA-MM-JJ HH:MM:SS") se comparent alors aux dates ISO
+        conn.execute(f"""
+            INSERT OR IGNORE INTO sync_outbox (table_nom, row_id, op)
+            SELECT ?, id, 'U' FROM {table} WHERE replace(updated_at, ' ', 'T') > ? ORDER BY updated_at, id
+        """, (table, marque[0] if marque else derniere_synchro))
+    conn.execute("DELETE FROM sync_marques WHERE sens = 'up'")
+
+
+# (version, nom, étape) : l'étape est un script de database/migrations/ ou une fonction recevant la connexion.
+# Ne jamais modifier une migration déjà livrée : en ajouter une nouvelle avec le numéro suivant.
+MIGRATIONS = [
+    (1, "colonnes_facturation", _colonnes_facturation),
+    (2, "facturation_etat", "002_facturation_etat.sql"),
+    (3, "disponibilite", "003_disponibilite.sql"),
+    (4, "index_acces", "004_index_acces.sql"),
+    (5, "sync_marques", "005_sync_marques.sql"),
+    (6, "sync_outbox", "006_sync_outbox.sql"),
+    (7, "amorcer_outbox", _amorcer_outbox),
+    (8, "sync_echos", "008_sync_echos.sql"),
+    (9, "index_pagination", "009_index_pagination.sql"),
+    (10, "recherche_fts", "010_recherche_fts.sql"),
+    (11, "index_kpi", "011_index_kpi.sql"),
+    (12, "agregats_journaliers", "012_agregats_journaliers.sql"),
+]
+
+
+def version_courante(conn):
+    """Version du schéma local, stockée dans PRAGMA user_version (jamais synchronisée)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def appliquer_migrations(conn):
+    """
+    Applique, dans l'ordre, les migrations dont la version dépasse celle de la base.
+    Chaque migration s'exécute dans sa propre transaction avec la mise à jour de user_version :
+    une migration qui échoue est annulée entièrement et les suivantes ne sont pas tentées.
+    Retourne la liste des migrations appliquées.
+    """
+    appliquees = []
+    version = version_courante(conn)
+    for numero, nom, etape in MIGRATIONS:
+        if numero <= version:
+            continue
+        try:
+            if callable(etape):
+                conn.execute("BEGIN IMMEDIATE")
+                etape(conn)
+                conn.execute(f"PRAGMA user_version = {numero}")
+                conn.execute("COMMIT")
+            else:
+                with open(os.path.join(MIGRATIONS_DIR, etape), "r", encoding="utf-8") as f:
+                    script = f.read()
+                # executescript valide toute transaction en cours : on encadre nous-mêmes le script.
+                conn.executescript(f"BEGIN IMMEDIATE;\n{script}\nPRAGMA user_version = {numero};\nCOMMIT;")
+        except (sqlite3.Error, OSError) as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise Exception(f"Échec de la migration {numero} ({nom}) : {e}") from e
+        appliquees.append(f"{numero:03d}_{nom}")
+    return appliquees
@@ -0,0 +1,113 @@
+-- ÉTAT DE CALCUL DES FACTURES (table locale, non synchronisée, comme les logs)
+-- a_recalculer = 1 dès qu'une donnée entrant dans le calcul de la facture change.
+-- L'absence de ligne pour une réservation équivaut à a_recalculer = 1.
+
+CREATE TABLE IF NOT EXISTS factures_etat (
+    reservation_id INTEGER PRIMARY KEY,
+    a_recalculer BOOLEAN NOT NULL DEFAULT 1,
+    date_calcul DATE,
+    details TEXT,
+    FOREIGN KEY (reservation_id) REFERENCES reservations(id) ON DELETE CASCADE
+);
+
+-- Réservation : dates, statut (check-in/out), nombre d'adultes (TDT), chambre
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_reservation_ins AFTER INSERT ON reservations
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1 WHERE reservation_id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_reservation_upd
+AFTER UPDATE OF date_arrivee, date_depart, statut, nb_adultes, chambre_id, is_deleted ON reservations
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1 WHERE reservation_id = NEW.id;
+END;
+
+-- Consommations
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_commande_ins AFTER INSERT ON commandes
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1 WHERE reservation_id = NEW.reservation_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_commande_upd
+AFTER UPDATE OF statut, is_deleted, reservation_id ON commandes
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1 WHERE reservation_id IN (OLD.reservation_id, NEW.reservation_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_commande_item_ins AFTER INSERT ON commande_items
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id = (SELECT reservation_id FROM commandes WHERE id = NEW.commande_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_commande_item_upd
+AFTER UPDATE OF quantite, prix_unitaire_capture, is_deleted, commande_id ON commande_items
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (SELECT reservation_id FROM commandes WHERE id IN (OLD.commande_id, NEW.commande_id));
+END;
+
+-- Services demandés
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_service_ins AFTER INSERT ON services_demandes
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1 WHERE reservation_id = NEW.reservation_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_service_upd
+AFTER UPDATE OF quantite, prix_capture, is_deleted, reservation_id, service_id ON services_demandes
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1 WHERE reservation_id IN (OLD.reservation_id, NEW.reservation_id);
+END;
+
+-- Données de référence : nom des services, prix des chambres, taux de l'hôtel
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_service_dispo_upd
+AFTER UPDATE OF nom_service ON services_disponibles
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (SELECT reservation_id FROM services_demandes WHERE service_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_chambre_upd AFTER UPDATE OF type_id ON chambres
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (SELECT id FROM reservations WHERE chambre_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_type_chambre_upd AFTER UPDATE OF prix_par_nuit ON types_chambre
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (
+        SELECT r.id FROM reservations r JOIN chambres c ON r.chambre_id = c.id WHERE c.type_id = NEW.id
+    );
+END;
+
+-- Les synchros par INSERT OR REPLACE ne déclenchent que les triggers d'insertion
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_service_dispo_ins AFTER INSERT ON services_disponibles
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (SELECT reservation_id FROM services_demandes WHERE service_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_chambre_ins AFTER INSERT ON chambres
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (SELECT id FROM reservations WHERE chambre_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_type_chambre_ins AFTER INSERT ON types_chambre
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1
+    WHERE reservation_id IN (
+        SELECT r.id FROM reservations r JOIN chambres c ON r.chambre_id = c.id WHERE c.type_id = NEW.id
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_hotel_info_ins AFTER INSERT ON hotel_info
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facture_etat_hotel_info_upd AFTER UPDATE ON hotel_info
+BEGIN
+    UPDATE factures_etat SET a_recalculer = 1;
+END;
@@ -0,0 +1,7 @@
+-- INDEX DE DISPONIBILITÉ DES CHAMBRES
+-- Couvre la recherche de chevauchement "la chambre X est-elle libre sur [arrivée, départ) ?" :
+-- égalité sur chambre_id et statut, plage sur date_arrivee, date_depart lue directement dans l'index.
+
+CREATE INDEX IF NOT EXISTS idx_reservations_disponibilite
+    ON reservations (chambre_id, statut, date_arrivee, date_depart)
+    WHERE is_deleted = 0;
@@ -0,0 +1,53 @@
+-- INDEX DES CHEMINS D'ACCÈS FRÉQUENTS
+-- Les index partiels (WHERE is_deleted = 0) ne contiennent que les lignes actives : ils servent
+-- les requêtes des modèles, qui filtrent toutes sur is_deleted = 0, et restent petits.
+-- Les index complets servent les clés étrangères (cascades, triggers) et la synchronisation,
+-- qui doivent aussi voir les lignes supprimées.
+
+-- Réservations
+CREATE INDEX IF NOT EXISTS idx_reservations_client
+    ON reservations (client_id, statut) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_reservations_statut
+    ON reservations (statut, date_depart) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_reservations_date_arrivee
+    ON reservations (date_arrivee) WHERE is_deleted = 0;
+
+-- Chambres
+CREATE INDEX IF NOT EXISTS idx_chambres_type ON chambres (type_id);
+
+-- Consommations
+CREATE INDEX IF NOT EXISTS idx_commandes_reservation
+    ON commandes (reservation_id, lieu_consommation) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_commandes_lieu
+    ON commandes (lieu_consommation, statut) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_commande_items_commande ON commande_items (commande_id);
+
+-- Services
+CREATE INDEX IF NOT EXISTS idx_services_demandes_reservation
+    ON services_demandes (reservation_id) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_services_demandes_service ON services_demandes (service_id);
+
+-- Facturation
+CREATE INDEX IF NOT EXISTS idx_facture_items_facture ON facture_items (facture_id);
+CREATE INDEX IF NOT EXISTS idx_paiements_facture
+    ON paiements (facture_id) WHERE is_deleted = 0;
+
+-- Listes triées
+CREATE INDEX IF NOT EXISTS idx_clients_nom ON clients (nom, prenom) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_problemes_chambre ON problemes (chambre_id) WHERE is_deleted = 0;
+
+-- Synchronisation : "updated_at > dernière synchro" (hotel_info n'a qu'une ligne)
+CREATE INDEX IF NOT EXISTS idx_types_chambre_updated_at ON types_chambre (updated_at);
+CREATE INDEX IF NOT EXISTS idx_chambres_updated_at ON chambres (updated_at);
+CREATE INDEX IF NOT EXISTS idx_clients_updated_at ON clients (updated_at);
+CREATE INDEX IF NOT EXISTS idx_reservations_updated_at ON reservations (updated_at);
+CREATE INDEX IF NOT EXISTS idx_produits_updated_at ON produits (updated_at);
+CREATE INDEX IF NOT EXISTS idx_commandes_updated_at ON commandes (updated_at);
+CREATE INDEX IF NOT EXISTS idx_commande_items_updated_at ON commande_items (updated_at);
+CREATE INDEX IF NOT EXISTS idx_services_disponibles_updated_at ON services_disponibles (updated_at);
+CREATE INDEX IF NOT EXISTS idx_services_demandes_updated_at ON services_demandes (updated_at);
+CREATE INDEX IF NOT EXISTS idx_problemes_updated_at ON problemes (updated_at);
+CREATE INDEX IF NOT EXISTS idx_factures_updated_at ON factures (updated_at);
+CREATE INDEX IF NOT EXISTS idx_facture_items_updated_at ON facture_items (updated_at);
+CREATE INDEX IF NOT EXISTS idx_paiements_updated_at ON paiements (updated_at);
+CREATE INDEX IF NOT EXISTS idx_users_updated_at ON users (updated_at);
@@ -0,0 +1,11 @@
+-- MARQUES DE SYNCHRONISATION (table locale, non synchronisée)
+-- Pour chaque table et chaque sens, la dernière ligne acquittée : (updated_at, id).
+-- Une synchro interrompue reprend après le dernier lot confirmé au lieu de tout renvoyer.
+
+CREATE TABLE IF NOT EXISTS sync_marques (
+    table_nom TEXT NOT NULL,
+    sens TEXT NOT NULL CHECK(sens IN ('up', 'down')),
+    updated_at TEXT NOT NULL,
+    dernier_id INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_nom, sens)
+);
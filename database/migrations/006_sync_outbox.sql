@@ -0,0 +1,307 @@
+-- JOURNAL DES MODIFICATIONS À ENVOYER (outbox, table locale, non synchronisée)
+-- Chaque écriture sur une table synchronisée y inscrit (table, id de la ligne, opération).
+-- Une ligne modifiée plusieurs fois n'y figure qu'une fois : INSERT OR REPLACE lui donne
+-- un nouveau seq, ce qui la replace en fin de file. sync_up lit la file dans l'ordre des seq
+-- et supprime les entrées une fois le lot acquitté par le serveur.
+
+CREATE TABLE IF NOT EXISTS sync_outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_nom TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    op TEXT NOT NULL CHECK(op IN ('I', 'U', 'D')),
+    UNIQUE (table_nom, row_id)
+);
+CREATE INDEX IF NOT EXISTS idx_sync_outbox_table ON sync_outbox (table_nom, seq);
+
+-- Pendant l'application des changements distants (sync_down), application_distante vaut 1 :
+-- ces écritures viennent du serveur et ne doivent pas y être renvoyées.
+CREATE TABLE IF NOT EXISTS sync_contexte (
+    id INTEGER PRIMARY KEY CHECK(id = 1),
+    application_distante BOOLEAN NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO sync_contexte (id) VALUES (1);
+
+-- hotel_info
+CREATE TRIGGER IF NOT EXISTS trg_outbox_hotel_info_ins AFTER INSERT ON hotel_info
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('hotel_info', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_hotel_info_upd AFTER UPDATE ON hotel_info
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('hotel_info', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_hotel_info_del AFTER DELETE ON hotel_info
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('hotel_info', OLD.id, 'D');
+END;
+
+-- users
+CREATE TRIGGER IF NOT EXISTS trg_outbox_users_ins AFTER INSERT ON users
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('users', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_users_upd AFTER UPDATE ON users
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('users', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_users_del AFTER DELETE ON users
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('users', OLD.id, 'D');
+END;
+
+-- types_chambre
+CREATE TRIGGER IF NOT EXISTS trg_outbox_types_chambre_ins AFTER INSERT ON types_chambre
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('types_chambre', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_types_chambre_upd AFTER UPDATE ON types_chambre
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('types_chambre', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_types_chambre_del AFTER DELETE ON types_chambre
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('types_chambre', OLD.id, 'D');
+END;
+
+-- chambres
+CREATE TRIGGER IF NOT EXISTS trg_outbox_chambres_ins AFTER INSERT ON chambres
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('chambres', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_chambres_upd AFTER UPDATE ON chambres
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('chambres', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_chambres_del AFTER DELETE ON chambres
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('chambres', OLD.id, 'D');
+END;
+
+-- clients
+CREATE TRIGGER IF NOT EXISTS trg_outbox_clients_ins AFTER INSERT ON clients
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('clients', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_clients_upd AFTER UPDATE ON clients
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('clients', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_clients_del AFTER DELETE ON clients
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('clients', OLD.id, 'D');
+END;
+
+-- reservations
+CREATE TRIGGER IF NOT EXISTS trg_outbox_reservations_ins AFTER INSERT ON reservations
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('reservations', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_reservations_upd AFTER UPDATE ON reservations
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('reservations', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_reservations_del AFTER DELETE ON reservations
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('reservations', OLD.id, 'D');
+END;
+
+-- produits
+CREATE TRIGGER IF NOT EXISTS trg_outbox_produits_ins AFTER INSERT ON produits
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('produits', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_produits_upd AFTER UPDATE ON produits
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('produits', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_produits_del AFTER DELETE ON produits
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('produits', OLD.id, 'D');
+END;
+
+-- commandes
+CREATE TRIGGER IF NOT EXISTS trg_outbox_commandes_ins AFTER INSERT ON commandes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('commandes', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_commandes_upd AFTER UPDATE ON commandes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('commandes', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_commandes_del AFTER DELETE ON commandes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('commandes', OLD.id, 'D');
+END;
+
+-- commande_items
+CREATE TRIGGER IF NOT EXISTS trg_outbox_commande_items_ins AFTER INSERT ON commande_items
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('commande_items', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_commande_items_upd AFTER UPDATE ON commande_items
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('commande_items', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_commande_items_del AFTER DELETE ON commande_items
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('commande_items', OLD.id, 'D');
+END;
+
+-- services_disponibles
+CREATE TRIGGER IF NOT EXISTS trg_outbox_services_disponibles_ins AFTER INSERT ON services_disponibles
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('services_disponibles', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_services_disponibles_upd AFTER UPDATE ON services_disponibles
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('services_disponibles', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_services_disponibles_del AFTER DELETE ON services_disponibles
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('services_disponibles', OLD.id, 'D');
+END;
+
+-- services_demandes
+CREATE TRIGGER IF NOT EXISTS trg_outbox_services_demandes_ins AFTER INSERT ON services_demandes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('services_demandes', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_services_demandes_upd AFTER UPDATE ON services_demandes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('services_demandes', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_services_demandes_del AFTER DELETE ON services_demandes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('services_demandes', OLD.id, 'D');
+END;
+
+-- problemes
+CREATE TRIGGER IF NOT EXISTS trg_outbox_problemes_ins AFTER INSERT ON problemes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('problemes', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_problemes_upd AFTER UPDATE ON problemes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('problemes', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_problemes_del AFTER DELETE ON problemes
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('problemes', OLD.id, 'D');
+END;
+
+-- factures
+CREATE TRIGGER IF NOT EXISTS trg_outbox_factures_ins AFTER INSERT ON factures
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('factures', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_factures_upd AFTER UPDATE ON factures
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('factures', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_factures_del AFTER DELETE ON factures
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('factures', OLD.id, 'D');
+END;
+
+-- facture_items
+CREATE TRIGGER IF NOT EXISTS trg_outbox_facture_items_ins AFTER INSERT ON facture_items
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('facture_items', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_facture_items_upd AFTER UPDATE ON facture_items
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('facture_items', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_facture_items_del AFTER DELETE ON facture_items
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('facture_items', OLD.id, 'D');
+END;
+
+-- paiements
+CREATE TRIGGER IF NOT EXISTS trg_outbox_paiements_ins AFTER INSERT ON paiements
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('paiements', NEW.id, 'I');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_paiements_upd AFTER UPDATE ON paiements
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('paiements', NEW.id, 'U');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_outbox_paiements_del AFTER DELETE ON paiements
+WHEN (SELECT application_distante FROM sync_contexte) = 0
+BEGIN
+    INSERT OR REPLACE INTO sync_outbox (table_nom, row_id, op) VALUES ('paiements', OLD.id, 'D');
+END;
@@ -0,0 +1,11 @@
+-- ÉCHOS DE SYNCHRONISATION (table locale, non synchronisée)
+-- Pour chaque ligne envoyée par ce poste, la version (updated_at) telle que le serveur l'a enregistrée.
+-- Quand sync_down reçoit une ligne à cette même version, c'est notre propre envoi qui revient :
+-- elle est ignorée au lieu d'être réécrite.
+
+CREATE TABLE IF NOT EXISTS sync_echos (
+    table_nom TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    version TEXT,
+    PRIMARY KEY (table_nom, row_id)
+);
@@ -0,0 +1,15 @@
+-- INDEX DE PAGINATION PAR CLÉ (get_page des modèles)
+-- Chaque liste paginée est triée par (date, id) : l'index sur la date contient implicitement l'id
+-- (rowid) en dernière colonne, la comparaison "(date, id) < (?, ?)" démarre donc directement
+-- à la bonne position de l'index, sans tri ni lecture des pages précédentes.
+-- Réservations : idx_reservations_date_arrivee (migration 004) sert déjà.
+
+CREATE INDEX IF NOT EXISTS idx_commandes_date
+    ON commandes (date_commande) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_paiements_date
+    ON paiements (date_paiement) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_services_demandes_date
+    ON services_demandes (date_demande) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_problemes_date
+    ON problemes (date_signalement) WHERE is_deleted = 0;
+CREATE INDEX IF NOT EXISTS idx_logs_date ON logs (date_heure);
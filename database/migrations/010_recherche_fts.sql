@@ -0,0 +1,135 @@
+-- INDEX DE RECHERCHE PLEIN TEXTE (FTS5, table locale dérivée, non synchronisée)
+-- Un index par type de résultat, dont le rowid est l'id de la ligne indexée. Les triggers ci-dessous
+-- le tiennent à jour à chaque écriture (interface, synchro ou instantané) ; les lignes supprimées
+-- (is_deleted = 1) en sont retirées. Les requêtes sont construites par RechercheModel.
+-- remove_diacritics 2 : « reservee » trouve « réservée ». prefix : index des préfixes courts,
+-- pour que la recherche au fil de la frappe (« du* ») ne parcoure pas tout le vocabulaire.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+    nom, prenom, tel, email, cni,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS reservations_fts USING fts5(
+    reference, client, chambre, statut, date_arrivee,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS problemes_fts USING fts5(
+    description, chambre,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+-- Classement (colonne rank, ORDER BY rank) : le nom et la référence pèsent plus que les coordonnées
+INSERT INTO clients_fts (clients_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 2.0, 2.0)');
+INSERT INTO reservations_fts (reservations_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 5.0, 1.0, 1.0)');
+
+-- clients : le téléphone est aussi indexé sans séparateurs (« 690123456 » trouve « 690 12 34 56 »)
+CREATE TRIGGER IF NOT EXISTS trg_fts_clients_ins AFTER INSERT ON clients
+WHEN NEW.is_deleted = 0
+BEGIN
+    INSERT INTO clients_fts (rowid, nom, prenom, tel, email, cni)
+    VALUES (NEW.id, NEW.nom, NEW.prenom,
+            NEW.tel || ' ' || replace(replace(replace(NEW.tel, ' ', ''), '-', ''), '.', ''),
+            NEW.email, NEW.cni);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_clients_upd
+AFTER UPDATE OF nom, prenom, tel, email, cni, is_deleted ON clients
+BEGIN
+    DELETE FROM clients_fts WHERE rowid = OLD.id;
+    INSERT INTO clients_fts (rowid, nom, prenom, tel, email, cni)
+    SELECT NEW.id, NEW.nom, NEW.prenom,
+           NEW.tel || ' ' || replace(replace(replace(NEW.tel, ' ', ''), '-', ''), '.', ''),
+           NEW.email, NEW.cni
+    WHERE NEW.is_deleted = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_clients_nom_upd AFTER UPDATE OF nom, prenom ON clients
+WHEN OLD.nom IS NOT NEW.nom OR OLD.prenom IS NOT NEW.prenom
+BEGIN
+    UPDATE reservations_fts SET client = NEW.nom || ' ' || coalesce(NEW.prenom, '')
+    WHERE rowid IN (SELECT id FROM reservations WHERE client_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_clients_del AFTER DELETE ON clients
+BEGIN
+    DELETE FROM clients_fts WHERE rowid = OLD.id;
+END;
+
+-- réservations : référence « RES-id », nom du client et numéro de chambre
+CREATE TRIGGER IF NOT EXISTS trg_fts_reservations_ins AFTER INSERT ON reservations
+WHEN NEW.is_deleted = 0
+BEGIN
+    INSERT INTO reservations_fts (rowid, reference, client, chambre, statut, date_arrivee)
+    VALUES (NEW.id, 'RES-' || NEW.id,
+            (SELECT nom || ' ' || coalesce(prenom, '') FROM clients WHERE id = NEW.client_id),
+            (SELECT numero FROM chambres WHERE id = NEW.chambre_id),
+            NEW.statut, NEW.date_arrivee);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_reservations_upd
+AFTER UPDATE OF client_id, chambre_id, statut, date_arrivee, is_deleted ON reservations
+BEGIN
+    DELETE FROM reservations_fts WHERE rowid = OLD.id;
+    INSERT INTO reservations_fts (rowid, reference, client, chambre, statut, date_arrivee)
+    SELECT NEW.id, 'RES-' || NEW.id,
+           (SELECT nom || ' ' || coalesce(prenom, '') FROM clients WHERE id = NEW.client_id),
+           (SELECT numero FROM chambres WHERE id = NEW.chambre_id),
+           NEW.statut, NEW.date_arrivee
+    WHERE NEW.is_deleted = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_reservations_del AFTER DELETE ON reservations
+BEGIN
+    DELETE FROM reservations_fts WHERE rowid = OLD.id;
+END;
+
+-- problèmes : description et numéro de chambre
+CREATE TRIGGER IF NOT EXISTS trg_fts_problemes_ins AFTER INSERT ON problemes
+WHEN NEW.is_deleted = 0
+BEGIN
+    INSERT INTO problemes_fts (rowid, description, chambre)
+    VALUES (NEW.id, NEW.description, (SELECT numero FROM chambres WHERE id = NEW.chambre_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_problemes_upd
+AFTER UPDATE OF description, chambre_id, is_deleted ON problemes
+BEGIN
+    DELETE FROM problemes_fts WHERE rowid = OLD.id;
+    INSERT INTO problemes_fts (rowid, description, chambre)
+    SELECT NEW.id, NEW.description, (SELECT numero FROM chambres WHERE id = NEW.chambre_id)
+    WHERE NEW.is_deleted = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_problemes_del AFTER DELETE ON problemes
+BEGIN
+    DELETE FROM problemes_fts WHERE rowid = OLD.id;
+END;
+
+-- chambres : un changement de numéro est reporté sur les réservations et les problèmes indexés
+CREATE TRIGGER IF NOT EXISTS trg_fts_chambres_numero_upd AFTER UPDATE OF numero ON chambres
+WHEN OLD.numero IS NOT NEW.numero
+BEGIN
+    UPDATE reservations_fts SET chambre = NEW.numero
+    WHERE rowid IN (SELECT id FROM reservations WHERE chambre_id = NEW.id);
+    UPDATE problemes_fts SET chambre = NEW.numero
+    WHERE rowid IN (SELECT id FROM problemes WHERE chambre_id = NEW.id);
+END;
+
+-- Indexation des lignes existantes
+INSERT INTO clients_fts (rowid, nom, prenom, tel, email, cni)
+SELECT id, nom, prenom, tel || ' ' || replace(replace(replace(tel, ' ', ''), '-', ''), '.', ''), email, cni
+FROM clients WHERE is_deleted = 0;
+
+INSERT INTO reservations_fts (rowid, reference, client, chambre, statut, date_arrivee)
+SELECT r.id, 'RES-' || r.id, c.nom || ' ' || coalesce(c.prenom, ''), ch.numero, r.statut, r.date_arrivee
+FROM reservations r
+LEFT JOIN clients c ON c.id = r.client_id
+LEFT JOIN chambres ch ON ch.id = r.chambre_id
+WHERE r.is_deleted = 0;
+
+INSERT INTO problemes_fts (rowid, description, chambre)
+SELECT p.id, p.description, ch.numero
+FROM problemes p LEFT JOIN chambres ch ON ch.id = p.chambre_id
+WHERE p.is_deleted = 0;
@@ -0,0 +1,7 @@
+-- INDEX DES INDICATEURS DU TABLEAU DE BORD (KpiModel)
+-- Chaque indicateur est une requête d'agrégat servie par un index, sur la seule période demandée.
+-- Les revenus d'une période sont servis par idx_paiements_date (migration 009).
+
+-- Problèmes en attente (statut 'Nouveau' ou 'En cours')
+CREATE INDEX IF NOT EXISTS idx_problemes_statut
+    ON problemes (statut) WHERE is_deleted = 0;
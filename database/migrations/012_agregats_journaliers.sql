@@ -0,0 +1,359 @@
+-- AGRÉGATS JOURNALIERS POUR LES STATISTIQUES (tables locales dérivées, non synchronisées)
+-- Une ligne par jour et par dimension, tenue à jour par les triggers ci-dessous à chaque écriture
+-- (interface, synchro, instantané) : chaque modification retire l'ancienne contribution de la ligne
+-- et ajoute la nouvelle. Les statistiques et le tableau de bord lisent ces quelques centaines de
+-- lignes au lieu de parcourir l'historique. Les lignes supprimées (is_deleted = 1) ne comptent pas.
+-- Une ligne peut retomber à zéro : elle reste en place, sans effet sur les sommes.
+
+-- Réservations par jour d'arrivée, type de chambre et statut (nuitées : au moins une par réservation).
+-- Le type est celui de la chambre aujourd'hui : un changement de type y déplace ses réservations.
+CREATE TABLE IF NOT EXISTS stats_reservations_jour (
+    jour DATE NOT NULL,
+    type_id INTEGER NOT NULL,
+    statut TEXT NOT NULL,
+    nb_reservations INTEGER NOT NULL DEFAULT 0,
+    nuitees INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, type_id, statut)
+) WITHOUT ROWID;
+
+-- Réservations par client (clients fidèles)
+CREATE TABLE IF NOT EXISTS stats_clients (
+    client_id INTEGER PRIMARY KEY,
+    nb_reservations INTEGER NOT NULL DEFAULT 0,
+    nuitees INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_stats_clients_nb ON stats_clients (nb_reservations);
+
+-- Paiements reçus par jour et méthode
+CREATE TABLE IF NOT EXISTS stats_paiements_jour (
+    jour DATE NOT NULL,
+    methode TEXT NOT NULL,
+    nb_paiements INTEGER NOT NULL DEFAULT 0,
+    montant REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, methode)
+) WITHOUT ROWID;
+
+-- Commandes par jour et point de vente (montant : articles non supprimés)
+CREATE TABLE IF NOT EXISTS stats_commandes_jour (
+    jour DATE NOT NULL,
+    lieu_consommation TEXT NOT NULL,
+    nb_commandes INTEGER NOT NULL DEFAULT 0,
+    montant REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, lieu_consommation)
+) WITHOUT ROWID;
+
+-- Chiffre d'affaires facturé par jour de prestation et département
+-- ('Hébergement', 'Consommations' : ligne liée à une commande, 'Services' : à une demande de service)
+CREATE TABLE IF NOT EXISTS stats_facturation_jour (
+    jour DATE NOT NULL,
+    departement TEXT NOT NULL,
+    montant_ht REAL NOT NULL DEFAULT 0,
+    montant_ttc REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (jour, departement)
+) WITHOUT ROWID;
+
+
+-- ===== Réservations =====
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_reservations_ins AFTER INSERT ON reservations
+WHEN NEW.is_deleted = 0
+BEGIN
+    INSERT INTO stats_reservations_jour (jour, type_id, statut, nb_reservations, nuitees)
+    VALUES (NEW.date_arrivee, coalesce((SELECT type_id FROM chambres WHERE id = NEW.chambre_id), 0), NEW.statut, 1,
+            max(1, coalesce(CAST(julianday(NEW.date_depart) - julianday(NEW.date_arrivee) AS INTEGER), 1)))
+    ON CONFLICT (jour, type_id, statut) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+    INSERT INTO stats_clients (client_id, nb_reservations, nuitees)
+    VALUES (NEW.client_id, 1,
+            max(1, coalesce(CAST(julianday(NEW.date_depart) - julianday(NEW.date_arrivee) AS INTEGER), 1)))
+    ON CONFLICT (client_id) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_reservations_upd
+AFTER UPDATE OF date_arrivee, date_depart, statut, chambre_id, client_id, is_deleted ON reservations
+BEGIN
+    INSERT INTO stats_reservations_jour (jour, type_id, statut, nb_reservations, nuitees)
+    SELECT OLD.date_arrivee, coalesce((SELECT type_id FROM chambres WHERE id = OLD.chambre_id), 0), OLD.statut, -1,
+           -max(1, coalesce(CAST(julianday(OLD.date_depart) - julianday(OLD.date_arrivee) AS INTEGER), 1))
+    WHERE OLD.is_deleted = 0
+    ON CONFLICT (jour, type_id, statut) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+    INSERT INTO stats_reservations_jour (jour, type_id, statut, nb_reservations, nuitees)
+    SELECT NEW.date_arrivee, coalesce((SELECT type_id FROM chambres WHERE id = NEW.chambre_id), 0), NEW.statut, 1,
+           max(1, coalesce(CAST(julianday(NEW.date_depart) - julianday(NEW.date_arrivee) AS INTEGER), 1))
+    WHERE NEW.is_deleted = 0
+    ON CONFLICT (jour, type_id, statut) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+
+    INSERT INTO stats_clients (client_id, nb_reservations, nuitees)
+    SELECT OLD.client_id, -1,
+           -max(1, coalesce(CAST(julianday(OLD.date_depart) - julianday(OLD.date_arrivee) AS INTEGER), 1))
+    WHERE OLD.is_deleted = 0
+    ON CONFLICT (client_id) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+    INSERT INTO stats_clients (client_id, nb_reservations, nuitees)
+    SELECT NEW.client_id, 1,
+           max(1, coalesce(CAST(julianday(NEW.date_depart) - julianday(NEW.date_arrivee) AS INTEGER), 1))
+    WHERE NEW.is_deleted = 0
+    ON CONFLICT (client_id) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_reservations_del AFTER DELETE ON reservations
+WHEN OLD.is_deleted = 0
+BEGIN
+    UPDATE stats_reservations_jour
+    SET nb_reservations = nb_reservations - 1,
+        nuitees = nuitees - max(1, coalesce(CAST(julianday(OLD.date_depart) - julianday(OLD.date_arrivee) AS INTEGER), 1))
+    WHERE jour = OLD.date_arrivee AND statut = OLD.statut
+      AND type_id = coalesce((SELECT type_id FROM chambres WHERE id = OLD.chambre_id), 0);
+    UPDATE stats_clients
+    SET nb_reservations = nb_reservations - 1,
+        nuitees = nuitees - max(1, coalesce(CAST(julianday(OLD.date_depart) - julianday(OLD.date_arrivee) AS INTEGER), 1))
+    WHERE client_id = OLD.client_id;
+END;
+
+-- Changement de type d'une chambre : ses réservations passent de l'ancien type au nouveau
+CREATE TRIGGER IF NOT EXISTS trg_stats_chambres_type_upd AFTER UPDATE OF type_id ON chambres
+WHEN OLD.type_id IS NOT NEW.type_id
+BEGIN
+    INSERT INTO stats_reservations_jour (jour, type_id, statut, nb_reservations, nuitees)
+    SELECT date_arrivee, coalesce(OLD.type_id, 0), statut, -COUNT(*),
+           -SUM(max(1, coalesce(CAST(julianday(date_depart) - julianday(date_arrivee) AS INTEGER), 1)))
+    FROM reservations WHERE chambre_id = NEW.id AND is_deleted = 0
+    GROUP BY date_arrivee, statut
+    ON CONFLICT (jour, type_id, statut) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+    INSERT INTO stats_reservations_jour (jour, type_id, statut, nb_reservations, nuitees)
+    SELECT date_arrivee, coalesce(NEW.type_id, 0), statut, COUNT(*),
+           SUM(max(1, coalesce(CAST(julianday(date_depart) - julianday(date_arrivee) AS INTEGER), 1)))
+    FROM reservations WHERE chambre_id = NEW.id AND is_deleted = 0
+    GROUP BY date_arrivee, statut
+    ON CONFLICT (jour, type_id, statut) DO UPDATE SET
+        nb_reservations = nb_reservations + excluded.nb_reservations, nuitees = nuitees + excluded.nuitees;
+END;
+
+
+-- ===== Paiements =====
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_paiements_ins AFTER INSERT ON paiements
+WHEN NEW.is_deleted = 0
+BEGIN
+    INSERT INTO stats_paiements_jour (jour, methode, nb_paiements, montant)
+    VALUES (coalesce(substr(NEW.date_paiement, 1, 10), ''), coalesce(NEW.methode, 'Autre'), 1, NEW.montant)
+    ON CONFLICT (jour, methode) DO UPDATE SET
+        nb_paiements = nb_paiements + excluded.nb_paiements, montant = montant + excluded.montant;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_paiements_upd
+AFTER UPDATE OF montant, methode, date_paiement, is_deleted ON paiements
+BEGIN
+    INSERT INTO stats_paiements_jour (jour, methode, nb_paiements, montant)
+    SELECT coalesce(substr(OLD.date_paiement, 1, 10), ''), coalesce(OLD.methode, 'Autre'), -1, -OLD.montant
+    WHERE OLD.is_deleted = 0
+    ON CONFLICT (jour, methode) DO UPDATE SET
+        nb_paiements = nb_paiements + excluded.nb_paiements, montant = montant + excluded.montant;
+    INSERT INTO stats_paiements_jour (jour, methode, nb_paiements, montant)
+    SELECT coalesce(substr(NEW.date_paiement, 1, 10), ''), coalesce(NEW.methode, 'Autre'), 1, NEW.montant
+    WHERE NEW.is_deleted = 0
+    ON CONFLICT (jour, methode) DO UPDATE SET
+        nb_paiements = nb_paiements + excluded.nb_paiements, montant = montant + excluded.montant;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_paiements_del AFTER DELETE ON paiements
+WHEN OLD.is_deleted = 0
+BEGIN
+    UPDATE stats_paiements_jour SET nb_paiements = nb_paiements - 1, montant = montant - OLD.montant
+    WHERE jour = coalesce(substr(OLD.date_paiement, 1, 10), '') AND methode = coalesce(OLD.methode, 'Autre');
+END;
+
+
+-- ===== Commandes et leurs articles =====
+-- Le montant d'un article compte au jour et au point de vente de sa commande (si elle n'est pas supprimée).
+-- Suppression d'une commande : BEFORE, pour retirer ses articles avant leur suppression en cascade.
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_commandes_ins AFTER INSERT ON commandes
+WHEN NEW.is_deleted = 0
+BEGIN
+    INSERT INTO stats_commandes_jour (jour, lieu_consommation, nb_commandes, montant)
+    VALUES (coalesce(substr(NEW.date_commande, 1, 10), ''), coalesce(NEW.lieu_consommation, 'Room Service'), 1, 0)
+    ON CONFLICT (jour, lieu_consommation) DO UPDATE SET nb_commandes = nb_commandes + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_commandes_upd
+AFTER UPDATE OF date_commande, lieu_consommation, is_deleted ON commandes
+BEGIN
+    INSERT INTO stats_commandes_jour (jour, lieu_consommation, nb_commandes, montant)
+    SELECT coalesce(substr(OLD.date_commande, 1, 10), ''), coalesce(OLD.lieu_consommation, 'Room Service'), -1,
+           -(SELECT coalesce(SUM(quantite * prix_unitaire_capture), 0) FROM commande_items
+             WHERE commande_id = OLD.id AND is_deleted = 0)
+    WHERE OLD.is_deleted = 0
+    ON CONFLICT (jour, lieu_consommation) DO UPDATE SET
+        nb_commandes = nb_commandes + excluded.nb_commandes, montant = montant + excluded.montant;
+    INSERT INTO stats_commandes_jour (jour, lieu_consommation, nb_commandes, montant)
+    SELECT coalesce(substr(NEW.date_commande, 1, 10), ''), coalesce(NEW.lieu_consommation, 'Room Service'), 1,
+           (SELECT coalesce(SUM(quantite * prix_unitaire_capture), 0) FROM commande_items
+            WHERE commande_id = NEW.id AND is_deleted = 0)
+    WHERE NEW.is_deleted = 0
+    ON CONFLICT (jour, lieu_consommation) DO UPDATE SET
+        nb_commandes = nb_commandes + excluded.nb_commandes, montant = montant + excluded.montant;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_commandes_del BEFORE DELETE ON commandes
+WHEN OLD.is_deleted = 0
+BEGIN
+    UPDATE stats_commandes_jour
+    SET nb_commandes = nb_commandes - 1,
+        montant = montant - (SELECT coalesce(SUM(quantite * prix_unitaire_capture), 0) FROM commande_items
+                             WHERE commande_id = OLD.id AND is_deleted = 0)
+    WHERE jour = coalesce(substr(OLD.date_commande, 1, 10), '')
+      AND lieu_consommation = coalesce(OLD.lieu_consommation, 'Room Service');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_commande_items_ins AFTER INSERT ON commande_items
+WHEN NEW.is_deleted = 0
+BEGIN
+    UPDATE stats_commandes_jour SET montant = montant + NEW.quantite * NEW.prix_unitaire_capture
+    WHERE (jour, lieu_consommation) = (
+        SELECT coalesce(substr(date_commande, 1, 10), ''), coalesce(lieu_consommation, 'Room Service')
+        FROM commandes WHERE id = NEW.commande_id AND is_deleted = 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_commande_items_upd
+AFTER UPDATE OF quantite, prix_unitaire_capture, is_deleted, commande_id ON commande_items
+BEGIN
+    UPDATE stats_commandes_jour SET montant = montant - OLD.quantite * OLD.prix_unitaire_capture
+    WHERE OLD.is_deleted = 0 AND (jour, lieu_consommation) = (
+        SELECT coalesce(substr(date_commande, 1, 10), ''), coalesce(lieu_consommation, 'Room Service')
+        FROM commandes WHERE id = OLD.commande_id AND is_deleted = 0);
+    UPDATE stats_commandes_jour SET montant = montant + NEW.quantite * NEW.prix_unitaire_capture
+    WHERE NEW.is_deleted = 0 AND (jour, lieu_consommation) = (
+        SELECT coalesce(substr(date_commande, 1, 10), ''), coalesce(lieu_consommation, 'Room Service')
+        FROM commandes WHERE id = NEW.commande_id AND is_deleted = 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_commande_items_del AFTER DELETE ON commande_items
+WHEN OLD.is_deleted = 0
+BEGIN
+    UPDATE stats_commandes_jour SET montant = montant - OLD.quantite * OLD.prix_unitaire_capture
+    WHERE (jour, lieu_consommation) = (
+        SELECT coalesce(substr(date_commande, 1, 10), ''), coalesce(lieu_consommation, 'Room Service')
+        FROM commandes WHERE id = OLD.commande_id AND is_deleted = 0);
+END;
+
+
+-- ===== Lignes de facture =====
+-- Une ligne compte au jour de sa prestation si ni elle ni sa facture ne sont supprimées.
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_facture_items_ins AFTER INSERT ON facture_items
+WHEN NEW.is_deleted = 0 AND (SELECT is_deleted FROM factures WHERE id = NEW.facture_id) = 0
+BEGIN
+    INSERT INTO stats_facturation_jour (jour, departement, montant_ht, montant_ttc)
+    VALUES (coalesce(substr(NEW.date_prestation, 1, 10), ''),
+            CASE WHEN NEW.commande_id IS NOT NULL THEN 'Consommations'
+                 WHEN NEW.service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END,
+            NEW.montant_ht, NEW.montant_ttc)
+    ON CONFLICT (jour, departement) DO UPDATE SET
+        montant_ht = montant_ht + excluded.montant_ht, montant_ttc = montant_ttc + excluded.montant_ttc;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_facture_items_upd
+AFTER UPDATE OF montant_ht, montant_ttc, date_prestation, commande_id, service_demande_id, is_deleted, facture_id
+ON facture_items
+BEGIN
+    INSERT INTO stats_facturation_jour (jour, departement, montant_ht, montant_ttc)
+    SELECT coalesce(substr(OLD.date_prestation, 1, 10), ''),
+           CASE WHEN OLD.commande_id IS NOT NULL THEN 'Consommations'
+                WHEN OLD.service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END,
+           -OLD.montant_ht, -OLD.montant_ttc
+    WHERE OLD.is_deleted = 0 AND (SELECT is_deleted FROM factures WHERE id = OLD.facture_id) = 0
+    ON CONFLICT (jour, departement) DO UPDATE SET
+        montant_ht = montant_ht + excluded.montant_ht, montant_ttc = montant_ttc + excluded.montant_ttc;
+    INSERT INTO stats_facturation_jour (jour, departement, montant_ht, montant_ttc)
+    SELECT coalesce(substr(NEW.date_prestation, 1, 10), ''),
+           CASE WHEN NEW.commande_id IS NOT NULL THEN 'Consommations'
+                WHEN NEW.service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END,
+           NEW.montant_ht, NEW.montant_ttc
+    WHERE NEW.is_deleted = 0 AND (SELECT is_deleted FROM factures WHERE id = NEW.facture_id) = 0
+    ON CONFLICT (jour, departement) DO UPDATE SET
+        montant_ht = montant_ht + excluded.montant_ht, montant_ttc = montant_ttc + excluded.montant_ttc;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_stats_facture_items_del AFTER DELETE ON facture_items
+WHEN OLD.is_deleted = 0 AND (SELECT is_deleted FROM factures WHERE id = OLD.facture_id) = 0
+BEGIN
+    UPDATE stats_facturation_jour
+    SET montant_ht = montant_ht - OLD.montant_ht, montant_ttc = montant_ttc - OLD.montant_ttc
+    WHERE jour = coalesce(substr(OLD.date_prestation, 1, 10), '')
+      AND departement = CASE WHEN OLD.commande_id IS NOT NULL THEN 'Consommations'
+                             WHEN OLD.service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END;
+END;
+
+-- Suppression d'une facture : ses lignes sont retirées avant leur suppression en cascade
+CREATE TRIGGER IF NOT EXISTS trg_stats_factures_del BEFORE DELETE ON factures
+WHEN OLD.is_deleted = 0
+BEGIN
+    INSERT INTO stats_facturation_jour (jour, departement, montant_ht, montant_ttc)
+    SELECT coalesce(substr(date_prestation, 1, 10), ''),
+           CASE WHEN commande_id IS NOT NULL THEN 'Consommations'
+                WHEN service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END AS departement,
+           -SUM(montant_ht), -SUM(montant_ttc)
+    FROM facture_items WHERE facture_id = OLD.id AND is_deleted = 0
+    GROUP BY 1, 2
+    ON CONFLICT (jour, departement) DO UPDATE SET
+        montant_ht = montant_ht + excluded.montant_ht, montant_ttc = montant_ttc + excluded.montant_ttc;
+END;
+
+-- Facture supprimée (ou rétablie) : ses lignes sortent (ou reviennent) des agrégats
+CREATE TRIGGER IF NOT EXISTS trg_stats_factures_upd AFTER UPDATE OF is_deleted ON factures
+WHEN OLD.is_deleted IS NOT NEW.is_deleted
+BEGIN
+    INSERT INTO stats_facturation_jour (jour, departement, montant_ht, montant_ttc)
+    SELECT coalesce(substr(date_prestation, 1, 10), ''),
+           CASE WHEN commande_id IS NOT NULL THEN 'Consommations'
+                WHEN service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END AS departement,
+           CASE WHEN NEW.is_deleted = 0 THEN 1 ELSE -1 END * SUM(montant_ht),
+           CASE WHEN NEW.is_deleted = 0 THEN 1 ELSE -1 END * SUM(montant_ttc)
+    FROM facture_items WHERE facture_id = NEW.id AND is_deleted = 0
+    GROUP BY 1, 2
+    ON CONFLICT (jour, departement) DO UPDATE SET
+        montant_ht = montant_ht + excluded.montant_ht, montant_ttc = montant_ttc + excluded.montant_ttc;
+END;
+
+
+-- ===== Calcul initial à partir des lignes existantes =====
+
+INSERT INTO stats_reservations_jour (jour, type_id, statut, nb_reservations, nuitees)
+SELECT r.date_arrivee, coalesce(ch.type_id, 0), r.statut, COUNT(*),
+       SUM(max(1, coalesce(CAST(julianday(r.date_depart) - julianday(r.date_arrivee) AS INTEGER), 1)))
+FROM reservations r LEFT JOIN chambres ch ON ch.id = r.chambre_id
+WHERE r.is_deleted = 0
+GROUP BY 1, 2, 3;
+
+INSERT INTO stats_clients (client_id, nb_reservations, nuitees)
+SELECT client_id, COUNT(*),
+       SUM(max(1, coalesce(CAST(julianday(date_depart) - julianday(date_arrivee) AS INTEGER), 1)))
+FROM reservations WHERE is_deleted = 0
+GROUP BY client_id;
+
+INSERT INTO stats_paiements_jour (jour, methode, nb_paiements, montant)
+SELECT coalesce(substr(date_paiement, 1, 10), ''), coalesce(methode, 'Autre'), COUNT(*), SUM(montant)
+FROM paiements WHERE is_deleted = 0
+GROUP BY 1, 2;
+
+INSERT INTO stats_commandes_jour (jour, lieu_consommation, nb_commandes, montant)
+SELECT coalesce(substr(c.date_commande, 1, 10), ''), coalesce(c.lieu_consommation, 'Room Service'), COUNT(*),
+       coalesce(SUM((SELECT SUM(ci.quantite * ci.prix_unitaire_capture) FROM commande_items ci
+                     WHERE ci.commande_id = c.id AND ci.is_deleted = 0)), 0)
+FROM commandes c WHERE c.is_deleted = 0
+GROUP BY 1, 2;
+
+INSERT INTO stats_facturation_jour (jour, departement, montant_ht, montant_ttc)
+SELECT coalesce(substr(fi.date_prestation, 1, 10), ''),
+       CASE WHEN fi.commande_id IS NOT NULL THEN 'Consommations'
+            WHEN fi.service_demande_id IS NOT NULL THEN 'Services' ELSE 'Hébergement' END,
+       SUM(fi.montant_ht), SUM(fi.montant_ttc)
+FROM facture_items fi JOIN factures f ON f.id = fi.facture_id
+WHERE fi.is_deleted = 0 AND f.is_deleted = 0
+GROUP BY 1, 2;
@@ -0,0 +1,28 @@
+-- FONCTION D'EMPREINTES POUR LA VÉRIFICATION DE SYNCHRO (à créer une fois dans le projet Supabase)
+-- Appelée par SupabaseTransport.fetch_digests via /rpc/sync_digests.
+-- Pour chaque plage d'ids [bucket, bucket + p_bucket_size) : nombre de lignes et md5 de
+-- "id:updated_at" joints par des virgules, dans l'ordre des ids. updated_at est rendu au format
+-- JSON de PostgREST, celui que les postes reçoivent et stockent : même calcul que range_digests().
+
+CREATE OR REPLACE FUNCTION sync_digests(
+    p_table text,
+    p_bucket_size bigint,
+    p_id_min bigint DEFAULT NULL,
+    p_id_max bigint DEFAULT NULL
+)
+RETURNS TABLE (bucket bigint, count bigint, digest text)
+LANGUAGE plpgsql STABLE
+AS $$
+BEGIN
+    RETURN QUERY EXECUTE format(
+        'SELECT ((id / %1$s) * %1$s)::bigint AS bucket,
+                count(*) AS count,
+                md5(string_agg(id::text || '':'' || coalesce(to_json(updated_at) #>> ''{}'', ''''), '','' ORDER BY id)) AS digest
+         FROM %2$I
+         WHERE ($1 IS NULL OR id >= $1) AND ($2 IS NULL OR id < $2)
+         GROUP BY 1
+         ORDER BY 1',
+        p_bucket_size, p_table)
+    USING p_id_min, p_id_max;
+END;
+$$;
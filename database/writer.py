@@ -0,0 +1,172 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/database/writer.py
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+# Priorités de la file d'écriture : plus petit = servi d'abord.
+PRIORITE_UI = 0
+PRIORITE_SYNCHRO = 10
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "foreign_keys", "exclusif", "future")
+
+    def __init__(self, fn, args, kwargs, foreign_keys, exclusif=False):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.foreign_keys = foreign_keys
+        # Tour réservé par une unité de travail d'un autre thread (voir exclusif()) : exécuté seul, hors transaction
+        self.exclusif = exclusif
+        self.future = Future()
+
+
+class DatabaseWriter:
+    """
+    Thread d'écriture unique d'un pool : toutes les modifications lui sont confiées via une file.
+    - Un seul écrivain : plus de "database is locked" entre l'interface et la synchro.
+    - Commit groupé : les travaux en attente sont exécutés dans une même transaction (un seul COMMIT),
+      chacun dans son SAVEPOINT, de sorte qu'un travail en échec n'annule que ses propres écritures.
+    - File à priorités : les écritures de l'interface passent avant celles de la synchro.
+    - Unités de travail (pool.transaction()) ouvertes dans un autre thread : elles prennent leur tour
+      dans la file (exclusif()), le thread d'écriture attendant, sans verrou, qu'elles se terminent.
+    Les lectures ne passent pas par ici : elles se font en parallèle sur les connexions WAL du pool.
+    """
+
+    def __init__(self, pool, max_batch=64):
+        self.pool = pool
+        self.max_batch = max_batch
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._proprietaire = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def detient_tour(self):
+        """Vrai si le thread courant mène une unité de travail pendant son tour d'écriture (voir exclusif())."""
+        return self._proprietaire is threading.current_thread()
+
+    def submit(self, fn, *args, priority=PRIORITE_UI, foreign_keys=True, **kwargs):
+        """Met `fn(*args, **kwargs)` en file ; retourne un Future résolu après le COMMIT."""
+        job = _Job(fn, args, kwargs, foreign_keys)
+        self._ensure_started()
+        self._queue.put((priority, next(self._counter), job))
+        return job.future
+
+    def run(self, fn, *args, priority=PRIORITE_UI, foreign_keys=True, **kwargs):
+        """
+        Exécute `fn` dans le thread d'écriture et attend son résultat (ou son exception).
+        Appelée depuis le thread d'écriture lui-même, la fonction s'exécute directement.
+        """
+        if self.in_writer_thread() or self.detient_tour():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, priority=priority, foreign_keys=foreign_keys, **kwargs).result()
+
+    @contextmanager
+    def exclusif(self, priority=PRIORITE_UI):
+        """
+        Tour d'écriture pour une unité de travail menée dans le thread appelant : un travail est mis
+        en file comme les autres et, quand vient son tour, le thread d'écriture s'arrête (hors
+        transaction, sans verrou) jusqu'à la sortie du bloc. L'unité de travail n'est donc jamais en
+        concurrence avec un lot du thread d'écriture : elle attend son tour au lieu du busy_timeout.
+        """
+        if self.in_writer_thread() or self.detient_tour():
+            yield
+            return
+        accorde, termine = threading.Event(), threading.Event()
+        job = _Job(self._attendre_fin, (accorde, termine), {}, True, exclusif=True)
+        self._ensure_started()
+        self._queue.put((priority, next(self._counter), job))
+        accorde.wait()
+        self._proprietaire = threading.current_thread()
+        try:
+            yield
+        finally:
+            self._proprietaire = None
+            termine.set()
+
+    @staticmethod
+    def _attendre_fin(accorde, termine):
+        accorde.set()
+        termine.wait()
+
+    def stop(self, timeout=5):
+        """Termine le thread après les travaux déjà en file."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put((float("inf"), next(self._counter), None))
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while True:
+            entry = self._queue.get()
+            if entry[2] is None:
+                return
+            if entry[2].exclusif:
+                self._execute_exclusif(entry[2])
+                continue
+            batch = [entry[2]]
+            # Regroupe les travaux déjà en attente (même réglage de clés étrangères : le PRAGMA
+            # ne peut pas changer à l'intérieur d'une transaction).
+            while len(batch) < self.max_batch:
+                try:
+                    following = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if following[2] is None or following[2].exclusif or \
+                        following[2].foreign_keys != batch[0].foreign_keys:
+                    self._queue.put(following)
+                    break
+                batch.append(following[2])
+            self._execute(batch)
+
+    @staticmethod
+    def _execute_exclusif(job):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(job.fn(*job.args, **job.kwargs))
+        except BaseException as e:
+            job.future.set_exception(e)
+
+    def _execute(self, batch):
+        results = {}
+        conn = None
+        try:
+            conn = self.pool.connection(foreign_keys=batch[0].foreign_keys)
+            with self.pool.transaction():
+                for job in batch:
+                    if not job.future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self.pool.transaction():
+                            results[job] = (job.fn(*job.args, **job.kwargs), None)
+                    except BaseException as e:
+                        results[job] = (None, e)
+        except BaseException as e:
+            # Échec du COMMIT (ou de l'ouverture) : aucun travail du lot n'a été enregistré.
+            for job in batch:
+                if not job.future.done():
+                    if not job.future.running():
+                        job.future.set_running_or_notify_cancel()
+                    job.future.set_exception(e)
+            return
+        finally:
+            if conn is not None:
+                conn.close()
+
+        for job, (result, error) in results.items():
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
@@ -1,13 +1,7 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/main.py
 
+import multiprocessing
 import sys
-from PySide6.QtWidgets import QApplication
-
-from database.db import init_db
-from ui.login import LoginWindow
-from ui.splash import SplashScreen
-# --- MODIFICATION : On importe notre nouvelle fonction utilitaire ---
-from ui.center_utils import center_on_screen
 
 
 def show_login():
@@ -19,6 +13,19 @@ def show_login():
 
 
 if __name__ == "__main__":
+    # Processus de l'export des factures PDF (utils/pdf_generator.py) dans l'application empaquetée
+    multiprocessing.freeze_support()
+
+    # Imports de l'interface et de la base ici, pas en tête de module : chaque processus de l'export
+    # (démarré par spawn) réexécute ce fichier sous le nom __mp_main__ et n'a besoin ni de Qt ni de la base.
+    from PySide6.QtWidgets import QApplication
+
+    from database.db import init_db
+    from ui.login import LoginWindow
+    from ui.splash import SplashScreen
+    # --- MODIFICATION : On importe notre nouvelle fonction utilitaire ---
+    from ui.center_utils import center_on_screen
+
     init_db()
 
     app = QApplication(sys.argv)
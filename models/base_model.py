@@ -1,27 +1,98 @@
-import sqlite3
+import functools
 import os
 
+from database.cache import cache
+from database.connection_pool import DB_PATH, pool
+
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(PROJECT_ROOT, "hotel.db")
+
+# Nombre de lignes par défaut d'une page de liste (pagination par clé, voir BaseModel.keyset)
+PAGE_SIZE = 100
+
+
+def ecriture(methode):
+    """
+    Décorateur des méthodes de modèle qui modifient la base (à placer sous @classmethod).
+    La méthode est exécutée par le thread d'écriture unique (database/writer.py), qui sérialise
+    et regroupe les commits ; l'appelant attend le résultat et reçoit les mêmes exceptions.
+    Si le thread courant a déjà une transaction ouverte (unité de travail BaseModel.transaction()),
+    la méthode s'y exécute directement pour en faire partie.
+    """
+    @functools.wraps(methode)
+    def wrapper(cls, *args, **kwargs):
+        if pool.in_transaction():
+            return methode(cls, *args, **kwargs)
+        return pool.writer.run(methode, cls, *args, **kwargs)
+    return wrapper
+
+
+def reference(*tables):
+    """
+    Décorateur des lectures de données de référence (à placer sous @classmethod) : le résultat est
+    gardé en mémoire par database/cache.py, par arguments, jusqu'à la prochaine écriture dans l'une
+    des `tables`. Les écritures de ces tables doivent appeler cache.invalider(table).
+    """
+    def decorateur(methode):
+        @functools.wraps(methode)
+        def wrapper(cls, *args, **kwargs):
+            cle = (cls.__name__, methode.__name__, args, tuple(sorted(kwargs.items())))
+            return cache.lire(tables, cle, lambda: methode(cls, *args, **kwargs))
+        return wrapper
+    return decorateur
+
 
 class BaseModel:
     @classmethod
     def connect(cls):
         """
-        Établit et RETOURNE une nouvelle connexion à la base de données.
-        Cette méthode ne stocke plus la connexion, elle la fournit à la demande.
+        Emprunte une connexion au pool partagé (voir database/connection_pool.py).
+        La connexion est rendue au pool à la sortie du bloc `with` (ou via `conn.close()`),
+        et les appels imbriqués dans le même thread réutilisent la même connexion.
         """
-        if not os.path.exists(DB_PATH):
-            raise FileNotFoundError(f"Fichier base de données introuvable : {DB_PATH}")
+        return pool.connection()
 
-        # On crée une nouvelle connexion à chaque appel
-        conn = sqlite3.connect(DB_PATH)
-        # On active les contraintes de clé étrangère pour la sécurité des données
-        conn.execute("PRAGMA foreign_keys = ON;")
-        # On configure les résultats pour qu'ils soient accessibles comme des dictionnaires
-        conn.row_factory = sqlite3.Row
+    @classmethod
+    def transaction(cls):
+        """
+        Ouvre une unité de travail couvrant plusieurs modèles :
 
-        return conn
+            with BaseModel.transaction():
+                FactureItemModel.delete_by_facture(facture_id)
+                FactureItemModel.create(...)
+
+        Les commit() des modèles appelés dans le bloc sont différés jusqu'à sa sortie.
+        Le bloc prend son tour dans la file du thread d'écriture (voir ConnectionPool.transaction) :
+        il n'écrit jamais en même temps qu'une synchro.
+        """
+        return pool.transaction()
+
+    @staticmethod
+    def keyset(colonnes, after=None, ordre="desc"):
+        """
+        Pagination par clé (keyset) sur `colonnes`, la dernière étant l'id (unique) de la table.
+        Retourne (condition, tri, params) à placer dans `WHERE ... {condition} ORDER BY {tri} LIMIT ?`.
+        `after` est la clé de la dernière ligne de la page précédente (voir cle_suivante), None pour
+        la première page. Contrairement à OFFSET, l'index est parcouru à partir de la clé :
+        le coût d'une page ne dépend pas de sa position dans l'historique.
+        """
+        if ordre not in ("asc", "desc"):
+            raise ValueError(f"Ordre de tri invalide : {ordre}")
+        sens = "DESC" if ordre == "desc" else "ASC"
+        tri = ", ".join(f"{col} {sens}" for col in colonnes)
+        if after is None:
+            return "", tri, []
+        if len(after) != len(colonnes):
+            raise ValueError(f"Clé de pagination invalide : {after}")
+        comparaison = "<" if ordre == "desc" else ">"
+        condition = f" AND ({', '.join(colonnes)}) {comparaison} ({', '.join(['?'] * len(colonnes))})"
+        return condition, tri, list(after)
+
+    @staticmethod
+    def cle_suivante(rows, cles, limit):
+        """Clé `after` de la page suivante (valeurs des `cles` de la dernière ligne), None si c'est la dernière page."""
+        if len(rows) < limit:
+            return None
+        return tuple(rows[-1][cle] for cle in cles)
 
     @staticmethod
     def dict_factory(cursor, row):
@@ -1,12 +1,14 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/chambre_model.py
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from database.cache import cache
+from models.base_model import BaseModel, ecriture, reference
 import sqlite3
 
 class ChambreModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, numero, type_id, statut='libre'):
         """Crée une nouvelle chambre."""
         query = "INSERT INTO chambres (numero, type_id, statut) VALUES (?, ?, ?)"
@@ -14,6 +16,7 @@ class ChambreModel(BaseModel):
             with cls.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, (numero, type_id, statut))
+                cache.invalider("chambres")
                 conn.commit()
                 return cursor.lastrowid
         except sqlite3.IntegrityError as e:
@@ -22,6 +25,7 @@ class ChambreModel(BaseModel):
             raise Exception(f"Erreur base de données lors de la création de la chambre : {e}") from e
 
     @classmethod
+    @reference("chambres", "types_chambre")
     def get_all(cls):
         """Récupère toutes les chambres avec les détails de leur type."""
         query = """
@@ -40,6 +44,7 @@ class ChambreModel(BaseModel):
             raise Exception(f"Erreur de récupération des chambres : {e}") from e
 
     @classmethod
+    @reference("chambres", "types_chambre")
     def get_by_id(cls, chambre_id):
         """Récupère une chambre spécifique par son ID."""
         query = """
@@ -58,6 +63,7 @@ class ChambreModel(BaseModel):
             raise Exception(f"Erreur de récupération de la chambre {chambre_id} : {e}") from e
 
     @classmethod
+    @ecriture
     def update(cls, chambre_id, numero, type_id, statut):
         """Met à jour les informations d'une chambre."""
         query = "UPDATE chambres SET numero = ?, type_id = ?, statut = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -66,12 +72,14 @@ class ChambreModel(BaseModel):
             with cls.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, (numero, type_id, statut, timestamp_actuel, chambre_id))
+                cache.invalider("chambres")
                 conn.commit()
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             raise Exception(f"Erreur de mise à jour de la chambre {chambre_id} : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, chambre_id):
         """Supprime une chambre."""
         query = "UPDATE chambres SET is_deleted = 1, updated_at = ? WHERE id = ?"
@@ -80,12 +88,14 @@ class ChambreModel(BaseModel):
             with cls.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, (timestamp_actuel, chambre_id,))
+                cache.invalider("chambres")
                 conn.commit()
                 return cursor.rowcount > 0
         except sqlite3.Error as e:
             raise Exception(f"Erreur de suppression de la chambre {chambre_id} : {e}") from e
 
     @classmethod
+    @reference("types_chambre")
     def get_all_types(cls):
         """Récupère tous les types de chambre disponibles."""
         query = "SELECT id, nom, prix_par_nuit FROM types_chambre WHERE is_deleted = 0 ORDER BY nom"
@@ -100,18 +110,20 @@ class ChambreModel(BaseModel):
     @classmethod
     def get_chambres_disponibles(cls, date_arrivee, date_depart):
         """
-        Retourne les chambres qui n'ont aucune réservation active chevauchante avec les dates données.
+        Retourne les chambres en service qui n'ont aucune réservation active (réservée ou check-in)
+        chevauchant la période [date_arrivee, date_depart).
+        Le NOT EXISTS est résolu pour chaque chambre par l'index idx_reservations_disponibilite.
         """
         query = """
-            SELECT c.id, c.numero, tc.nom AS type_nom, tc.prix_par_nuit
+            SELECT c.id, c.numero, c.statut, tc.nom AS type_nom, tc.prix_par_nuit
             FROM chambres c
             JOIN types_chambre tc ON c.type_id = tc.id
-            WHERE c.statut = 'libre' AND c.id NOT IN (
-                SELECT r.chambre_id FROM reservations r
-                WHERE r.statut != 'annulée' AND (
-                    r.date_arrivee < ? AND r.date_depart > ?
-                )
-            ) AND c.is_deleted = 0
+            WHERE c.is_deleted = 0 AND c.statut != 'hors service'
+              AND NOT EXISTS (
+                SELECT 1 FROM reservations r
+                WHERE r.chambre_id = c.id AND r.statut IN ('réservée', 'check-in') AND r.is_deleted = 0
+                  AND r.date_arrivee < ? AND r.date_depart > ?
+              )
             ORDER BY c.numero
         """
         try:
@@ -120,4 +132,4 @@ class ChambreModel(BaseModel):
                 cursor.execute(query, (date_depart, date_arrivee))
                 return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
-            raise Exception(f"Erreur de recherche des chambres disponibles : {e}") from e
\ No newline at end of file
+            raise Exception(f"Erreur de recherche des chambres disponibles : {e}") from e
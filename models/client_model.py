@@ -2,12 +2,13 @@
 import sqlite3
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
-from models.base_model import BaseModel
+from models.base_model import BaseModel, ecriture
 
 class ClientModel(BaseModel):
     """Modèle pour gérer les clients dans la base de données."""
 
     @classmethod
+    @ecriture
     def create(cls, nom: str, prenom: Optional[str] = None, tel: Optional[str] = None,
                email: Optional[str] = None, cni: Optional[str] = None, adresse: Optional[str] = None) -> int:
         query = """
@@ -57,6 +58,7 @@ class ClientModel(BaseModel):
             raise Exception(f"Erreur de récupération de tous les clients : {e}") from e
 
     @classmethod
+    @ecriture
     def update(cls, client_id: int, **kwargs) -> bool:
         fields_to_update = {k: v.strip() if isinstance(v, str) else v for k, v in kwargs.items() if v is not None}
         if not fields_to_update:
@@ -80,6 +82,7 @@ class ClientModel(BaseModel):
             raise Exception(f"Erreur de mise à jour du client {client_id} : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, client_id: int) -> bool:
         if cls.has_reservations(client_id):
             raise Exception("Impossible de supprimer un client avec des réservations existantes.")
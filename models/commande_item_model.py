@@ -2,11 +2,12 @@
 from datetime import datetime, timezone
 from typing import List, Dict, Any
 import sqlite3
-from models.base_model import BaseModel
+from models.base_model import BaseModel, ecriture
 
 class CommandeItemModel(BaseModel):
 
     @classmethod
+    @ecriture
     def add_item(cls, commande_id, produit_id, quantite, prix_unitaire_capture):
         """Ajoute un produit dans une commande."""
         query = """
@@ -40,6 +41,7 @@ class CommandeItemModel(BaseModel):
             raise Exception(f"Erreur récupération items commande : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, item_id: int) -> bool:
         """Supprime un article d'une commande."""
         query = "UPDATE commande_items SET is_deleted = 1, updated_at = ? WHERE id = ?"
@@ -1,12 +1,13 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/commande_model.py
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from models.base_model import PAGE_SIZE, BaseModel, ecriture
 import sqlite3
 
 class CommandeModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, reservation_id, user_id_saisie=None, lieu_consommation='Room Service'):
         """Crée une nouvelle commande (vide pour le moment)."""
         query = """
@@ -41,7 +42,37 @@ class CommandeModel(BaseModel):
         except sqlite3.Error as e:
             raise Exception(f"Erreur récupération commandes : {e}") from e
 
+
+    # Clé de pagination de get_page (voir BaseModel.keyset)
+    CLE_PAGE = ("date_commande", "id")
+
+    @classmethod
+    def get_page(cls, after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """Une page de commandes triées par (date_commande, id). Filtres : reservation_id, lieu_consommation, statut."""
+        query = """
+            SELECT c.*, r.chambre_id, u.nom_complet AS saisi_par
+            FROM commandes c
+            JOIN reservations r ON c.reservation_id = r.id
+            LEFT JOIN users u ON c.user_id_saisie = u.id
+            WHERE c.is_deleted = 0
+        """
+        params = []
+        for colonne in ("reservation_id", "lieu_consommation", "statut"):
+            if filtre and colonne in filtre:
+                query += f" AND c.{colonne} = ?"
+                params.append(filtre[colonne])
+        condition, tri, cle = cls.keyset(("c.date_commande", "c.id"), after, ordre)
+        query += f"{condition} ORDER BY {tri} LIMIT ?"
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, params + cle + [limit])
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération commandes : {e}") from e
+
     @classmethod
+    @ecriture
     def update_statut(cls, commande_id, nouveau_statut):
         """Met à jour le statut d'une commande."""
         query = "UPDATE commandes SET statut = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -56,6 +87,7 @@ class CommandeModel(BaseModel):
             raise Exception(f"Erreur mise à jour statut commande : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, commande_id):
         """Supprime une commande (et ses items grâce à ON DELETE CASCADE)."""
 
@@ -2,12 +2,13 @@
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, ecriture
 import sqlite3
 
 class FactureItemModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls,
                facture_id: int,
                description: str,
@@ -40,6 +41,33 @@ class FactureItemModel(BaseModel):
         except sqlite3.Error as e:
             raise Exception(f"Erreur création ligne facture : {e}") from e
 
+    @classmethod
+    @ecriture
+    def create_many(cls, facture_id: int, lignes: List[Dict[str, Any]]):
+        """
+        Ajoute plusieurs lignes à une facture en un seul executemany.
+        Chaque ligne est un dict avec les mêmes clés que les paramètres de create().
+        """
+        query = """
+                INSERT INTO facture_items (
+                    facture_id, description, quantite, prix_unitaire_ht,
+                    montant_ht, montant_tva, montant_ttc,
+                    date_prestation, commande_id, service_demande_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_DATE), ?, ?)
+            """
+        params = [(
+            facture_id, l["description"], l["quantite"], l["prix_unitaire_ht"],
+            l["montant_ht"], l["montant_tva"], l["montant_ttc"],
+            l.get("date_prestation"), l.get("commande_id"), l.get("service_demande_id")
+        ) for l in lignes]
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.executemany(query, params)
+                conn.commit()
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur création lignes facture : {e}") from e
+
     @classmethod
     def get_by_facture(cls, facture_id: int) -> List[Dict[str, Any]]:
         """Récupère toutes les lignes d'une facture."""
@@ -57,6 +85,7 @@ class FactureItemModel(BaseModel):
 
 
     @classmethod
+    @ecriture
     def delete_by_facture(cls, facture_id: int):
         """Supprime TOUS les articles d'une facture donnée pour la nettoyer avant recalcul."""
         query = "UPDATE facture_items SET is_deleted = 1, updated_at = ? WHERE facture_id = ?"
@@ -67,4 +96,43 @@ class FactureItemModel(BaseModel):
                 cur.execute(query, (timestamp_actuel, facture_id,))
                 conn.commit()
         except sqlite3.Error as e:
-            raise Exception(f"Erreur lors du nettoyage de la facture {facture_id} : {e}") from e
\ No newline at end of file
+            raise Exception(f"Erreur lors du nettoyage de la facture {facture_id} : {e}") from e
+
+    @classmethod
+    @ecriture
+    def update_ligne(cls, item_id: int, ligne: Dict[str, Any]) -> bool:
+        """Met à jour la quantité et les montants d'une ligne de facture existante."""
+        query = """
+            UPDATE facture_items
+            SET description = ?, quantite = ?, prix_unitaire_ht = ?,
+                montant_ht = ?, montant_tva = ?, montant_ttc = ?, updated_at = ?
+            WHERE id = ? AND is_deleted = 0
+        """
+        timestamp_actuel = datetime.now(timezone.utc).isoformat()
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (
+                    ligne["description"], ligne["quantite"], ligne["prix_unitaire_ht"],
+                    ligne["montant_ht"], ligne["montant_tva"], ligne["montant_ttc"],
+                    timestamp_actuel, item_id
+                ))
+                conn.commit()
+                return cur.rowcount > 0
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur mise à jour ligne facture {item_id} : {e}") from e
+
+    @classmethod
+    @ecriture
+    def delete(cls, item_id: int) -> bool:
+        """Supprime une ligne de facture."""
+        query = "UPDATE facture_items SET is_deleted = 1, updated_at = ? WHERE id = ?"
+        timestamp_actuel = datetime.now(timezone.utc).isoformat()
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (timestamp_actuel, item_id,))
+                conn.commit()
+                return cur.rowcount > 0
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur suppression ligne facture {item_id} : {e}") from e
@@ -1,12 +1,14 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/facture_model.py
-from datetime import datetime, timezone
+import json
+from datetime import date, datetime, timezone
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, ecriture
 import sqlite3
 
 class FactureModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, reservation_id, statut="Brouillon"):
         query = "INSERT INTO factures (reservation_id, statut) VALUES (?, ?)"
         try:
@@ -33,6 +35,7 @@ class FactureModel(BaseModel):
             raise Exception(f"Erreur récupération facture : {e}") from e
 
     @classmethod
+    @ecriture
     def update_statut(cls, facture_id, nouveau_statut):
         query = "UPDATE factures SET statut = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
         timestamp_actuel = datetime.now(timezone.utc).isoformat()
@@ -46,6 +49,7 @@ class FactureModel(BaseModel):
             raise Exception(f"Erreur mise à jour statut facture : {e}") from e
 
     @classmethod
+    @ecriture
     def update_montants(cls, facture_id, montant_total_ht, montant_total_tva, montant_total_ttc, montant_paye):
         """Met à jour les montants détaillés (HT, TVA, TTC) et le montant payé d'une facture."""
         query = """
@@ -64,6 +68,7 @@ class FactureModel(BaseModel):
             raise Exception(f"Erreur mise à jour montants facture : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, facture_id):
 
         query = "UPDATE factures SET is_deleted = 1, updated_at = ? WHERE id = ?"
@@ -89,3 +94,200 @@ class FactureModel(BaseModel):
                 return dict(row) if row else None
         except sqlite3.Error as e:
             raise Exception(f"Erreur récupération facture par ID : {e}") from e
+
+    @classmethod
+    def get_donnees_facturation(cls, reservation_id):
+        """
+        Récupère en UNE seule requête tout ce qu'il faut pour calculer la facture d'une réservation :
+        la réservation, le prix de la chambre, les taux de l'hôtel, le total des consommations
+        (commandes non annulées) agrégé en SQL, les services demandés et la facture existante.
+        """
+        query = """
+            SELECT
+                r.id AS reservation_id, r.date_arrivee, r.date_depart, r.statut, r.nb_adultes,
+                tc.prix_par_nuit,
+                COALESCE(hi.tva_hebergement, 0.10) AS tva_hebergement,
+                COALESCE(hi.tva_restauration, 0.18) AS tva_restauration,
+                COALESCE(hi.tdt_par_personne, 0) AS tdt_par_personne,
+                (
+                    SELECT COALESCE(SUM(ci.quantite * ci.prix_unitaire_capture), 0)
+                    FROM commandes cmd
+                    JOIN commande_items ci ON ci.commande_id = cmd.id
+                    JOIN produits p ON ci.produit_id = p.id
+                    WHERE cmd.reservation_id = r.id AND cmd.is_deleted = 0
+                      AND cmd.statut != 'Annulé' AND ci.is_deleted = 0
+                ) AS montant_consommation_ht,
+                (
+                    SELECT json_group_array(json_object(
+                        'id', sd.id, 'nom_service', sd.nom_service,
+                        'quantite', sd.quantite, 'prix_capture', sd.prix_capture))
+                    FROM (
+                        SELECT sd.id, s.nom_service, sd.quantite, sd.prix_capture
+                        FROM services_demandes sd
+                        JOIN services_disponibles s ON sd.service_id = s.id
+                        WHERE sd.reservation_id = r.id AND sd.is_deleted = 0
+                        ORDER BY sd.date_demande
+                    ) sd
+                ) AS services_json,
+                f.id AS facture_id,
+                COALESCE(f.montant_paye, 0) AS montant_paye,
+                f.montant_total_ht, f.montant_total_tva, f.montant_total_ttc
+            FROM reservations r
+            LEFT JOIN chambres c ON c.id = r.chambre_id AND c.is_deleted = 0
+            LEFT JOIN types_chambre tc ON tc.id = c.type_id
+            LEFT JOIN hotel_info hi ON hi.id = 1
+            LEFT JOIN factures f ON f.reservation_id = r.id AND f.is_deleted = 0
+            WHERE r.id = ? AND r.is_deleted = 0
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (reservation_id,))
+                row = cur.fetchone()
+                if not row:
+                    return None
+                donnees = dict(row)
+                donnees["services"] = json.loads(donnees.pop("services_json") or "[]")
+                return donnees
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération des données de facturation : {e}") from e
+
+    @classmethod
+    def get_etat(cls, reservation_id):
+        """
+        Récupère l'état de calcul de la facture (drapeau a_recalculer, date et détails du dernier calcul)
+        avec le statut de la réservation. Retourne None si la facture n'a jamais été calculée.
+        """
+        query = """
+            SELECT e.a_recalculer, e.date_calcul, e.details, r.statut
+            FROM factures_etat e
+            JOIN reservations r ON r.id = e.reservation_id
+            JOIN factures f ON f.reservation_id = e.reservation_id AND f.is_deleted = 0
+            WHERE e.reservation_id = ?
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (reservation_id,))
+                row = cur.fetchone()
+                return dict(row) if row else None
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération état facture : {e}") from e
+
+    @classmethod
+    def get_etats(cls, reservation_ids, taille_lot=500):
+        """
+        États de calcul de plusieurs factures (voir get_etat), en une requête par lot de `taille_lot` ids.
+        Retourne {reservation_id: état} ; une facture jamais calculée est absente du résultat.
+        """
+        etats = {}
+        ids = list(dict.fromkeys(reservation_ids))
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                for debut in range(0, len(ids), taille_lot):
+                    lot = ids[debut:debut + taille_lot]
+                    cur.execute(f"""
+                        SELECT e.reservation_id, e.a_recalculer, e.date_calcul, e.details, r.statut
+                        FROM factures_etat e
+                        JOIN reservations r ON r.id = e.reservation_id
+                        JOIN factures f ON f.reservation_id = e.reservation_id AND f.is_deleted = 0
+                        WHERE e.reservation_id IN ({",".join("?" * len(lot))})
+                    """, lot)
+                    etats.update((row["reservation_id"], dict(row)) for row in cur.fetchall())
+            return etats
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération des états des factures : {e}") from e
+
+    @classmethod
+    @ecriture
+    def enregistrer_etat(cls, reservation_id, details):
+        """Marque la facture comme à jour et mémorise les détails du calcul."""
+        query = """
+            INSERT INTO factures_etat (reservation_id, a_recalculer, date_calcul, details)
+            VALUES (?, 0, ?, ?)
+            ON CONFLICT(reservation_id) DO UPDATE SET
+                a_recalculer = 0, date_calcul = excluded.date_calcul, details = excluded.details
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (reservation_id, date.today().isoformat(), json.dumps(details)))
+                conn.commit()
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur enregistrement état facture : {e}") from e
+
+    @classmethod
+    def reservations_facturees(cls, debut, fin):
+        """Ids des réservations facturées dont le départ tombe dans [debut, fin), par date de départ."""
+        query = """
+            SELECT r.id
+            FROM factures f
+            JOIN reservations r ON r.id = f.reservation_id AND r.is_deleted = 0
+            WHERE f.is_deleted = 0 AND r.date_depart >= ? AND r.date_depart < ?
+            ORDER BY r.date_depart, r.id
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (debut, fin))
+                return [row[0] for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération des réservations facturées : {e}") from e
+
+    @classmethod
+    def get_donnees_pdf(cls, reservation_ids, taille_lot=500):
+        """
+        Données des factures PDF de plusieurs réservations, en quelques requêtes par lot de `taille_lot` ids
+        (au lieu de six allers-retours par facture). Retourne {reservation_id: {"reservation", "client",
+        "facture", "items", "paiements"}} ; "client" ou "facture" vaut None s'il est introuvable,
+        une réservation introuvable est absente du résultat.
+        """
+        donnees = {}
+        ids = list(dict.fromkeys(reservation_ids))
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                for debut in range(0, len(ids), taille_lot):
+                    lot = ids[debut:debut + taille_lot]
+                    marqueurs = ",".join("?" * len(lot))
+
+                    cur.execute(f"SELECT * FROM reservations WHERE id IN ({marqueurs}) AND is_deleted = 0", lot)
+                    reservations = [dict(row) for row in cur.fetchall()]
+                    cur.execute(f"""
+                        SELECT * FROM clients
+                        WHERE id IN (SELECT client_id FROM reservations WHERE id IN ({marqueurs})) AND is_deleted = 0
+                    """, lot)
+                    clients = {row["id"]: dict(row) for row in cur.fetchall()}
+                    cur.execute(f"SELECT * FROM factures WHERE reservation_id IN ({marqueurs}) AND is_deleted = 0", lot)
+                    factures = {row["reservation_id"]: dict(row) for row in cur.fetchall()}
+
+                    items, paiements = {}, {}
+                    facture_ids = [facture["id"] for facture in factures.values()]
+                    if facture_ids:
+                        marqueurs_factures = ",".join("?" * len(facture_ids))
+                        cur.execute(f"""
+                            SELECT * FROM facture_items WHERE facture_id IN ({marqueurs_factures}) AND is_deleted = 0
+                            ORDER BY facture_id, id
+                        """, facture_ids)
+                        for row in cur.fetchall():
+                            items.setdefault(row["facture_id"], []).append(dict(row))
+                        cur.execute(f"""
+                            SELECT * FROM paiements WHERE facture_id IN ({marqueurs_factures}) AND is_deleted = 0
+                            ORDER BY facture_id, date_paiement DESC
+                        """, facture_ids)
+                        for row in cur.fetchall():
+                            paiements.setdefault(row["facture_id"], []).append(dict(row))
+
+                    for reservation in reservations:
+                        facture = factures.get(reservation["id"])
+                        donnees[reservation["id"]] = {
+                            "reservation": reservation,
+                            "client": clients.get(reservation["client_id"]),
+                            "facture": facture,
+                            "items": items.get(facture["id"], []) if facture else [],
+                            "paiements": paiements.get(facture["id"], []) if facture else [],
+                        }
+            return donnees
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération des données des factures : {e}") from e
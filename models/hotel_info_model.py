@@ -1,12 +1,14 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/hotel_info_model.py
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from database.cache import cache
+from models.base_model import BaseModel, ecriture, reference
 import sqlite3
 
 class HotelInfoModel(BaseModel):
 
     @classmethod
+    @reference("hotel_info")
     def get_info(cls):
         """Récupère les informations de l'hôtel, y compris TVA et TDT."""
         # --- MODIFICATION : On sélectionne les nouvelles colonnes ---
@@ -21,6 +23,7 @@ class HotelInfoModel(BaseModel):
             raise Exception(f"Erreur récupération info hôtel : {e}") from e
 
     @classmethod
+    @ecriture
     def save_info(cls, nom, adresse, telephone, email, siret, tva_hebergement, tva_restauration, tdt_par_personne):
         """Sauvegarde ou met à jour les informations de l'hôtel, y compris TVA et TDT."""
         try:
@@ -33,6 +36,7 @@ class HotelInfoModel(BaseModel):
                 """
                 timestamp_actuel = datetime.now(timezone.utc).isoformat()
                 cur.execute(query, (nom, adresse, telephone, email, siret, tva_hebergement, tva_restauration, tdt_par_personne, timestamp_actuel))
+                cache.invalider("hotel_info")
                 conn.commit()
         except sqlite3.Error as e:
             raise Exception(f"Erreur sauvegarde info hôtel : {e}") from e
\ No newline at end of file
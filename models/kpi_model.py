@@ -0,0 +1,95 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/models/kpi_model.py
+import sqlite3
+from typing import Dict, Optional
+
+from models.base_model import BaseModel
+
+
+class KpiModel(BaseModel):
+    """
+    Indicateurs du tableau de bord, calculés en SQL (une ligne de résultat par requête).
+    Les périodes sont des intervalles semi-ouverts [debut, fin) sur les colonnes de date elles-mêmes,
+    sans fonction autour de la colonne : chaque requête parcourt l'index de la date sur la seule période,
+    son coût ne grandit donc pas avec l'historique. Les bornes sont des dates "AAAA-MM-JJ" ; une date
+    comme "2025-03-01 10:00:00" (ou "2025-03-01T10:00:00") est bien comprise dans ["2025-03-01", "2025-03-02").
+    """
+
+    @classmethod
+    def _valeur(cls, query, params=()):
+        with cls.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(query, params)
+            return cur.fetchone()[0]
+
+    @classmethod
+    def revenus(cls, debut: Optional[str] = None, fin: Optional[str] = None) -> float:
+        """
+        Somme des paiements reçus sur [debut, fin) (sans borne : depuis l'origine / jusqu'à maintenant),
+        lue dans l'agrégat journalier stats_paiements_jour (migration 012) : une ligne par jour et méthode.
+        """
+        query = "SELECT COALESCE(SUM(montant), 0) FROM stats_paiements_jour WHERE 1 = 1"
+        params = []
+        if debut is not None:
+            query += " AND jour >= ?"
+            params.append(debut)
+        if fin is not None:
+            query += " AND jour < ?"
+            params.append(fin)
+        try:
+            return cls._valeur(query, params)
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de calcul des revenus : {e}") from e
+
+    @classmethod
+    def occupation(cls) -> Dict[str, int]:
+        """Nombre de chambres et nombre de chambres occupées (réservations en check-in)."""
+        try:
+            return {
+                "chambres": cls._valeur("SELECT COUNT(*) FROM chambres WHERE is_deleted = 0"),
+                "occupees": cls._valeur(
+                    "SELECT COUNT(*) FROM reservations WHERE statut = 'check-in' AND is_deleted = 0"),
+            }
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de calcul de l'occupation : {e}") from e
+
+    @classmethod
+    def mouvements(cls, jour: str) -> Dict[str, int]:
+        """Arrivées (réservées) et départs (en check-in) prévus le `jour` donné."""
+        try:
+            return {
+                "arrivees": cls._valeur(
+                    "SELECT COUNT(*) FROM reservations WHERE date_arrivee = ? AND statut = 'réservée' AND is_deleted = 0",
+                    (jour,)),
+                "departs": cls._valeur(
+                    "SELECT COUNT(*) FROM reservations WHERE statut = 'check-in' AND date_depart = ? AND is_deleted = 0",
+                    (jour,)),
+            }
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de calcul des arrivées et départs : {e}") from e
+
+    @classmethod
+    def problemes_en_attente(cls) -> int:
+        """Problèmes ni résolus ni annulés."""
+        try:
+            return cls._valeur(
+                "SELECT COUNT(*) FROM problemes WHERE statut IN ('Nouveau', 'En cours') AND is_deleted = 0")
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de comptage des problèmes : {e}") from e
+
+    @classmethod
+    def ventes(cls, debut: str, fin: str) -> Dict[str, float]:
+        """Montant des articles commandés sur [debut, fin) et nombre de commandes non vides."""
+        query = """
+            SELECT COALESCE(SUM(ci.quantite * ci.prix_unitaire_capture), 0) AS montant,
+                   COUNT(DISTINCT ci.commande_id) AS commandes
+            FROM commandes c
+            JOIN commande_items ci ON ci.commande_id = c.id AND ci.is_deleted = 0
+            WHERE c.is_deleted = 0 AND c.date_commande >= ? AND c.date_commande < ?
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (debut, fin))
+                return dict(cur.fetchone())
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de calcul des ventes : {e}") from e
@@ -1,11 +1,12 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/log_model.py
 import sqlite3
-from models.base_model import BaseModel
+from models.base_model import PAGE_SIZE, BaseModel, ecriture
 
 class LogModel(BaseModel):
     """Modèle pour gérer les logs d'audit dans la base de données."""
 
     @classmethod
+    @ecriture
     def create(cls, user_id, action, details=None):
         """
         Enregistre une nouvelle action dans les logs en utilisant une connexion sécurisée.
@@ -41,4 +42,31 @@ class LogModel(BaseModel):
                 return [dict(row) for row in cur.fetchall()]
         except sqlite3.Error as e:
             print(f"CRITICAL LOGGING ERROR: Could not retrieve logs. Error: {e}")
-            return []  # Retourne une liste vide en cas d'erreur pour ne pas planter l'UI
\ No newline at end of file
+            return []  # Retourne une liste vide en cas d'erreur pour ne pas planter l'UI
+
+    # Clé de pagination de get_page (voir BaseModel.keyset)
+    CLE_PAGE = ("date_heure", "id")
+
+    @classmethod
+    def get_page(cls, after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """Une page de logs triés par (date_heure, id), avec le nom de l'utilisateur. Filtres : user_id, action."""
+        query = """
+            SELECT l.id, u.username, l.action, l.details, l.date_heure
+            FROM logs l
+            LEFT JOIN users u ON l.user_id = u.id
+            WHERE 1 = 1
+        """
+        params = []
+        for colonne in ("user_id", "action"):
+            if filtre and colonne in filtre:
+                query += f" AND l.{colonne} = ?"
+                params.append(filtre[colonne])
+        condition, tri, cle = cls.keyset(("l.date_heure", "l.id"), after, ordre)
+        query += f"{condition} ORDER BY {tri} LIMIT ?"
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, params + cle + [limit])
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération des logs : {e}") from e
@@ -1,11 +1,12 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/paiement_model.py
-from models.base_model import BaseModel
+from models.base_model import PAGE_SIZE, BaseModel, ecriture
 from datetime import datetime, timezone
 import sqlite3
 
 class PaiementModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, facture_id, montant, methode, date_paiement=None):
         """Crée un nouvel enregistrement de paiement."""
         query = "INSERT INTO paiements (facture_id, montant, methode, date_paiement) VALUES (?, ?, ?, ?)"
@@ -36,6 +37,7 @@ class PaiementModel(BaseModel):
             raise Exception(f"Erreur récupération paiements : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, paiement_id):
         """Supprime un paiement."""
 
@@ -60,4 +62,33 @@ class PaiementModel(BaseModel):
                 cur.execute(query)
                 return [dict(row) for row in cur.fetchall()]
         except sqlite3.Error as e:
-            raise Exception(f"Erreur récupération de tous les paiements : {e}") from e
\ No newline at end of file
+            raise Exception(f"Erreur récupération de tous les paiements : {e}") from e
+
+    # Clé de pagination de get_page (voir BaseModel.keyset)
+    CLE_PAGE = ("date_paiement", "id")
+
+    @classmethod
+    def get_page(cls, after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """Une page de paiements triés par (date_paiement, id). Filtres : facture_id, methode, depuis / jusqu_a."""
+        query = "SELECT * FROM paiements WHERE is_deleted = 0"
+        params = []
+        filtre = filtre or {}
+        for colonne in ("facture_id", "methode"):
+            if colonne in filtre:
+                query += f" AND {colonne} = ?"
+                params.append(filtre[colonne])
+        if "depuis" in filtre:
+            query += " AND date_paiement >= ?"
+            params.append(filtre["depuis"])
+        if "jusqu_a" in filtre:
+            query += " AND date_paiement < ?"
+            params.append(filtre["jusqu_a"])
+        condition, tri, cle = cls.keyset(("date_paiement", "id"), after, ordre)
+        query += f"{condition} ORDER BY {tri} LIMIT ?"
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, params + cle + [limit])
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération des paiements : {e}") from e
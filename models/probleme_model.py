@@ -1,5 +1,5 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/probleme_model.py
-from models.base_model import BaseModel
+from models.base_model import PAGE_SIZE, BaseModel, ecriture
 import sqlite3
 from datetime import datetime, timezone
 
@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 class ProblemeModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, chambre_id, description, signale_par_user_id=None, priorite='Moyenne'):
         """Signale un nouveau problème."""
         query = "INSERT INTO problemes (chambre_id, description, signale_par_user_id, priorite) VALUES (?, ?, ?, ?)"
@@ -38,6 +39,35 @@ class ProblemeModel(BaseModel):
         except sqlite3.Error as e:
             raise Exception(f"Erreur récupération problèmes : {e}") from e
 
+
+    # Clé de pagination de get_page (voir BaseModel.keyset)
+    CLE_PAGE = ("date_signalement", "id")
+
+    @classmethod
+    def get_page(cls, after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """Une page de problèmes triés par (date_signalement, id). Filtres : chambre_id, statut, priorite."""
+        query = """
+            SELECT p.*, ch.numero AS numero_chambre, u.nom_complet AS signale_par
+            FROM problemes p
+            JOIN chambres ch ON p.chambre_id = ch.id
+            LEFT JOIN users u ON p.signale_par_user_id = u.id
+            WHERE p.is_deleted = 0
+        """
+        params = []
+        for colonne in ("chambre_id", "statut", "priorite"):
+            if filtre and colonne in filtre:
+                query += f" AND p.{colonne} = ?"
+                params.append(filtre[colonne])
+        condition, tri, cle = cls.keyset(("p.date_signalement", "p.id"), after, ordre)
+        query += f"{condition} ORDER BY {tri} LIMIT ?"
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, params + cle + [limit])
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération problèmes : {e}") from e
+
     @classmethod
     def get_by_id(cls, probleme_id):
         """Récupère un problème par son ID."""
@@ -52,6 +82,7 @@ class ProblemeModel(BaseModel):
             raise Exception(f"Erreur récupération problème : {e}") from e
 
     @classmethod
+    @ecriture
     def update_statut(cls, probleme_id, nouveau_statut):
         """Met à jour le statut d'un problème et la date de résolution si nécessaire."""
         query = "UPDATE problemes SET statut = ?, date_resolution = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -68,6 +99,7 @@ class ProblemeModel(BaseModel):
             raise Exception(f"Erreur mise à jour du problème : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, probleme_id):
         """Supprime un problème."""
 
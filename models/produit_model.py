@@ -1,12 +1,14 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/produit_model.py
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from database.cache import cache
+from models.base_model import BaseModel, ecriture, reference
 import sqlite3
 
 class ProduitModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, nom, description, categorie, prix_unitaire, disponible=True):
         """Crée un nouveau produit."""
         query = "INSERT INTO produits (nom, description, categorie, prix_unitaire, disponible) VALUES (?, ?, ?, ?, ?)"
@@ -14,6 +16,7 @@ class ProduitModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (nom, description, categorie, prix_unitaire, int(disponible)))
+                cache.invalider("produits")
                 conn.commit()
                 return cur.lastrowid
         except sqlite3.IntegrityError as e:
@@ -22,6 +25,7 @@ class ProduitModel(BaseModel):
             raise Exception(f"Erreur lors de la création du produit : {e}") from e
 
     @classmethod
+    @reference("produits")
     def get_all(cls):
         """Récupère tous les produits."""
         query = "SELECT * FROM produits WHERE is_deleted = 0 ORDER BY nom"
@@ -34,6 +38,7 @@ class ProduitModel(BaseModel):
             raise Exception(f"Erreur récupération des produits : {e}") from e
 
     @classmethod
+    @reference("produits")
     def get_by_id(cls, produit_id):
         """Récupère un produit par son ID."""
         query = "SELECT * FROM produits WHERE id = ? AND is_deleted = 0"
@@ -47,6 +52,7 @@ class ProduitModel(BaseModel):
             raise Exception(f"Erreur récupération produit {produit_id} : {e}") from e
 
     @classmethod
+    @ecriture
     def update(cls, produit_id, nom, description, categorie, prix_unitaire, disponible):
         """Met à jour un produit."""
         query = """
@@ -58,12 +64,14 @@ class ProduitModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (nom, description, categorie, prix_unitaire, int(disponible), timestamp_actuel, produit_id))
+                cache.invalider("produits")
                 conn.commit()
                 return cur.rowcount > 0
         except sqlite3.Error as e:
             raise Exception(f"Erreur mise à jour produit : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, produit_id):
         """Supprime un produit."""
 
@@ -73,6 +81,7 @@ class ProduitModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (timestamp_actuel, produit_id,))
+                cache.invalider("produits")
                 conn.commit()
                 return cur.rowcount > 0
         except sqlite3.Error as e:
@@ -0,0 +1,122 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/models/recherche_model.py
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from models.base_model import BaseModel
+
+# Mots de la saisie : suites de lettres/chiffres (la ponctuation sépare, comme le tokenizer unicode61)
+_MOTS = re.compile(r"\w+", re.UNICODE)
+
+
+class RechercheModel(BaseModel):
+    """
+    Recherche plein texte sur les index FTS5 (migration 010) : clients, réservations, problèmes.
+    Chaque mot saisi est cherché comme préfixe, et tous les mots doivent être présents ;
+    les résultats sont classés par pertinence (colonne rank, bm25 pondéré par la migration).
+    Le classement et la limite sont appliqués dans l'index, avant toute jointure.
+    """
+
+    @staticmethod
+    def expression(terme: str) -> Optional[str]:
+        """
+        Traduit la saisie en requête FTS5, None si elle ne contient aucun mot.
+        « RES-12 » ou « 2024-05 » deviennent une phrase dont le dernier mot est un préfixe
+        ("res 12"*), « dupont 690 » deux préfixes ("dupont"* "690"*). Les guillemets et opérateurs
+        saisis sont ignorés : seuls les mots sont repris.
+        """
+        phrases = []
+        for morceau in (terme or "").split():
+            mots = _MOTS.findall(morceau)
+            if mots:
+                phrases.append('"' + " ".join(mots) + '"*')
+        return " ".join(phrases) or None
+
+    @classmethod
+    def clients(cls, terme: str, limit: int = 200) -> List[Dict[str, Any]]:
+        """Clients correspondant à la saisie (nom, prénom, téléphone, email, CNI), avec leur nombre de réservations."""
+        expression = cls.expression(terme)
+        if expression is None:
+            return []
+        query = """
+            SELECT c.*, (SELECT COUNT(*) FROM reservations r
+                         WHERE r.client_id = c.id AND r.is_deleted = 0) AS nb_reservations
+            FROM (SELECT rowid, rank FROM clients_fts WHERE clients_fts MATCH ? ORDER BY rank LIMIT ?) f
+            JOIN clients c ON c.id = f.rowid
+            WHERE c.is_deleted = 0
+            ORDER BY f.rank
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (expression, limit))
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de recherche des clients : {e}") from e
+
+    @classmethod
+    def reservations(cls, terme: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Réservations correspondant à la saisie (référence RES-id, client, chambre, statut, date d'arrivée)."""
+        expression = cls.expression(terme)
+        if expression is None:
+            return []
+        query = """
+            SELECT r.id, c.nom || ' ' || c.prenom AS client, ch.numero AS chambre,
+                   r.date_arrivee, r.date_depart, r.statut, r.client_id, r.chambre_id
+            FROM (SELECT rowid, rank FROM reservations_fts WHERE reservations_fts MATCH ? ORDER BY rank LIMIT ?) f
+            JOIN reservations r ON r.id = f.rowid
+            JOIN clients c ON r.client_id = c.id
+            JOIN chambres ch ON r.chambre_id = ch.id
+            WHERE r.is_deleted = 0
+            ORDER BY f.rank
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (expression, limit))
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de recherche des réservations : {e}") from e
+
+    @classmethod
+    def ids_reservations(cls, terme: str, parmi: Optional[List[int]] = None) -> List[int]:
+        """Ids des réservations correspondant à la saisie (restreints à `parmi` s'il est donné)."""
+        expression = cls.expression(terme)
+        if expression is None:
+            return []
+        query = "SELECT rowid FROM reservations_fts WHERE reservations_fts MATCH ?"
+        params = [expression]
+        if parmi is not None:
+            if not parmi:
+                return []
+            query += f" AND rowid IN ({','.join(['?'] * len(parmi))})"
+            params.extend(parmi)
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, params)
+                return [row[0] for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de recherche des réservations : {e}") from e
+
+    @classmethod
+    def problemes(cls, terme: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Problèmes correspondant à la saisie (description, numéro de chambre)."""
+        expression = cls.expression(terme)
+        if expression is None:
+            return []
+        query = """
+            SELECT p.*, ch.numero AS numero_chambre
+            FROM (SELECT rowid, rank FROM problemes_fts WHERE problemes_fts MATCH ? ORDER BY rank LIMIT ?) f
+            JOIN problemes p ON p.id = f.rowid
+            JOIN chambres ch ON p.chambre_id = ch.id
+            WHERE p.is_deleted = 0
+            ORDER BY f.rank
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (expression, limit))
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de recherche des problèmes : {e}") from e
@@ -1,7 +1,10 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/reservation_model.py
+import sqlite3
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from database.cache import cache
+from models.base_model import PAGE_SIZE, BaseModel, ecriture
+from models.recherche_model import RechercheModel
 
 
 class ReservationModel(BaseModel):
@@ -9,10 +12,12 @@ class ReservationModel(BaseModel):
     # La méthode _ensure_connection n'est plus nécessaire, on la supprime.
 
     @classmethod
+    @ecriture
     def create_full_reservation(cls, client_id, chambre_id, date_arrivee, date_depart,
                                 nb_adultes, nb_enfants, prix_total_nuitee_estime):
         """
-        Crée une réservation et met à jour la chambre dans une transaction unique.
+        Crée une réservation. Le statut de la chambre ne change pas : il reflète son occupation
+        actuelle (check-in / check-out), la disponibilité future se lit dans les réservations.
         """
         # Utilisation du nouveau pattern de connexion
         with cls.connect() as conn:
@@ -22,16 +27,14 @@ class ReservationModel(BaseModel):
                 VALUES (?, ?, ?, ?, ?, ?, ?, 'réservée')
             """, (client_id, chambre_id, date_arrivee, date_depart, nb_adultes, nb_enfants, prix_total_nuitee_estime))
             reservation_id = cur.lastrowid
-
-            timestamp = datetime.now(timezone.utc).isoformat()
-            cur.execute("UPDATE chambres SET statut = 'occupée', updated_at = ? WHERE id = ? AND is_deleted = 0", (timestamp, chambre_id,))
             conn.commit()
             return reservation_id
 
 
     @classmethod
+    @ecriture
     def perform_checkin(cls, reservation_id: int) -> bool:
-        """Passe une réservation en statut 'check-in'."""
+        """Passe une réservation en statut 'check-in' et marque sa chambre occupée."""
         timestamp = datetime.now(timezone.utc).isoformat()
         with cls.connect() as conn:
             cur = conn.cursor()
@@ -39,33 +42,35 @@ class ReservationModel(BaseModel):
                 "UPDATE reservations SET statut = 'check-in', updated_at = ? WHERE id = ? AND is_deleted = 0",
                 (timestamp, reservation_id)
             )
+            if cur.rowcount == 0:
+                return False
+            cur.execute("""
+                UPDATE chambres SET statut = 'occupée', updated_at = ?
+                WHERE id = (SELECT chambre_id FROM reservations WHERE id = ?) AND is_deleted = 0
+            """, (timestamp, reservation_id))
+            cache.invalider("chambres")
             conn.commit()
-            return cur.rowcount > 0
+            return True
 
     @classmethod
+    @ecriture
     def perform_cancel(cls, reservation_id: int) -> bool:
-        """Annule une réservation et libère la chambre."""
+        """
+        Annule une réservation. Seule une réservation non commencée s'annule : la chambre n'est pas
+        touchée, un autre client peut l'occuper en ce moment.
+        """
         timestamp = datetime.now(timezone.utc).isoformat()
         with cls.connect() as conn:
             cur = conn.cursor()
-            cur.execute("SELECT chambre_id FROM reservations WHERE id = ? AND is_deleted = 0", (reservation_id,))
-            resa = cur.fetchone()
-            if not resa:
-                return False
-
-            chambre_id = resa["chambre_id"]
             cur.execute(
                 "UPDATE reservations SET statut = 'annulée', updated_at = ? WHERE id = ? AND is_deleted = 0",
                 (timestamp, reservation_id)
             )
-            cur.execute(
-                "UPDATE chambres SET statut = 'libre', updated_at = ? WHERE id = ? AND is_deleted = 0",
-                (timestamp, chambre_id)
-            )
             conn.commit()
-            return True
+            return cur.rowcount > 0
 
     @classmethod
+    @ecriture
     def perform_checkout(cls, reservation_id: int, chambre_id: int, date_depart_reelle: str) -> bool:
         """
         Effectue le check-out :
@@ -86,6 +91,7 @@ class ReservationModel(BaseModel):
                 "UPDATE chambres SET statut = 'libre', updated_at = ? WHERE id = ? AND is_deleted = 0",
                 (timestamp, chambre_id)
             )
+            cache.invalider("chambres")
 
             conn.commit()
             return cur.rowcount > 0
@@ -117,6 +123,7 @@ class ReservationModel(BaseModel):
 
 
     @classmethod
+    @ecriture
     def update(cls, reservation_id, **kwargs):
         if not kwargs:
             return False
@@ -127,18 +134,21 @@ class ReservationModel(BaseModel):
             cur = conn.cursor()
 
             if "chambre_id" in kwargs:
-                cur.execute("SELECT chambre_id FROM reservations WHERE id = ? AND is_deleted = 0", (reservation_id,))
+                cur.execute("SELECT chambre_id, statut FROM reservations WHERE id = ? AND is_deleted = 0",
+                            (reservation_id,))
                 row = cur.fetchone()
                 if not row:
                     return False
                 ancienne_chambre_id = row["chambre_id"]
                 nouvelle_chambre_id = kwargs["chambre_id"]
 
-                if ancienne_chambre_id != nouvelle_chambre_id:
+                # Seul un client présent (check-in) occupe une chambre : il change alors de chambre.
+                if row["statut"] == 'check-in' and ancienne_chambre_id != nouvelle_chambre_id:
                     cur.execute("UPDATE chambres SET statut = 'libre', updated_at = ? WHERE id = ? AND is_deleted = 0",
                                 (timestamp, ancienne_chambre_id))
                     cur.execute("UPDATE chambres SET statut = 'occupée', updated_at = ? WHERE id = ? AND is_deleted = 0",
                                 (timestamp, nouvelle_chambre_id))
+                    cache.invalider("chambres")
 
             # Construction de la requête dynamique
             fields = ", ".join([f"{key} = ?" for key in kwargs])
@@ -176,4 +186,78 @@ class ReservationModel(BaseModel):
             query += " ORDER BY r.date_arrivee DESC"
             cur = conn.cursor()
             cur.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
\ No newline at end of file
+            return [dict(row) for row in cur.fetchall()]
+
+
+    # Clé de pagination de get_page (voir BaseModel.keyset)
+    CLE_PAGE = ("date_arrivee", "id")
+
+    @classmethod
+    def get_page(cls, after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """
+        Une page de réservations triées par (date_arrivee, id), à partir de la clé `after`
+        (voir BaseModel.keyset). Filtres : chambre_id, client_id, statuts, date_depart,
+        depuis / jusqu_a (bornes de date_arrivee) et recherche (client, chambre, statut, date ou « RES-id »).
+        """
+        query = """
+            SELECT r.id, c.nom || ' ' || c.prenom AS client, ch.numero AS chambre,
+                   r.date_arrivee, r.date_depart, r.statut, r.client_id, r.chambre_id,
+                   r.nb_adultes, r.nb_enfants, r.prix_total_nuitee_estime
+            FROM reservations r
+            JOIN clients c ON r.client_id = c.id
+            JOIN chambres ch ON r.chambre_id = ch.id
+            WHERE r.is_deleted = 0
+        """
+        params = []
+        filtre = filtre or {}
+        if "chambre_id" in filtre:
+            query += " AND r.chambre_id = ?"
+            params.append(filtre["chambre_id"])
+        if "client_id" in filtre:
+            query += " AND r.client_id = ?"
+            params.append(filtre["client_id"])
+        if filtre.get("statuts"):
+            query += f" AND r.statut IN ({','.join(['?'] * len(filtre['statuts']))})"
+            params.extend(filtre["statuts"])
+        if "date_depart" in filtre:
+            query += " AND r.date_depart = ?"
+            params.append(filtre["date_depart"])
+        if "depuis" in filtre:
+            query += " AND r.date_arrivee >= ?"
+            params.append(filtre["depuis"])
+        if "jusqu_a" in filtre:
+            query += " AND r.date_arrivee < ?"
+            params.append(filtre["jusqu_a"])
+        expression = RechercheModel.expression(filtre.get("recherche"))
+        if expression is not None:
+            # Index plein texte (voir RechercheModel) : préfixes, sans accents, sans parcourir la table
+            query += " AND r.id IN (SELECT rowid FROM reservations_fts WHERE reservations_fts MATCH ?)"
+            params.append(expression)
+
+        condition, tri, cle = cls.keyset(("r.date_arrivee", "r.id"), after, ordre)
+        query += f"{condition} ORDER BY {tri} LIMIT ?"
+        with cls.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(query, params + cle + [limit])
+            return [dict(row) for row in cur.fetchall()]
+
+    @classmethod
+    def has_conflit(cls, chambre_id, date_arrivee, date_depart, exclude_id=None):
+        """
+        Indique si une réservation active (réservée ou check-in) occupe la chambre sur [date_arrivee, date_depart).
+        Une seule requête servie par l'index idx_reservations_disponibilite.
+        """
+        query = """
+            SELECT 1 FROM reservations
+            WHERE chambre_id = ? AND statut IN ('réservée', 'check-in') AND is_deleted = 0
+              AND date_arrivee < ? AND date_depart > ?
+              AND id != ?
+            LIMIT 1
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (chambre_id, date_depart, date_arrivee, exclude_id or -1))
+                return cur.fetchone() is not None
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de vérification de disponibilité : {e}") from e
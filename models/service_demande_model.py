@@ -1,12 +1,13 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/service_demande_model.py
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from models.base_model import PAGE_SIZE, BaseModel, ecriture
 import sqlite3
 
 class ServiceDemandeModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, reservation_id, service_id, quantite, prix_capture, statut="Demandé"):
         """Crée une nouvelle demande de service."""
         query = "INSERT INTO services_demandes (reservation_id, service_id, quantite, prix_capture, statut) VALUES (?, ?, ?, ?, ?)"
@@ -39,6 +40,36 @@ class ServiceDemandeModel(BaseModel):
         except sqlite3.Error as e:
             raise Exception(f"Erreur récupération services demandés : {e}") from e
 
+
+    # Clé de pagination de get_page (voir BaseModel.keyset)
+    CLE_PAGE = ("date_demande", "id")
+
+    @classmethod
+    def get_page(cls, after=None, limit=PAGE_SIZE, filtre=None, ordre="desc"):
+        """Une page de demandes de service triées par (date_demande, id). Filtres : reservation_id, statut."""
+        query = """
+            SELECT sd.*, s.nom_service, r.chambre_id, c.nom || ' ' || c.prenom as client_nom
+            FROM services_demandes sd
+            JOIN services_disponibles s ON sd.service_id = s.id
+            JOIN reservations r ON sd.reservation_id = r.id
+            JOIN clients c ON r.client_id = c.id
+            WHERE sd.is_deleted = 0
+        """
+        params = []
+        for colonne in ("reservation_id", "statut"):
+            if filtre and colonne in filtre:
+                query += f" AND sd.{colonne} = ?"
+                params.append(filtre[colonne])
+        condition, tri, cle = cls.keyset(("sd.date_demande", "sd.id"), after, ordre)
+        query += f"{condition} ORDER BY {tri} LIMIT ?"
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, params + cle + [limit])
+                return [dict(row) for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur récupération services demandés : {e}") from e
+
     @classmethod
     def get_by_reservation(cls, reservation_id):
         """Récupère les demandes de service pour une réservation."""
@@ -58,6 +89,7 @@ class ServiceDemandeModel(BaseModel):
             raise Exception(f"Erreur récupération des services de la réservation : {e}") from e
 
     @classmethod
+    @ecriture
     def update_statut(cls, demande_id, nouveau_statut):
         """Met à jour le statut d'une demande de service."""
         query = "UPDATE services_demandes SET statut = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -72,6 +104,7 @@ class ServiceDemandeModel(BaseModel):
             raise Exception(f"Erreur mise à jour statut service demandé : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, demande_id):
         """Supprime une demande de service."""
 
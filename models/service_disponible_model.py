@@ -1,12 +1,14 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/service_disponible_model.py
 from datetime import datetime, timezone
 
-from models.base_model import BaseModel
+from database.cache import cache
+from models.base_model import BaseModel, ecriture, reference
 import sqlite3
 
 class ServiceDisponibleModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, nom_service, description=None, prix=0.0):
         """Crée un nouveau service disponible."""
         query = "INSERT INTO services_disponibles (nom_service, description, prix) VALUES (?, ?, ?)"
@@ -14,6 +16,7 @@ class ServiceDisponibleModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (nom_service, description, prix))
+                cache.invalider("services_disponibles")
                 conn.commit()
                 return cur.lastrowid
         except sqlite3.IntegrityError as e:
@@ -22,6 +25,7 @@ class ServiceDisponibleModel(BaseModel):
             raise Exception(f"Erreur création service disponible : {e}") from e
 
     @classmethod
+    @reference("services_disponibles")
     def get_all(cls):
         """Récupère tous les services disponibles."""
         query = "SELECT * FROM services_disponibles WHERE is_deleted = 0 ORDER BY nom_service"
@@ -34,6 +38,7 @@ class ServiceDisponibleModel(BaseModel):
             raise Exception(f"Erreur récupération services : {e}") from e
 
     @classmethod
+    @reference("services_disponibles")
     def get_by_id(cls, service_id):
         """Récupère un service par son ID."""
         query = "SELECT * FROM services_disponibles WHERE id = ? AND is_deleted = 0"
@@ -47,6 +52,7 @@ class ServiceDisponibleModel(BaseModel):
             raise Exception(f"Erreur récupération service : {e}") from e
 
     @classmethod
+    @ecriture
     def update(cls, service_id, **kwargs):
         """Met à jour un service (version simplifiée et robuste)."""
         allowed_fields = {"nom_service", "description", "prix"}
@@ -67,6 +73,7 @@ class ServiceDisponibleModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, tuple(params))
+                cache.invalider("services_disponibles")
                 conn.commit()
                 return cur.rowcount > 0
         except sqlite3.Error as e:
@@ -74,6 +81,7 @@ class ServiceDisponibleModel(BaseModel):
 
 
     @classmethod
+    @ecriture
     def delete(cls, service_id):
         """Supprime un service."""
 
@@ -83,6 +91,7 @@ class ServiceDisponibleModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (timestamp_actuel, service_id,))
+                cache.invalider("services_disponibles")
                 conn.commit()
                 return cur.rowcount > 0
         except sqlite3.Error as e:
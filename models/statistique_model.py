@@ -0,0 +1,114 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/models/statistique_model.py
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from models.base_model import BaseModel
+
+# Mesure -> (agrégat journalier de la migration 012, expression sommée)
+MESURES = {
+    "reservations": ("stats_reservations_jour", "SUM(nb_reservations)"),
+    "nuitees": ("stats_reservations_jour", "SUM(nuitees)"),
+    "revenus": ("stats_paiements_jour", "SUM(montant)"),
+    "paiements": ("stats_paiements_jour", "SUM(nb_paiements)"),
+    "commandes": ("stats_commandes_jour", "SUM(nb_commandes)"),
+    "ventes": ("stats_commandes_jour", "SUM(montant)"),
+    "facturation": ("stats_facturation_jour", "SUM(montant_ttc)"),
+}
+
+# Granularité -> premier jour de la période contenant `jour` (la semaine commence le lundi)
+GRANULARITES = {
+    "jour": "jour",
+    "semaine": "date(jour, '-6 days', 'weekday 1')",
+    "mois": "substr(jour, 1, 7) || '-01'",
+    "annee": "substr(jour, 1, 4) || '-01-01'",
+}
+
+
+class StatistiqueModel(BaseModel):
+    """
+    Séries statistiques par jour, semaine, mois ou année, lues dans les agrégats journaliers.
+    Une période est un intervalle semi-ouvert [debut, fin) de dates "AAAA-MM-JJ" (ou `date`),
+    appliqué tel quel à la colonne jour, clé primaire de l'agrégat : la requête ne lit que les
+    lignes de la période. La granularité ne sert qu'au regroupement, jamais au filtre.
+    """
+
+    @staticmethod
+    def debut_periode(jour: date, granularite: str) -> date:
+        """Premier jour de la période (jour, semaine, mois ou année) contenant `jour`."""
+        if granularite == "jour":
+            return jour
+        if granularite == "semaine":
+            return jour - timedelta(days=jour.weekday())
+        if granularite == "mois":
+            return jour.replace(day=1)
+        if granularite == "annee":
+            return jour.replace(month=1, day=1)
+        raise ValueError(f"Granularité inconnue : {granularite}")
+
+    @staticmethod
+    def periode_suivante(jour: date, granularite: str) -> date:
+        """Premier jour de la période qui suit celle commençant le `jour`."""
+        if granularite == "jour":
+            return jour + timedelta(days=1)
+        if granularite == "semaine":
+            return jour + timedelta(days=7)
+        if granularite == "mois":
+            return date(jour.year + jour.month // 12, jour.month % 12 + 1, 1)
+        if granularite == "annee":
+            return date(jour.year + 1, 1, 1)
+        raise ValueError(f"Granularité inconnue : {granularite}")
+
+    @classmethod
+    def periodes(cls, debut: date, fin: date, granularite: str) -> List[date]:
+        """Débuts des périodes qui recoupent [debut, fin), dans l'ordre."""
+        periodes = []
+        jour = cls.debut_periode(debut, granularite)
+        while jour < fin:
+            periodes.append(jour)
+            jour = cls.periode_suivante(jour, granularite)
+        return periodes
+
+    @staticmethod
+    def _requete(mesure: str) -> Tuple[str, str]:
+        if mesure not in MESURES:
+            raise ValueError(f"Mesure inconnue : {mesure}")
+        return MESURES[mesure]
+
+    @classmethod
+    def serie(cls, mesure: str, debut: date, fin: date, granularite: str = "mois") -> List[Dict]:
+        """
+        Valeur de la mesure pour chaque période de [debut, fin) : [{"periode": "AAAA-MM-JJ", "valeur": ...}].
+        Les périodes sans données valent 0. Les périodes aux bords ne comptent que les jours de [debut, fin).
+        """
+        table, somme = cls._requete(mesure)
+        if granularite not in GRANULARITES:
+            raise ValueError(f"Granularité inconnue : {granularite}")
+        query = f"""
+            SELECT {GRANULARITES[granularite]} AS periode, {somme} AS valeur
+            FROM {table}
+            WHERE jour >= ? AND jour < ?
+            GROUP BY periode
+        """
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(query, (debut.isoformat(), fin.isoformat()))
+                valeurs = {row["periode"]: row["valeur"] for row in cur.fetchall()}
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de calcul de la série {mesure} : {e}") from e
+        return [{"periode": p.isoformat(), "valeur": valeurs.get(p.isoformat()) or 0}
+                for p in cls.periodes(debut, fin, granularite)]
+
+    @classmethod
+    def total(cls, mesure: str, debut: date, fin: date) -> float:
+        """Valeur de la mesure sur toute la période [debut, fin)."""
+        table, somme = cls._requete(mesure)
+        try:
+            with cls.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(f"SELECT COALESCE({somme}, 0) FROM {table} WHERE jour >= ? AND jour < ?",
+                            (debut.isoformat(), fin.isoformat()))
+                return cur.fetchone()[0]
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur de calcul du total {mesure} : {e}") from e
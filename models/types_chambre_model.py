@@ -1,12 +1,14 @@
 # /home/soutonnoma/PycharmProjects/HotelManager/models/types_chambre_model.py
 from datetime import timezone, datetime
 
-from models.base_model import BaseModel
+from database.cache import cache
+from models.base_model import BaseModel, ecriture, reference
 import sqlite3
 
 class TypesChambreModel(BaseModel):
 
     @classmethod
+    @ecriture
     def create(cls, nom, description, prix_par_nuit):
         """Crée un nouveau type de chambre."""
         query = "INSERT INTO types_chambre (nom, description, prix_par_nuit) VALUES (?, ?, ?)"
@@ -14,6 +16,7 @@ class TypesChambreModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (nom, description, prix_par_nuit))
+                cache.invalider("types_chambre")
                 conn.commit()
                 return cur.lastrowid
         except sqlite3.IntegrityError as e:
@@ -22,6 +25,7 @@ class TypesChambreModel(BaseModel):
             raise Exception(f"Erreur création type chambre : {e}") from e
 
     @classmethod
+    @reference("types_chambre")
     def get_all(cls):
         """Récupère tous les types de chambre."""
         query = "SELECT * FROM types_chambre WHERE is_deleted = 0 ORDER BY nom ASC"
@@ -34,6 +38,7 @@ class TypesChambreModel(BaseModel):
             raise Exception(f"Erreur récupération types de chambre : {e}") from e
 
     @classmethod
+    @reference("types_chambre")
     def get_by_id(cls, type_id):
         """Récupère un type de chambre par son ID."""
         query = "SELECT * FROM types_chambre WHERE id = ? AND is_deleted = 0"
@@ -47,6 +52,7 @@ class TypesChambreModel(BaseModel):
             raise Exception(f"Erreur récupération type chambre : {e}") from e
 
     @classmethod
+    @ecriture
     def update(cls, type_id, nom, description, prix_par_nuit):
         """Met à jour un type de chambre."""
         query = "UPDATE types_chambre SET nom = ?, description = ?, prix_par_nuit = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -55,12 +61,14 @@ class TypesChambreModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (nom, description, prix_par_nuit, timestamp_actuel, type_id))
+                cache.invalider("types_chambre")
                 conn.commit()
                 return cur.rowcount > 0
         except sqlite3.Error as e:
             raise Exception(f"Erreur mise à jour type chambre : {e}") from e
 
     @classmethod
+    @ecriture
     def delete(cls, type_id):
         """Supprime un type de chambre."""
 
@@ -70,6 +78,7 @@ class TypesChambreModel(BaseModel):
             with cls.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(query, (timestamp_actuel, type_id,))
+                cache.invalider("types_chambre")
                 conn.commit()
                 return cur.rowcount > 0
         except sqlite3.Error as e:
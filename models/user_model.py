@@ -4,7 +4,7 @@ from typing import List, Dict, Any, Optional
 
 from werkzeug.security import generate_password_hash, check_password_hash
 
-from models.base_model import BaseModel
+from models.base_model import BaseModel, ecriture
 
 
 class UserModel(BaseModel):
@@ -40,6 +40,7 @@ class UserModel(BaseModel):
             raise Exception(f"Erreur de récupération de tous les utilisateurs : {e}") from e
 
     @classmethod
+    @ecriture
     def create(cls, username: str, password: str, role: str, nom_complet: Optional[str] = None, actif: bool = True) -> int:
         """
         Crée un nouvel utilisateur avec un mot de passe hashé par Werkzeug.
@@ -63,6 +64,7 @@ class UserModel(BaseModel):
             raise Exception(f"Erreur base de données lors de la création de l'utilisateur : {e}") from e
 
     @classmethod
+    @ecriture
     def update_password(cls, user_id: int, new_password: str) -> bool:
         """Met à jour le mot de passe d'un utilisateur."""
         password_hash = generate_password_hash(new_password)
@@ -89,6 +91,7 @@ class UserModel(BaseModel):
         return False
 
     @classmethod
+    @ecriture
     def set_active_status(cls, user_id: int, actif: bool) -> bool:
         """Active ou désactive un utilisateur."""
         query = "UPDATE users SET actif = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -103,6 +106,7 @@ class UserModel(BaseModel):
             raise Exception(f"Erreur de changement de statut pour l'utilisateur {user_id}: {e}") from e
 
     @classmethod
+    @ecriture
     def update_user(cls, user_id: int, nom_complet: str, role: str, actif: bool) -> bool:
         """Met à jour les informations d'un utilisateur (sans le mot de passe)."""
         query = "UPDATE users SET nom_complet = ?, role = ?, actif = ?, updated_at = ? WHERE id = ? AND is_deleted = 0"
@@ -117,6 +121,7 @@ class UserModel(BaseModel):
             raise Exception(f"Erreur de mise à jour de l'utilisateur {user_id}: {e}") from e
 
     @classmethod
+    @ecriture
     def delete_user(cls, user_id: int) -> bool:
 
         """
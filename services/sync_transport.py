@@ -0,0 +1,224 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/services/sync_transport.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+
+def range_digests(rows, bucket_size: int) -> list:
+    """
+    Empreintes par plage d'ids : `rows` est une suite de (id, updated_at) triée par id.
+    Chaque plage [bucket, bucket + bucket_size) donne {"bucket", "count", "digest"}, où digest est
+    le md5 de "id:updated_at" joints par des virgules. La fonction sync_digests côté serveur
+    (database/supabase/sync_digests.sql) calcule exactement la même chose.
+    """
+    digests = []
+    current, parts = None, []
+    for row_id, updated_at in rows:
+        bucket = (row_id // bucket_size) * bucket_size
+        if bucket != current:
+            if parts:
+                digests.append(_digest(current, parts))
+            current, parts = bucket, []
+        parts.append(f"{row_id}:{updated_at if updated_at is not None else ''}")
+    if parts:
+        digests.append(_digest(current, parts))
+    return digests
+
+
+def _digest(bucket, parts):
+    return {"bucket": bucket, "count": len(parts), "digest": hashlib.md5(",".join(parts).encode("utf-8")).hexdigest()}
+
+
+class SyncTransport(ABC):
+    """
+    Interface du serveur distant utilisée par SyncService.
+    Les lignes échangées sont des dictionnaires {colonne: valeur} identifiés par leur 'id'.
+    Un transport qui n'implémente pas toutes les méthodes ne peut pas être instancié.
+    """
+
+    @abstractmethod
+    def upsert(self, table: str, rows: list) -> list:
+        """Insère ou met à jour les lignes ; retourne les lignes telles qu'enregistrées par le serveur."""
+
+    @abstractmethod
+    def delete(self, table: str, ids: list):
+        """Supprime les lignes dont l'id est dans `ids`."""
+
+    @abstractmethod
+    def fetch_changes(self, table: str, since: str) -> list:
+        """Retourne les lignes dont updated_at est postérieur à `since`."""
+
+    @abstractmethod
+    def fetch_digests(self, table: str, bucket_size: int, id_min=None, id_max=None) -> list:
+        """Empreintes (voir range_digests) des lignes dont l'id est dans [id_min, id_max)."""
+
+    @abstractmethod
+    def fetch_range(self, table: str, id_min: int, id_max: int) -> list:
+        """Retourne les lignes complètes dont l'id est dans [id_min, id_max)."""
+
+    @abstractmethod
+    def download_snapshot(self):
+        """Retourne le dernier instantané publié (octets compressés), ou None s'il n'y en a pas."""
+
+    @abstractmethod
+    def upload_snapshot(self, data: bytes):
+        """Publie un instantané (octets compressés), en remplaçant le précédent."""
+
+
+class SupabaseTransport(SyncTransport):
+    """Transport de production : l'API REST Supabase, et son stockage de fichiers pour les instantanés."""
+
+    SNAPSHOT_BUCKET = "sync-snapshots"
+    SNAPSHOT_PATH = "hotel.db.gz"
+
+    def __init__(self, url: str, key: str):
+        # Import local : le paquet supabase n'est nécessaire que pour la synchro réelle.
+        from supabase import create_client
+        self.client = create_client(url, key)
+
+    def upsert(self, table, rows):
+        return self.client.table(table).upsert(rows).execute().data or []
+
+    def delete(self, table, ids):
+        self.client.table(table).delete().in_("id", ids).execute()
+
+    def fetch_changes(self, table, since):
+        return self.client.table(table).select("*").gt("updated_at", since).execute().data or []
+
+    def fetch_digests(self, table, bucket_size, id_min=None, id_max=None):
+        # Calculées par le serveur (fonction sync_digests) : seules les empreintes transitent.
+        return self.client.rpc("sync_digests", {
+            "p_table": table, "p_bucket_size": bucket_size, "p_id_min": id_min, "p_id_max": id_max,
+        }).execute().data or []
+
+    def fetch_range(self, table, id_min, id_max):
+        return self.client.table(table).select("*").gte("id", id_min).lt("id", id_max).execute().data or []
+
+    def download_snapshot(self):
+        try:
+            return self.client.storage.from_(self.SNAPSHOT_BUCKET).download(self.SNAPSHOT_PATH)
+        except Exception as e:
+            print(f"    - Aucun instantané disponible ({e})")
+            return None
+
+    def upload_snapshot(self, data):
+        self.client.storage.from_(self.SNAPSHOT_BUCKET).upload(
+            self.SNAPSHOT_PATH, data, {"content-type": "application/gzip", "upsert": "true"})
+
+
+class SQLiteTransport(SyncTransport):
+    """
+    Serveur de substitution dans un second fichier SQLite, pour tester et mesurer la synchro
+    sans Supabase. Les tables sont créées (et complétées) à la volée d'après les colonnes reçues.
+    Chaque thread a sa propre connexion, comme pour les requêtes HTTP parallèles de sync_down.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._connections = []
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL;")
+            conn.execute("PRAGMA synchronous = NORMAL;")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._schema_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _columns(self, conn, table):
+        return [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+
+    def _ensure_table(self, conn, table, columns):
+        with self._schema_lock:
+            existing = self._columns(conn, table)
+            if not existing:
+                others = [col for col in columns if col != 'id']
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY{''.join(', ' + c for c in others)})")
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_updated_at ON {table} (updated_at)")
+            else:
+                for col in columns:
+                    if col not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {col}")
+            conn.commit()
+
+    def upsert(self, table, rows):
+        if not rows:
+            return []
+        conn = self._connection()
+        columns = list(dict.fromkeys(col for row in rows for col in row))
+        if 'updated_at' not in columns:
+            columns.append('updated_at')
+        self._ensure_table(conn, table, columns)
+
+        updates = ', '.join(f"{col} = excluded.{col}" for col in columns if col != 'id')
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+            f" ON CONFLICT(id) DO UPDATE SET {updates}",
+            [tuple(row.get(col) for col in columns) for row in rows])
+        conn.commit()
+        return rows
+
+    def delete(self, table, ids):
+        conn = self._connection()
+        if not self._columns(conn, table):
+            return
+        conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for row_id in ids])
+        conn.commit()
+
+    def fetch_changes(self, table, since):
+        conn = self._connection()
+        if not self._columns(conn, table):
+            return []
+        return [dict(row) for row in conn.execute(f"SELECT * FROM {table} WHERE updated_at > ?", (since,))]
+
+    def fetch_digests(self, table, bucket_size, id_min=None, id_max=None):
+        conn = self._connection()
+        if not self._columns(conn, table):
+            return []
+        rows = conn.execute(f"""
+            SELECT id, updated_at FROM {table}
+            WHERE (? IS NULL OR id >= ?) AND (? IS NULL OR id < ?)
+            ORDER BY id
+        """, (id_min, id_min, id_max, id_max))
+        return range_digests(((row[0], row[1]) for row in rows), bucket_size)
+
+    def fetch_range(self, table, id_min, id_max):
+        conn = self._connection()
+        if not self._columns(conn, table):
+            return []
+        return [dict(row) for row in conn.execute(
+            f"SELECT * FROM {table} WHERE id >= ? AND id < ?", (id_min, id_max))]
+
+    def _snapshot_path(self):
+        return self.db_path + ".snapshot.gz"
+
+    def download_snapshot(self):
+        try:
+            with open(self._snapshot_path(), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def upload_snapshot(self, data):
+        # Écriture dans un fichier temporaire puis renommage : un lecteur ne voit jamais un fichier partiel.
+        tmp_path = self._snapshot_path() + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._snapshot_path())
+
+    def close(self):
+        """Ferme les connexions ouvertes par tous les threads."""
+        with self._schema_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,237 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/tests/test_agregats_journaliers.py
+"""
+Agrégats journaliers (migration 012) : après une suite aléatoire d'écritures, chaque table stats_*
+tenue par les triggers doit être égale au recalcul complet par les requêtes du calcul initial de la migration.
+"""
+import os
+import random
+import re
+
+import pytest
+
+from benchmarks.sync_benchmark import PROJECT_ROOT, creer_base_locale
+
+MIGRATION = os.path.join(PROJECT_ROOT, "database", "migrations", "012_agregats_journaliers.sql")
+
+STATUTS = ['réservée', 'check-in', 'check-out', 'annulée']
+METHODES = ['Carte de crédit', 'Espèces', 'Virement', 'Mobile Money', 'Autre', None]
+LIEUX = ['Room Service', 'Bar', 'Restaurant']
+
+
+def calculs_initiaux():
+    """{table stats_* : (colonnes, requête SELECT)} lus dans la section « Calcul initial » de la migration."""
+    with open(MIGRATION, "r", encoding="utf-8") as f:
+        section = f.read().split("Calcul initial", 1)[1]
+    return {
+        table: ([c.strip() for c in colonnes.split(",")], select)
+        for table, colonnes, select in re.findall(r"INSERT INTO (stats_\w+) \(([^)]*)\)\s*(SELECT .*?);",
+                                                  section, re.S)
+    }
+
+
+def normaliser(lignes, nb_cles):
+    """Lignes indexées par leur clé ; les mesures sont arrondies et les lignes retombées à zéro ignorées."""
+    resultat = {}
+    for ligne in lignes:
+        mesures = tuple(round(v or 0, 6) for v in ligne[nb_cles:])
+        if any(mesures):
+            resultat[tuple(ligne[:nb_cles])] = mesures
+    return resultat
+
+
+class Ecritures:
+    """Écritures aléatoires sur les tables suivies par les agrégats (insertions, modifications, suppressions)."""
+
+    # (écriture, poids) : les insertions dominent pour que les tables se remplissent malgré les suppressions
+    ECRITURES = {
+        "reservation": 4, "modifier_reservation": 2, "supprimer_reservation": 1, "changer_type_chambre": 1,
+        "facture": 4, "annuler_facture": 1, "supprimer_facture": 1,
+        "paiement": 4, "modifier_paiement": 2, "supprimer_paiement": 1,
+        "commande": 4, "modifier_commande": 2, "supprimer_commande": 1,
+        "article": 4, "modifier_article": 2, "supprimer_article": 1,
+        "ligne_facture": 6, "modifier_ligne_facture": 2, "supprimer_ligne_facture": 1,
+    }
+
+    def __init__(self, conn, rng):
+        self.conn, self.rng = conn, rng
+
+    def ids(self, table):
+        return [row[0] for row in self.conn.execute(f"SELECT id FROM {table}")]
+
+    def jour(self):
+        return f"2025-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}"
+
+    def horodatage(self):
+        return f"{self.jour()} {self.rng.randint(0, 23):02d}:{self.rng.randint(0, 59):02d}:00"
+
+    def supprime(self):
+        return 1 if self.rng.random() < 0.1 else 0
+
+    def initialiser(self):
+        x = self.conn.execute
+        x("INSERT INTO types_chambre (nom, prix_par_nuit) VALUES ('Simple', 10), ('Double', 20), ('Suite', 30)")
+        for i in range(8):
+            x("INSERT INTO chambres (numero, type_id) VALUES (?, ?)", (str(100 + i), self.rng.randint(1, 3)))
+        for i in range(12):
+            x("INSERT INTO clients (nom) VALUES (?)", (f"Client {i}",))
+        x("INSERT INTO produits (nom, categorie, prix_unitaire) VALUES ('Jus', 'Boisson fraîche', 5)")
+        x("INSERT INTO services_disponibles (nom_service, prix) VALUES ('Blanchisserie', 3)")
+
+    def une_ecriture(self):
+        ecriture, = self.rng.choices(list(self.ECRITURES), weights=list(self.ECRITURES.values()))
+        getattr(self, ecriture)(self.rng, self.conn.execute)
+
+    def reservation(self, rng, x):
+        arrivee = self.jour()
+        x("INSERT INTO reservations (client_id, chambre_id, date_arrivee, date_depart, statut, is_deleted)"
+          " VALUES (?, ?, ?, date(?, ?), ?, ?)",
+          (rng.randint(1, 12), rng.randint(1, 8), arrivee, arrivee, f"+{rng.randint(0, 5)} days",
+           rng.choice(STATUTS), self.supprime()))
+
+    def modifier_reservation(self, rng, x):
+        if self.ids("reservations"):
+            colonne, valeur = rng.choice([("statut", rng.choice(STATUTS)), ("chambre_id", rng.randint(1, 8)),
+                                          ("client_id", rng.randint(1, 12)), ("date_arrivee", self.jour()),
+                                          ("date_depart", self.jour()), ("is_deleted", rng.randint(0, 1))])
+            x(f"UPDATE reservations SET {colonne} = ? WHERE id = ?", (valeur, rng.choice(self.ids("reservations"))))
+
+    def supprimer_reservation(self, rng, x):
+        # Suppression définitive : la facture et ses lignes partent en cascade
+        libres = [row[0] for row in x("SELECT id FROM reservations r WHERE NOT EXISTS"
+                                      " (SELECT 1 FROM commandes WHERE reservation_id = r.id) AND NOT EXISTS"
+                                      " (SELECT 1 FROM services_demandes WHERE reservation_id = r.id) AND NOT EXISTS"
+                                      " (SELECT 1 FROM paiements p JOIN factures f ON f.id = p.facture_id"
+                                      "  WHERE f.reservation_id = r.id)")]
+        if libres:
+            x("DELETE FROM reservations WHERE id = ?", (rng.choice(libres),))
+
+    def changer_type_chambre(self, rng, x):
+        x("UPDATE chambres SET type_id = ? WHERE id = ?", (rng.randint(1, 3), rng.randint(1, 8)))
+
+    def facture(self, rng, x):
+        sans_facture = [row[0] for row in x("SELECT id FROM reservations WHERE id NOT IN"
+                                            " (SELECT reservation_id FROM factures)")]
+        if sans_facture:
+            x("INSERT INTO factures (reservation_id) VALUES (?)", (rng.choice(sans_facture),))
+
+    def annuler_facture(self, rng, x):
+        if self.ids("factures"):
+            x("UPDATE factures SET is_deleted = ? WHERE id = ?", (rng.randint(0, 1), rng.choice(self.ids("factures"))))
+
+    def supprimer_facture(self, rng, x):
+        if self.ids("factures"):
+            facture_id = rng.choice(self.ids("factures"))
+            x("DELETE FROM paiements WHERE facture_id = ?", (facture_id,))
+            x("DELETE FROM factures WHERE id = ?", (facture_id,))
+
+    def paiement(self, rng, x):
+        if self.ids("factures"):
+            x("INSERT INTO paiements (facture_id, montant, date_paiement, methode, is_deleted) VALUES (?, ?, ?, ?, ?)",
+              (rng.choice(self.ids("factures")), rng.randint(1, 100) * 500.0, self.horodatage(),
+               rng.choice(METHODES), self.supprime()))
+
+    def modifier_paiement(self, rng, x):
+        if self.ids("paiements"):
+            colonne, valeur = rng.choice([("montant", rng.randint(1, 100) * 250.0), ("methode", rng.choice(METHODES)),
+                                          ("date_paiement", self.horodatage()), ("is_deleted", rng.randint(0, 1))])
+            x(f"UPDATE paiements SET {colonne} = ? WHERE id = ?", (valeur, rng.choice(self.ids("paiements"))))
+
+    def supprimer_paiement(self, rng, x):
+        if self.ids("paiements"):
+            x("DELETE FROM paiements WHERE id = ?", (rng.choice(self.ids("paiements")),))
+
+    def commande(self, rng, x):
+        if self.ids("reservations"):
+            x("INSERT INTO commandes (reservation_id, date_commande, lieu_consommation, is_deleted) VALUES (?, ?, ?, ?)",
+              (rng.choice(self.ids("reservations")), self.horodatage(), rng.choice(LIEUX), self.supprime()))
+
+    def modifier_commande(self, rng, x):
+        if self.ids("commandes"):
+            colonne, valeur = rng.choice([("date_commande", self.horodatage()), ("lieu_consommation", rng.choice(LIEUX)),
+                                          ("is_deleted", rng.randint(0, 1))])
+            x(f"UPDATE commandes SET {colonne} = ? WHERE id = ?", (valeur, rng.choice(self.ids("commandes"))))
+
+    def supprimer_commande(self, rng, x):
+        # Suppression définitive : les articles partent en cascade
+        if self.ids("commandes"):
+            commande_id = rng.choice(self.ids("commandes"))
+            x("UPDATE facture_items SET commande_id = NULL WHERE commande_id = ?", (commande_id,))
+            x("DELETE FROM commandes WHERE id = ?", (commande_id,))
+
+    def article(self, rng, x):
+        if self.ids("commandes"):
+            x("INSERT INTO commande_items (commande_id, produit_id, quantite, prix_unitaire_capture, is_deleted)"
+              " VALUES (?, 1, ?, ?, ?)",
+              (rng.choice(self.ids("commandes")), rng.randint(1, 5), rng.randint(1, 10) * 100.0, self.supprime()))
+
+    def modifier_article(self, rng, x):
+        if self.ids("commande_items"):
+            colonne, valeur = rng.choice([("quantite", rng.randint(1, 5)), ("is_deleted", rng.randint(0, 1)),
+                                          ("prix_unitaire_capture", rng.randint(1, 10) * 100.0),
+                                          ("commande_id", rng.choice(self.ids("commandes")))])
+            x(f"UPDATE commande_items SET {colonne} = ? WHERE id = ?", (valeur, rng.choice(self.ids("commande_items"))))
+
+    def supprimer_article(self, rng, x):
+        if self.ids("commande_items"):
+            x("DELETE FROM commande_items WHERE id = ?", (rng.choice(self.ids("commande_items")),))
+
+    def ligne_facture(self, rng, x):
+        if self.ids("factures"):
+            commande_id = service_id = None
+            origine = rng.random()
+            if origine < 0.3 and self.ids("commandes"):
+                commande_id = rng.choice(self.ids("commandes"))
+            elif origine < 0.5 and self.ids("reservations"):
+                x("INSERT INTO services_demandes (reservation_id, service_id, prix_capture) VALUES (?, 1, 3)",
+                  (rng.choice(self.ids("reservations")),))
+                service_id = x("SELECT last_insert_rowid()").fetchone()[0]
+            ht = rng.randint(1, 50) * 100.0
+            x("INSERT INTO facture_items (facture_id, description, prix_unitaire_ht, montant_ht, montant_tva,"
+              " montant_ttc, date_prestation, commande_id, service_demande_id, is_deleted)"
+              " VALUES (?, 'Ligne', ?, ?, ?, ?, ?, ?, ?, ?)",
+              (rng.choice(self.ids("factures")), ht, ht, ht * 0.18, ht * 1.18, self.jour(),
+               commande_id, service_id, self.supprime()))
+
+    def modifier_ligne_facture(self, rng, x):
+        if self.ids("facture_items"):
+            colonne, valeur = rng.choice([("montant_ht", rng.randint(1, 50) * 100.0),
+                                          ("montant_ttc", rng.randint(1, 60) * 100.0),
+                                          ("date_prestation", self.jour()), ("is_deleted", rng.randint(0, 1))])
+            x(f"UPDATE facture_items SET {colonne} = ? WHERE id = ?", (valeur, rng.choice(self.ids("facture_items"))))
+
+    def supprimer_ligne_facture(self, rng, x):
+        if self.ids("facture_items"):
+            x("DELETE FROM facture_items WHERE id = ?", (rng.choice(self.ids("facture_items")),))
+
+
+
+
+@pytest.fixture
+def base(tmp_path):
+    local_pool = creer_base_locale(str(tmp_path / "hotel.db"))
+    yield local_pool
+    local_pool.close_all()
+
+
+@pytest.mark.parametrize("graine", [1, 2, 3])
+def test_agregats_egaux_au_recalcul(base, graine):
+    calculs = calculs_initiaux()
+    assert set(calculs) == {"stats_reservations_jour", "stats_clients", "stats_paiements_jour",
+                            "stats_commandes_jour", "stats_facturation_jour"}
+
+    rng = random.Random(graine)
+    with base.transaction() as conn:
+        Ecritures(conn, rng).initialiser()
+    for _ in range(20):
+        with base.transaction() as conn:
+            ecritures = Ecritures(conn, rng)
+            for _ in range(100):
+                ecritures.une_ecriture()
+
+    with base.connection() as conn:
+        for table, (colonnes, select) in calculs.items():
+            nb_cles = sum(1 for c in colonnes if not c.startswith(("nb_", "nuitees", "montant")))
+            attendu = normaliser(conn.execute(select).fetchall(), nb_cles)
+            tenu = normaliser(conn.execute(f"SELECT {', '.join(colonnes)} FROM {table}").fetchall(), nb_cles)
+            assert attendu, table
+            assert tenu == attendu, table
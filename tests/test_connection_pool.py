@@ -0,0 +1,36 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/tests/test_connection_pool.py
+"""Emprunts imbriqués du pool de connexions : le réglage des clés étrangères ne peut pas changer."""
+import pytest
+
+from database.connection_pool import ConnectionPool
+
+
+@pytest.fixture
+def local_pool(tmp_path):
+    local_pool = ConnectionPool(str(tmp_path / "hotel.db"))
+    local_pool.connection(create=True).close()
+    yield local_pool
+    local_pool.close_all()
+
+
+def foreign_keys(conn):
+    return conn.execute("PRAGMA foreign_keys").fetchone()[0]
+
+
+def test_emprunt_imbrique_herite_du_reglage(local_pool):
+    with local_pool.connection(foreign_keys=False) as conn:
+        with local_pool.connection() as imbriquee:
+            assert imbriquee is conn
+            assert foreign_keys(imbriquee) == 0
+        with local_pool.connection(foreign_keys=False) as imbriquee:
+            assert foreign_keys(imbriquee) == 0
+    # Rendue au pool, la connexion retrouve les clés étrangères
+    with local_pool.connection() as conn:
+        assert foreign_keys(conn) == 1
+
+
+@pytest.mark.parametrize("premier, second", [(False, True), (True, False), (None, False)])
+def test_reglage_contraire_refuse(local_pool, premier, second):
+    with local_pool.connection(foreign_keys=premier):
+        with pytest.raises(RuntimeError):
+            local_pool.connection(foreign_keys=second)
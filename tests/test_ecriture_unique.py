@@ -0,0 +1,81 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/tests/test_ecriture_unique.py
+"""
+Écrivain unique : une unité de travail de l'interface attend la fin d'un long travail de synchro
+au lieu d'échouer sur "database is locked", et la synchro applique une table par lots.
+"""
+import threading
+import time
+
+import pytest
+
+from benchmarks.sync_benchmark import creer_base_locale
+from database import connection_pool
+from database.writer import PRIORITE_SYNCHRO
+from services import sync_service
+from services.sync_service import SyncService
+from services.sync_transport import SQLiteTransport
+
+
+@pytest.fixture
+def postes(tmp_path, monkeypatch):
+    # busy_timeout court : sans écrivain unique, l'unité de travail échouerait bien avant la fin du travail
+    monkeypatch.setattr(connection_pool, "PRAGMAS", tuple(
+        "PRAGMA busy_timeout = 200;" if pragma.startswith("PRAGMA busy_timeout") else pragma
+        for pragma in connection_pool.PRAGMAS))
+    pools = []
+
+    def creer(nom):
+        local_pool = creer_base_locale(str(tmp_path / nom / "hotel.db"))
+        pools.append(local_pool)
+        return local_pool
+
+    yield creer
+    for local_pool in pools:
+        local_pool.close_all()
+
+
+def test_unite_de_travail_attend_un_long_travail_de_synchro(postes):
+    local_pool = postes("poste")
+    demarre = threading.Event()
+
+    def long_travail():
+        with local_pool.connection() as conn:
+            conn.execute("INSERT INTO clients (id, nom, prenom) VALUES (1, 'Synchro', 'Test')")
+            demarre.set()
+            time.sleep(1.0)
+
+    futur = local_pool.writer.submit(long_travail, priority=PRIORITE_SYNCHRO, foreign_keys=False)
+    assert demarre.wait(5)
+
+    debut = time.perf_counter()
+    with local_pool.transaction() as conn:
+        conn.execute("INSERT INTO clients (id, nom, prenom) VALUES (2, 'Interface', 'Test')")
+    attente = time.perf_counter() - debut
+
+    futur.result()
+    assert attente > 0.5
+    with local_pool.connection() as conn:
+        assert [row[0] for row in conn.execute("SELECT id FROM clients ORDER BY id")] == [1, 2]
+
+
+def test_synchro_descendante_par_lots(tmp_path, postes, monkeypatch):
+    monkeypatch.setattr(sync_service, "SYNC_BATCH_SIZE", 10)
+    serveur = SQLiteTransport(str(tmp_path / "serveur.db"))
+    try:
+        serveur.upsert("clients", [{"id": i, "nom": f"Client {i}", "prenom": "Test", "updated_at": "2025-01-01"}
+                                   for i in range(1, 26)])
+        poste = postes("poste")
+        service = SyncService(transport=serveur, local_pool=poste, snapshots=False, verification=False)
+
+        lots = []
+        apply_table = service._apply_table
+        monkeypatch.setattr(service, "_apply_table",
+                            lambda table, lignes: lots.append((table, len(lignes))) or apply_table(table, lignes))
+        timings = service.sync_down("1970-01-01T00:00:00+00:00")
+    finally:
+        serveur.close()
+
+    assert lots == [("clients", 10), ("clients", 10), ("clients", 5)]
+    assert timings["clients"]["received"] == 25
+    with poste.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM clients").fetchone()[0] == 25
@@ -0,0 +1,140 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/tests/test_facturation.py
+"""Recalcul des factures (FactureController) : drapeau a_recalculer et écriture des seules lignes modifiées."""
+import pytest
+
+import models.base_model
+from benchmarks.sync_benchmark import creer_base_locale
+from controllers.facture_controller import FactureController
+from models.facture_item_model import FactureItemModel
+from models.facture_model import FactureModel
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """Base neuve servie aux modèles à la place de hotel.db : un séjour terminé de 3 nuits avec une commande."""
+    local_pool = creer_base_locale(str(tmp_path / "hotel.db"))
+    monkeypatch.setattr(models.base_model, "pool", local_pool)
+    with local_pool.transaction() as conn:
+        conn.execute("INSERT INTO hotel_info (id, nom, tdt_par_personne) VALUES (1, 'Hôtel', 1000)")
+        conn.execute("INSERT INTO types_chambre (id, nom, prix_par_nuit) VALUES (1, 'Standard', 20000)")
+        conn.execute("INSERT INTO chambres (id, numero, type_id) VALUES (1, '101', 1)")
+        conn.execute("INSERT INTO clients (id, nom) VALUES (1, 'Diallo')")
+        conn.execute("INSERT INTO reservations (id, client_id, chambre_id, date_arrivee, date_depart, statut)"
+                     " VALUES (1, 1, 1, '2025-03-01', '2025-03-04', 'check-out')")
+        conn.execute("INSERT INTO produits (id, nom, categorie, prix_unitaire) VALUES (1, 'Jus', 'Boisson fraîche', 1500)")
+        conn.execute("INSERT INTO services_disponibles (id, nom_service, prix) VALUES (1, 'Blanchisserie', 3000)")
+        conn.execute("INSERT INTO commandes (id, reservation_id) VALUES (1, 1)")
+        conn.execute("INSERT INTO commande_items (commande_id, produit_id, quantite, prix_unitaire_capture)"
+                     " VALUES (1, 1, 2, 1500)")
+    yield local_pool
+    local_pool.close_all()
+
+
+@pytest.fixture
+def ecritures(monkeypatch):
+    """Enregistre les écritures sur les factures et leurs lignes : (méthode, id ou descriptions) dans l'ordre."""
+    appels = []
+    for modele, nom in ((FactureModel, "create"), (FactureModel, "update_montants"),
+                        (FactureModel, "enregistrer_etat"), (FactureItemModel, "update_ligne"),
+                        (FactureItemModel, "delete"), (FactureItemModel, "create_many")):
+        methode = getattr(modele, nom)
+
+        def espion(*args, _nom=nom, _methode=methode):
+            appels.append((_nom, [l["description"] for l in args[1]] if _nom == "create_many" else args[0]))
+            return _methode(*args)
+
+        monkeypatch.setattr(modele, nom, espion)
+    return appels
+
+
+def lignes_ecrites(appels):
+    return [appel for appel in appels if appel[0] in ("update_ligne", "delete", "create_many")]
+
+
+def lignes(local_pool):
+    with local_pool.connection() as conn:
+        return {row["description"]: (row["id"], row["montant_ht"])
+                for row in conn.execute("SELECT id, description, montant_ht FROM facture_items WHERE is_deleted = 0")}
+
+
+def test_facture_propre_non_recalculee(base, ecritures, monkeypatch):
+    premier = FactureController.generer_et_mettre_a_jour_facture(1)
+    assert premier["success"] and premier["message"] == "Facture mise à jour avec les derniers calculs."
+    assert premier["data"]["total_ht"] == 3 * 20000 + 2 * 1500
+
+    chargements = []
+    get_donnees_facturation = FactureModel.get_donnees_facturation
+    monkeypatch.setattr(FactureModel, "get_donnees_facturation",
+                        lambda reservation_id: chargements.append(reservation_id)
+                        or get_donnees_facturation(reservation_id))
+    ecritures.clear()
+    second = FactureController.generer_et_mettre_a_jour_facture(1)
+    assert second == {"success": True, "data": premier["data"], "message": "Facture déjà à jour."}
+    assert chargements == [] and ecritures == []
+
+    # Une consommation ajoutée marque la facture à recalculer (trigger) : le calcul suivant la prend en compte
+    with base.transaction() as conn:
+        conn.execute("INSERT INTO commande_items (commande_id, produit_id, quantite, prix_unitaire_capture)"
+                     " VALUES (1, 1, 1, 1500)")
+    troisieme = FactureController.generer_et_mettre_a_jour_facture(1)
+    assert troisieme["message"] == "Facture mise à jour avec les derniers calculs."
+    assert troisieme["data"]["total_ht"] == 3 * 20000 + 3 * 1500
+    assert chargements == [1]
+    assert ("enregistrer_etat", 1) in ecritures
+
+
+def test_seules_les_lignes_modifiees_sont_ecrites(base, ecritures):
+    assert FactureController.generer_et_mettre_a_jour_facture(1)["success"]
+    assert lignes_ecrites(ecritures) == [("create_many", ["Hébergement", "Consommations (Bar/Restaurant)",
+                                                          "Taxe de Développement Touristique"])]
+    avant = lignes(base)
+
+    # Une consommation de plus : seule la ligne des consommations est réécrite
+    ecritures.clear()
+    with base.transaction() as conn:
+        conn.execute("INSERT INTO commande_items (commande_id, produit_id, quantite, prix_unitaire_capture)"
+                     " VALUES (1, 1, 1, 1500)")
+    assert FactureController.generer_et_mettre_a_jour_facture(1)["success"]
+    assert lignes_ecrites(ecritures) == [("update_ligne", avant["Consommations (Bar/Restaurant)"][0])]
+
+    # Un service demandé ajoute sa ligne sans toucher aux autres ; la commande annulée retire la sienne
+    ecritures.clear()
+    with base.transaction() as conn:
+        conn.execute("INSERT INTO services_demandes (reservation_id, service_id, quantite, prix_capture)"
+                     " VALUES (1, 1, 1, 3000)")
+        conn.execute("UPDATE commandes SET statut = 'Annulé' WHERE id = 1")
+    assert FactureController.generer_et_mettre_a_jour_facture(1)["success"]
+    assert lignes_ecrites(ecritures) == [("delete", avant["Consommations (Bar/Restaurant)"][0]),
+                                         ("create_many", ["Service: Blanchisserie"])]
+
+    apres = lignes(base)
+    assert apres["Hébergement"] == avant["Hébergement"]
+    assert apres["Taxe de Développement Touristique"] == avant["Taxe de Développement Touristique"]
+    assert apres["Service: Blanchisserie"][1] == 3000
+    assert "Consommations (Bar/Restaurant)" not in apres
+
+
+def test_export_ne_recalcule_que_les_factures_modifiees(base, ecritures, monkeypatch):
+    from utils.pdf_generator import _donnees_factures
+
+    with base.transaction() as conn:
+        conn.execute("INSERT INTO reservations (id, client_id, chambre_id, date_arrivee, date_depart, statut)"
+                     " VALUES (2, 1, 1, '2025-04-01', '2025-04-02', 'check-out')")
+        conn.execute("INSERT INTO factures (reservation_id) VALUES (1), (2)")
+    donnees, erreurs = _donnees_factures([1, 2, 99])
+    assert erreurs == [{"reservation_id": 99, "erreur": "Réservation introuvable."}]
+    assert donnees[1]["facture"]["montant_total_ht"] == 3 * 20000 + 2 * 1500
+    assert donnees[2]["facture"]["montant_total_ht"] == 20000
+    assert donnees[1]["hotel"]["nom"] == "Hôtel"
+
+    # Seule la réservation 1 a changé : elle seule est recalculée, l'état de toutes est lu en une requête
+    with base.transaction() as conn:
+        conn.execute("UPDATE reservations SET nb_adultes = 2 WHERE id = 1")
+    monkeypatch.setattr(FactureModel, "get_etat", None)
+    ecritures.clear()
+    donnees, erreurs = _donnees_factures([1, 2])
+    assert erreurs == []
+    assert [appel for appel in ecritures if appel[0] == "enregistrer_etat"] == [("enregistrer_etat", 1)]
+    assert donnees[1]["facture"]["montant_total_ttc"] > donnees[2]["facture"]["montant_total_ttc"]
+    assert [item["description"] for item in donnees[1]["items"]] == [
+        "Hébergement", "Consommations (Bar/Restaurant)", "Taxe de Développement Touristique"]
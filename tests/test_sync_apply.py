@@ -0,0 +1,100 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/tests/test_sync_apply.py
+"""Application des lignes distantes (sync_down) sur une base locale, avec un serveur SQLite (SQLiteTransport)."""
+from datetime import datetime, timezone
+
+import pytest
+
+from benchmarks.sync_benchmark import creer_base_locale
+from services.sync_service import SyncService
+from services.sync_transport import SQLiteTransport
+
+
+@pytest.fixture
+def serveur(tmp_path):
+    transport = SQLiteTransport(str(tmp_path / "serveur.db"))
+    yield transport
+    transport.close()
+
+
+@pytest.fixture
+def poste(tmp_path):
+    local_pool = creer_base_locale(str(tmp_path / "poste" / "hotel.db"))
+    yield local_pool
+    local_pool.close_all()
+
+
+def maintenant():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def chambres(local_pool):
+    with local_pool.connection() as conn:
+        return {row["id"]: row["numero"] for row in conn.execute("SELECT id, numero FROM chambres")}
+
+
+def test_collision_sur_cle_unique(serveur, poste):
+    version = maintenant()
+    serveur.upsert("types_chambre", [{"id": 1, "nom": "Standard", "prix_par_nuit": 10000, "updated_at": version}])
+    serveur.upsert("chambres", [{"id": i, "numero": str(100 + i), "type_id": 1, "updated_at": version}
+                                for i in (1, 2, 3)])
+    service = SyncService(transport=serveur, local_pool=poste, snapshots=False, verification=False)
+    assert service.synchronize()["success"]
+    assert chambres(poste) == {1: "101", 2: "102", 3: "103"}
+
+    # Sur le serveur : les chambres 1 et 2 échangent leurs numéros, la 3 est supprimée et recréée sous l'id 4
+    version = maintenant()
+    serveur.upsert("chambres", [{"id": 1, "numero": "102", "type_id": 1, "updated_at": version},
+                                {"id": 2, "numero": "101", "type_id": 1, "updated_at": version},
+                                {"id": 4, "numero": "103", "type_id": 1, "updated_at": version}])
+    serveur.delete("chambres", [3])
+
+    resultat = service.synchronize()
+    assert resultat["success"]
+    assert resultat["failed_tables"] == []
+    assert chambres(poste) == {1: "102", 2: "101", 4: "103"}
+    with poste.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sync_outbox").fetchone()[0] == 0
+
+
+def test_echo_supprime_quand_un_autre_poste_a_modifie_la_ligne(serveur, poste):
+    with poste.transaction() as conn:
+        conn.execute("INSERT INTO clients (id, nom, prenom) VALUES (1, 'Local', 'Test')")
+    service = SyncService(transport=serveur, local_pool=poste, snapshots=False, verification=False)
+    depuis = maintenant()
+    service.sync_up()
+    with poste.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sync_echos").fetchone()[0] == 1
+
+    # Un autre poste modifie la ligne avant que l'écho ne revienne
+    serveur.upsert("clients", [{"id": 1, "nom": "Autre poste", "prenom": "Test", "updated_at": maintenant()}])
+    service.sync_down(depuis)
+
+    with poste.connection() as conn:
+        assert conn.execute("SELECT nom FROM clients WHERE id = 1").fetchone()[0] == "Autre poste"
+        assert conn.execute("SELECT COUNT(*) FROM sync_echos").fetchone()[0] == 0
+
+
+def test_marque_conservee_quand_une_table_echoue(serveur, poste, monkeypatch):
+    service = SyncService(transport=serveur, local_pool=poste, snapshots=False, verification=False)
+    assert service.synchronize()["success"]
+    marque = service._get_last_sync_time()
+
+    serveur.upsert("clients", [{"id": 1, "nom": "Diallo", "prenom": "Awa", "updated_at": maintenant()}])
+    fetch_changes = serveur.fetch_changes
+
+    def fetch_en_panne(table, last_sync_time):
+        if table == "clients":
+            raise ConnectionError("délai dépassé")
+        return fetch_changes(table, last_sync_time)
+
+    monkeypatch.setattr(serveur, "fetch_changes", fetch_en_panne)
+    resultat = service.synchronize()
+    assert resultat["failed_tables"] == ["clients"]
+    assert service._get_last_sync_time() == marque
+
+    monkeypatch.setattr(serveur, "fetch_changes", fetch_changes)
+    resultat = service.synchronize()
+    assert resultat["failed_tables"] == []
+    assert service._get_last_sync_time() != marque
+    with poste.connection() as conn:
+        assert conn.execute("SELECT nom FROM clients WHERE id = 1").fetchone()["nom"] == "Diallo"
@@ -0,0 +1,84 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/tests/test_sync_bootstrap.py
+"""
+Premier cycle de synchro d'un poste (sans fichier .last_sync) avec un serveur SQLite (SQLiteTransport) :
+l'instantané ne doit initialiser qu'une base vide, jamais écraser des saisies hors ligne.
+"""
+import os
+
+import pytest
+
+from benchmarks.sync_benchmark import creer_base_locale
+from services.sync_service import SyncService
+from services.sync_transport import SQLiteTransport
+
+
+@pytest.fixture
+def serveur(tmp_path):
+    transport = SQLiteTransport(str(tmp_path / "serveur.db"))
+    yield transport
+    transport.close()
+
+
+@pytest.fixture
+def postes(tmp_path):
+    pools = []
+
+    def creer(nom):
+        local_pool = creer_base_locale(str(tmp_path / nom / "hotel.db"))
+        pools.append(local_pool)
+        return local_pool
+
+    yield creer
+    for local_pool in pools:
+        local_pool.close_all()
+
+
+def ajouter_client(local_pool, client_id, nom):
+    with local_pool.transaction() as conn:
+        conn.execute("INSERT INTO clients (id, nom, prenom) VALUES (?, ?, 'Test')", (client_id, nom))
+
+
+def clients(local_pool):
+    with local_pool.connection() as conn:
+        return {row["id"]: row["nom"] for row in conn.execute("SELECT id, nom FROM clients")}
+
+
+def nb_outbox(local_pool):
+    with local_pool.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM sync_outbox").fetchone()[0]
+
+
+def test_poste_vierge_initialise_par_instantane(serveur, postes):
+    poste_a = postes("poste_a")
+    ajouter_client(poste_a, 1, "Client A")
+    assert SyncService(transport=serveur, local_pool=poste_a).synchronize()["success"]
+    assert serveur.download_snapshot() is not None
+
+    poste_b = postes("poste_b")
+    service_b = SyncService(transport=serveur, local_pool=poste_b)
+    assert service_b.synchronize()["success"]
+
+    assert clients(poste_b) == {1: "Client A"}
+    assert os.path.exists(service_b.last_snapshot_file)
+
+
+def test_saisies_hors_ligne_conservees_au_premier_cycle(serveur, postes):
+    poste_a = postes("poste_a")
+    ajouter_client(poste_a, 1, "Client A")
+    assert SyncService(transport=serveur, local_pool=poste_a).synchronize()["success"]
+    assert serveur.download_snapshot() is not None
+
+    # Poste C : client saisi hors ligne avant sa toute première synchro
+    poste_c = postes("poste_c")
+    ajouter_client(poste_c, 2, "Client C")
+    assert nb_outbox(poste_c) == 1
+
+    service_c = SyncService(transport=serveur, local_pool=poste_c)
+    resultat = service_c.synchronize()
+    assert resultat["success"]
+
+    # Le client de C est conservé et envoyé, celui de A est reçu par l'incrémental
+    assert clients(poste_c) == {1: "Client A", 2: "Client C"}
+    assert nb_outbox(poste_c) == 0
+    assert {row["id"] for row in serveur.fetch_changes("clients", "")} == {1, 2}
+    assert resultat["sent"] == 1
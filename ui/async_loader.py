@@ -0,0 +1,159 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/ui/async_loader.py
+import itertools
+
+from PySide6.QtCore import QEvent, QObject, QRunnable, Qt, QThreadPool, Signal
+from PySide6.QtWidgets import QLabel, QMessageBox, QWidget
+
+
+class _TaskSignals(QObject):
+    """Signaux d'une tâche : émis depuis le thread du pool, reçus dans le thread de l'interface."""
+    done = Signal(str, int, object)
+    failed = Signal(str, int, str)
+
+
+class _LoadTask(QRunnable):
+    """Exécute un appel de contrôleur (ou toute fonction de lecture) dans un thread du QThreadPool."""
+
+    def __init__(self, channel, token, fn, args, kwargs):
+        super().__init__()
+        # Le pool ne détruit pas la tâche : AsyncLoader garde la référence tant qu'elle peut être annulée.
+        self.setAutoDelete(False)
+        self.channel = channel
+        self.token = token
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.channel, self.token, str(e))
+            return
+        self.signals.done.emit(self.channel, self.token, result)
+
+
+class AsyncLoader(QObject):
+    """
+    Chargeur asynchrone partagé par les pages : les lectures (appels de contrôleurs) s'exécutent dans
+    le QThreadPool global et leur résultat est remis à la page par signal, dans le thread de l'interface.
+
+        self.loader = AsyncLoader(self)
+        self.loader.show_loading_on(self.table)
+        self.loader.load(ReservationController.list_reservations, on_result=self.afficher_reservations)
+
+    Chaque canal (`channel`) ne garde que sa dernière demande : une demande plus récente retire de la file
+    la précédente si elle n'a pas commencé, et son résultat est ignoré si elle est déjà en cours.
+    `loading_changed` indique si un chargement est en cours, pour afficher un état « Chargement… » ;
+    `channel_loading_changed` donne la même information canal par canal.
+    """
+    loading_changed = Signal(bool)
+    channel_loading_changed = Signal(str, bool)
+
+    def __init__(self, parent=None, thread_pool=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._counter = itertools.count(1)
+        self._current = {}      # canal -> jeton de la dernière demande
+        self._tasks = {}        # jeton -> (tâche, on_result, on_error)
+
+    def load(self, fn, *args, on_result, on_error=None, channel="default", **kwargs):
+        """Lance `fn(*args, **kwargs)` en arrière-plan ; `on_result(résultat)` est appelé à la fin."""
+        was_loading = self.is_loading()
+        was_channel_loading = channel in self._current
+        self._drop(channel)
+        token = next(self._counter)
+        task = _LoadTask(channel, token, fn, args, kwargs)
+        task.signals.done.connect(self._on_done)
+        task.signals.failed.connect(self._on_failed)
+
+        self._current[channel] = token
+        self._tasks[token] = (task, on_result, on_error)
+        self.thread_pool.start(task)
+        if not was_channel_loading:
+            self.channel_loading_changed.emit(channel, True)
+        if not was_loading:
+            self.loading_changed.emit(True)
+        return token
+
+    def cancel(self, channel=None):
+        """Abandonne la demande en cours d'un canal (de tous les canaux si `channel` est None)."""
+        was_loading = self.is_loading()
+        for name in (list(self._current) if channel is None else [channel]):
+            if name in self._current:
+                self._drop(name)
+                self.channel_loading_changed.emit(name, False)
+        if was_loading and not self.is_loading():
+            self.loading_changed.emit(False)
+
+    def _drop(self, channel):
+        token = self._current.pop(channel, None)
+        entry = self._tasks.get(token)
+        # Pas encore démarrée : retirée de la file. Déjà en cours : son résultat sera ignoré.
+        if entry is not None and self.thread_pool.tryTake(entry[0]):
+            del self._tasks[token]
+
+    def is_loading(self):
+        return bool(self._current)
+
+    def _finish(self, channel, token):
+        """Retourne les rappels de la demande si elle est toujours la plus récente de son canal."""
+        entry = self._tasks.pop(token, None)
+        if entry is None or self._current.get(channel) != token:
+            return None
+        del self._current[channel]
+        self.channel_loading_changed.emit(channel, False)
+        if not self.is_loading():
+            self.loading_changed.emit(False)
+        return entry
+
+    def _on_done(self, channel, token, result):
+        entry = self._finish(channel, token)
+        if entry is not None:
+            entry[1](result)
+
+    def _on_failed(self, channel, token, message):
+        entry = self._finish(channel, token)
+        if entry is None:
+            return
+        if entry[2] is not None:
+            entry[2](message)
+        else:
+            parent = self.parent() if isinstance(self.parent(), QWidget) else None
+            QMessageBox.critical(parent, "Erreur", f"Erreur lors du chargement : {message}")
+
+    def show_loading_on(self, widget, channel=None):
+        """
+        Recouvre `widget` d'un voile « Chargement… » pendant les chargements de ce chargeur
+        (seulement ceux du canal `channel` s'il est donné).
+        """
+        overlay = LoadingOverlay(widget)
+        if channel is None:
+            self.loading_changed.connect(overlay.setVisible)
+        else:
+            self.channel_loading_changed.connect(
+                lambda name, loading: overlay.setVisible(loading) if name == channel else None)
+        return overlay
+
+
+class LoadingOverlay(QLabel):
+    """Voile semi-transparent posé sur un widget pendant son chargement ; suit sa taille."""
+
+    def __init__(self, target):
+        super().__init__("⏳ Chargement…", target)
+        self.setAlignment(Qt.AlignCenter)
+        self.setStyleSheet("background-color: rgba(255, 255, 255, 170); color: #2c3e50; font-size: 14pt;")
+        self.hide()
+        target.installEventFilter(self)
+        self.setGeometry(target.rect())
+
+    def eventFilter(self, watched, event):
+        if watched is self.parent() and event.type() == QEvent.Resize:
+            self.setGeometry(watched.rect())
+        return super().eventFilter(watched, event)
+
+    def setVisible(self, visible):
+        super().setVisible(visible)
+        if visible:
+            self.raise_()
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from PySide6.QtCore import Qt, Signal, QSize, QObject, QThread, QTimer
+from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QFont, QIcon, QPixmap
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QHBoxLayout,
@@ -12,7 +12,9 @@ from PySide6.QtWidgets import (
 from controllers.reservation_controller import ReservationController
 # Import des contrôleurs et services
 from controllers.user_controller import UserController
+from database.connection_pool import pool
 from services.sync_service import SyncService
+from ui.sync_scheduler import SyncScheduler
 
 # Import des pages de l'UI
 from ui.pages.arrivals import ArrivalsPage
@@ -30,20 +32,6 @@ from ui.pages.settings import SettingsPage
 from ui.pages.users import UsersPage
 
 
-class SyncWorker(QObject):
-    """Worker qui exécute la tâche de synchronisation dans un thread séparé."""
-    finished = Signal(dict)
-
-    def __init__(self, sync_service):
-        super().__init__()
-        self.sync_service = sync_service
-
-    def run(self):
-        """Lance la synchronisation et émet un signal quand c'est terminé."""
-        result = self.sync_service.synchronize()
-        self.finished.emit(result)
-
-
 class HomeWindow(QMainWindow):
     logout_signal = Signal()
 
@@ -243,35 +231,34 @@ class HomeWindow(QMainWindow):
         self.header_title.setText(name.replace("\n", " "))
 
     def init_sync_service(self):
-        """Initialise et démarre le service de synchronisation périodique."""
+        """Initialise et démarre le service de synchronisation, piloté par le planificateur adaptatif."""
         try:
             self.sync_service = SyncService()
             self.sync_status_label = QLabel("Synchro: Prêt")
             self.statusBar().addPermanentWidget(self.sync_status_label)
-            self.run_background_sync()
-            self.sync_timer = QTimer(self)
-            self.sync_timer.timeout.connect(self.run_background_sync)
-            self.sync_timer.start(60000)
+            self.sync_scheduler = SyncScheduler(self.sync_service, self)
+            self.sync_scheduler.started.connect(lambda: self.sync_status_label.setText("Synchro: En cours..."))
+            self.sync_scheduler.progress.connect(lambda message: self.sync_status_label.setText(f"Synchro: {message}"))
+            self.sync_scheduler.finished.connect(self.on_sync_finished)
+            self.sync_scheduler.start()
         except ValueError as e:
             QMessageBox.critical(self, "Erreur de Configuration", str(e))
 
     def run_background_sync(self):
-        """Lance la synchronisation dans un thread séparé pour ne pas bloquer l'UI."""
-        self.sync_status_label.setText("Synchro: En cours...")
-        self.thread = QThread()
-        self.worker = SyncWorker(self.sync_service)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.on_sync_finished)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.start()
+        """Demande une synchronisation immédiate (elle attend la fin de celle en cours, le cas échéant)."""
+        if hasattr(self, 'sync_scheduler'):
+            self.sync_scheduler.request_sync()
 
     def on_sync_finished(self, result):
         """Méthode appelée quand la synchronisation est terminée."""
         if result.get("success"):
-            self.sync_status_label.setText(f"Synchro: OK ({datetime.now().strftime('%H:%M:%S')})")
+            self.sync_status_label.setText(
+                f"Synchro: OK ({datetime.now().strftime('%H:%M:%S')}, {result.get('duration', 0):.1f} s)")
+            # Détail par table au survol : envoi, téléchargement (parallèle) et application locale
+            self.sync_status_label.setToolTip("\n".join(
+                f"{table} : ↑ {t.get('up', 0):.2f} s | ↓ {t.get('fetch', 0):.2f} s + {t.get('apply', 0):.2f} s"
+                for table, t in result.get("timings", {}).items()
+            ))
         else:
             error_msg = result.get('error', 'Erreur inconnue')
             self.sync_status_label.setText("Synchro: Erreur!")
@@ -279,7 +266,9 @@ class HomeWindow(QMainWindow):
             if "timeout" not in error_msg.lower():
                 QMessageBox.warning(self, "Erreur de Synchronisation", f"La synchronisation a échoué : {error_msg}")
 
-        # Rafraîchir la vue actuelle pour afficher les nouvelles données
+        # Rafraîchir la vue actuelle seulement si la synchro a apporté de nouvelles données
+        if not result.get("received"):
+            return
         # CORRECTION : Utilisation de self.stack au lieu de self.stacked_widget
         current_widget = self.stack.currentWidget()
         # On standardise sur la méthode 'refresh_data' pour toutes les pages
@@ -316,5 +305,8 @@ class HomeWindow(QMainWindow):
         self.old_pos = None
 
     def closeEvent(self, event):
-        # Plus besoin de fermer la connexion DB ici, car elle n'est plus stockée
+        if hasattr(self, 'sync_scheduler'):
+            self.sync_scheduler.stop()
+        # Les connexions au repos du pool sont fermées pour libérer les descripteurs de fichiers
+        pool.close_all()
         event.accept()
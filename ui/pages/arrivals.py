@@ -3,10 +3,13 @@ from datetime import datetime
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
-    QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+    QHBoxLayout, QMessageBox
 )
 
+from controllers.recherche_controller import RechercheController
 from controllers.reservation_controller import ReservationController
+from ui.async_loader import AsyncLoader
+from ui.table_model import ActionButtonsDelegate, RowTableModel, RowTableView
 
 
 class ArrivalsPage(QWidget):
@@ -15,7 +18,10 @@ class ArrivalsPage(QWidget):
         # Il est préférable de créer une instance du contrôleur ici
         # plutôt que de la passer, pour que la page soit autonome.
         self.reservation_controller = ReservationController()
+        self.loader = AsyncLoader(self)
         self.init_ui()
+        # Le voile ne couvre que le chargement des arrivées, pas la recherche
+        self.loader.show_loading_on(self.table, channel="default")
         self.charger_arrivees()
 
     def init_ui(self):
@@ -42,22 +48,29 @@ class ArrivalsPage(QWidget):
         layout.addLayout(action_layout)
 
         # Tableau
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels([
-            "ID Résa", "Client", "Chambre", "Du", "Au", "Actions"
-        ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_model = RowTableModel([
+            ("ID Résa", lambda r: f"RES-{r['id']}"),
+            ("Client", lambda r: r.get("client", "N/A")),
+            ("Chambre", lambda r: r.get("chambre", "?")),
+            ("Du", lambda r: r["date_arrivee"]),
+            ("Au", lambda r: r["date_depart"]),
+            ("Actions", lambda r: ""),
+        ], self)
+        self.table = RowTableView(self.table_model)
+        actions_delegate = ActionButtonsDelegate(
+            lambda r: [("checkin", "✅ Check-in", "Enregistrer l'arrivée du client")], self.table)
+        actions_delegate.clicked.connect(lambda _action, r: self.confirmer_checkin(r["id"]))
+        self.table.setItemDelegateForColumn(5, actions_delegate)
         layout.addWidget(self.table)
 
     def charger_arrivees(self):
         """
-        Charge les arrivées du jour et les affiche dans le tableau.
+        Charge les arrivées du jour en arrière-plan ; afficher_arrivees les affiche à réception.
         """
-        self.table.setRowCount(0)
+        self.loader.load(self.reservation_controller.list_reservations, on_result=self.afficher_arrivees)
+
+    def afficher_arrivees(self, response):
         try:
-            response = self.reservation_controller.list_reservations()
             if not response.get("success", False):
                 QMessageBox.warning(self, "Erreur", response.get("error", "Erreur inconnue"))
                 return
@@ -71,27 +84,12 @@ class ArrivalsPage(QWidget):
                 if r["statut"] == "réservée" and date_arr == today:
                     arrivals_today.append(r)
 
-            self.table.setRowCount(len(arrivals_today))
-            for row, r in enumerate(arrivals_today):
-                # --- CORRECTION ICI ---
-                # On utilise les clés 'client' et 'chambre' fournies par le modèle.
-                self.table.setItem(row, 0, QTableWidgetItem(f"RES-{r['id']}"))
-                self.table.setItem(row, 1, QTableWidgetItem(r.get("client", "N/A")))
-                self.table.setItem(row, 2, QTableWidgetItem(r.get("chambre", "?")))
-                self.table.setItem(row, 3, QTableWidgetItem(r["date_arrivee"]))
-                self.table.setItem(row, 4, QTableWidgetItem(r["date_depart"]))
-
-                btn_checkin = QPushButton("✅ Check-in")
-                btn_checkin.setToolTip("Enregistrer l'arrivée du client")
-                btn_checkin.clicked.connect(lambda _, rid=r["id"]: self.confirmer_checkin(rid))
-                self.table.setCellWidget(row, 5, btn_checkin)
+            self.table_model.set_rows(arrivals_today)
+            self.rechercher()
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement : {e}")
 
-        # Appliquer la recherche après le chargement
-        self.rechercher()
-
     def confirmer_checkin(self, reservation_id):
         reponse = QMessageBox.question(
             self, "Confirmation",
@@ -110,17 +108,21 @@ class ArrivalsPage(QWidget):
 
     def rechercher(self):
         """
-        Filtre les lignes du tableau en fonction du texte de recherche.
+        Filtre les arrivées affichées avec l'index plein texte (nom du client, n° de chambre, RES-id),
+        interrogé en arrière-plan sur les seules réservations du tableau.
         """
-        terme = self.search_input.text().lower().strip()
-        for row in range(self.table.rowCount()):
-            client_item = self.table.item(row, 1)
-            chambre_item = self.table.item(row, 2)
-
-            # Vérifie que les items existent avant d'accéder à .text()
-            client_text = client_item.text().lower() if client_item else ""
-            chambre_text = chambre_item.text().lower() if chambre_item else ""
-
-            # La ligne est visible si le terme est dans le nom du client OU le numéro de chambre
-            visible = terme in client_text or terme in chambre_text
-            self.table.setRowHidden(row, not visible)
+        terme = self.search_input.text().strip()
+        if not terme:
+            self.loader.cancel("recherche")
+            self.table_model.set_filter(None)
+            return
+        ids = [r["id"] for r in self.table_model.all_rows()]
+        self.loader.load(RechercheController.filtrer_reservations, terme, ids,
+                         on_result=self.filtrer_arrivees, channel="recherche")
+
+    def filtrer_arrivees(self, response):
+        if not response.get("success"):
+            QMessageBox.warning(self, "Erreur", response.get("error", "Erreur de recherche"))
+            return
+        ids = set(response.get("data", []))
+        self.table_model.set_filter(lambda r: r["id"] in ids)
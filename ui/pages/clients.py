@@ -3,13 +3,16 @@ from PySide6.QtWidgets import (
     QPushButton, QHBoxLayout, QHeaderView, QFormLayout, QMessageBox
 )
 from PySide6.QtGui import QFont
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from controllers.client_controller import ClientController
+from controllers.recherche_controller import RechercheController
+from ui.async_loader import AsyncLoader
 
 
 class ClientsPage(QWidget):
     def __init__(self):
         super().__init__()
+        self.loader = AsyncLoader(self)
         self.client_actuel_id = None
         self.init_ui()
         self.charger_clients()
@@ -26,7 +29,13 @@ class ClientsPage(QWidget):
         # Barre de recherche
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Rechercher par nom ou téléphone...")
+        self.search_input.setPlaceholderText("Rechercher par nom, téléphone, email ou CNI...")
+        # Recherche au fil de la frappe : lancée quand la saisie marque une courte pause
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.rechercher_clients)
+        self.search_input.textChanged.connect(self.search_timer.start)
         btn_search = QPushButton("Rechercher")
         btn_search.clicked.connect(self.rechercher_clients)
         search_layout.addWidget(self.search_input)
@@ -42,6 +51,7 @@ class ClientsPage(QWidget):
         self.table.verticalHeader().setVisible(False)
         self.table.setSelectionBehavior(QTableWidget.SelectRows)
         layout.addWidget(self.table)
+        self.loader.show_loading_on(self.table)
 
         # Formulaire de modification
         form_layout = QFormLayout()
@@ -67,10 +77,15 @@ class ClientsPage(QWidget):
         layout.addWidget(self.btn_modifier)
 
     def charger_clients(self):
-        """Charge les clients et leurs informations dans le tableau."""
+        """Charge en arrière-plan les clients (ceux de la recherche en cours s'il y en a une), puis remplit le tableau."""
+        terme = self.search_input.text().strip()
+        if terme:
+            self.loader.load(RechercheController.rechercher_clients, terme, on_result=self.afficher_clients)
+        else:
+            self.loader.load(ClientController.liste_clients_avec_reservations, on_result=self.afficher_clients)
+
+    def afficher_clients(self, result):
         self.table.setRowCount(0)
-        # La méthode du contrôleur est correcte
-        result = ClientController.liste_clients_avec_reservations()
 
         if not result.get("success"):
             QMessageBox.warning(self, "Erreur", result.get("error", "Impossible de charger les clients."))
@@ -160,13 +175,6 @@ class ClientsPage(QWidget):
             QMessageBox.warning(self, "Erreur", result.get("error", "Modification échouée."))
 
     def rechercher_clients(self):
-        recherche = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            item_nom = self.table.item(row, 0)
-            item_tel = self.table.item(row, 2)
-
-            visible = (
-                recherche in (item_nom.text().lower() if item_nom else "") or
-                recherche in (item_tel.text().lower() if item_tel else "")
-            )
-            self.table.setRowHidden(row, not visible)
+        """Recherche plein texte en base (préfixes, classement par pertinence) au lieu de masquer des lignes."""
+        self.search_timer.stop()
+        self.charger_clients()
@@ -6,7 +6,7 @@ from datetime import date, datetime
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QLineEdit, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QDialog
+    QMessageBox, QDialog
 )
 # --- MODIFICATION : Suppression des imports devenus inutiles ---
 # from controllers.chambre_controller import ChambreController
@@ -17,6 +17,8 @@ from PySide6.QtWidgets import (
 from controllers.facture_controller import FactureController
 from controllers.paiement_controller import PaiementController
 from controllers.reservation_controller import ReservationController
+from ui.async_loader import AsyncLoader
+from ui.table_model import ActionButtonsDelegate, RowTableModel, RowTableView
 from utils.pdf_generator import creer_facture_pdf
 
 
@@ -26,7 +28,9 @@ class DeparturesPage(QWidget):
         self.user_id = user_id
         # On n'a besoin que de ce contrôleur ici
         self.reservation_controller = ReservationController()
+        self.loader = AsyncLoader(self)
         self.init_ui()
+        self.loader.show_loading_on(self.table)
         self.charger_departures()
 
     def init_ui(self):
@@ -48,53 +52,44 @@ class DeparturesPage(QWidget):
         search_layout.addWidget(btn_refresh)
         layout.addLayout(search_layout)
 
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels([
-            "ID Résa", "Client", "Chambre", "Arrivée", "Départ Prévu", "Actions"
-        ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_model = RowTableModel([
+            ("ID Résa", lambda r: f"RES-{r.get('id', '')}"),
+            ("Client", lambda r: r.get("client", "N/A")),
+            ("Chambre", lambda r: r.get("chambre", "?")),
+            ("Arrivée", lambda r: r.get("date_arrivee", "")),
+            ("Départ Prévu", lambda r: r.get("date_depart", "")),
+            ("Actions", lambda r: ""),
+        ], self)
+        self.table = RowTableView(self.table_model)
+        actions_delegate = ActionButtonsDelegate(
+            lambda r: [("checkout", "Check-out", "Afficher la facture et faire le check-out"),
+                       ("paiement", "Paiement", "Enregistrer un paiement")], self.table)
+        actions_delegate.clicked.connect(self.executer_action)
+        self.table.setItemDelegateForColumn(5, actions_delegate)
         layout.addWidget(self.table)
 
     def charger_departures(self):
-        self.table.setRowCount(0)
-        try:
-            today_str = date.today().strftime("%Y-%m-%d")
-            filtre = {"statuts": ["check-in"], "date_depart": today_str}
-            resp = self.reservation_controller.list_reservations(filtre=filtre)
+        today_str = date.today().strftime("%Y-%m-%d")
+        filtre = {"statuts": ["check-in"], "date_depart": today_str}
+        self.loader.load(self.reservation_controller.list_reservations, filtre=filtre,
+                         on_result=self.afficher_departures)
 
+    def afficher_departures(self, resp):
+        try:
             if not resp.get("success", False):
                 QMessageBox.warning(self, "Erreur", resp.get("error", "Erreur inconnue"))
                 return
-
-            reservations = resp.get("data", [])
-            for row, r in enumerate(reservations):
-                self.table.insertRow(row)
-                self.table.setItem(row, 0, QTableWidgetItem(f"RES-{r.get('id', '')}"))
-                self.table.setItem(row, 1, QTableWidgetItem(r.get("client", "N/A")))
-                self.table.setItem(row, 2, QTableWidgetItem(r.get("chambre", "?")))
-                self.table.setItem(row, 3, QTableWidgetItem(r.get("date_arrivee", "")))
-                self.table.setItem(row, 4, QTableWidgetItem(r.get("date_depart", "")))
-
-                btn_checkout = QPushButton("Check-out")
-                btn_checkout.clicked.connect(lambda _, rid=r["id"]: self.afficher_details_checkout(rid))
-
-                btn_payer = QPushButton("Paiement")
-                btn_payer.clicked.connect(lambda _, rid=r["id"]: self.ouvrir_page_paiement(rid))
-
-                hbox = QHBoxLayout()
-                hbox.setContentsMargins(0, 0, 0, 0)
-                hbox.addWidget(btn_checkout)
-                hbox.addWidget(btn_payer)
-
-                cell_widget = QWidget()
-                cell_widget.setLayout(hbox)
-                self.table.setCellWidget(row, 5, cell_widget)
+            self.table_model.set_rows(resp.get("data", []))
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Chargement échoué : {e}")
 
+    def executer_action(self, action, reservation):
+        if action == "checkout":
+            self.afficher_details_checkout(reservation["id"])
+        elif action == "paiement":
+            self.ouvrir_page_paiement(reservation["id"])
+
     # --- SUPPRESSION : La méthode _calculer_totaux est redondante et incorrecte. On la supprime. ---
     # def _calculer_totaux(self, reservation_id):
     #     ...
@@ -222,8 +217,8 @@ class DeparturesPage(QWidget):
 
     def rechercher(self):
         terme = self.search_input.text().lower()
-        for row in range(self.table.rowCount()):
-            client = self.table.item(row, 1).text().lower()
-            chambre = self.table.item(row, 2).text().lower()
-            visible = terme in client or terme in chambre
-            self.table.setRowHidden(row, not visible)
+        if not terme:
+            self.table_model.set_filter(None)
+            return
+        self.table_model.set_filter(
+            lambda r: terme in (r.get("client") or "").lower() or terme in str(r.get("chambre") or "").lower())
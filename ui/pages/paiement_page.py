@@ -105,6 +105,7 @@ class PaiementPage(QWidget):
         """
         try:
             # 1. Le contrôleur calcule, met à jour la facture ET retourne les détails
+            #    (sans rien recalculer si la facture n'a pas changé depuis la dernière ouverture)
             calc_resp = FactureController.generer_et_mettre_a_jour_facture(self.reservation_id)
             if not calc_resp.get("success"):
                 raise Exception(calc_resp.get("error", "Erreur lors du calcul de la facture."))
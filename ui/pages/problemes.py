@@ -8,6 +8,7 @@ from PySide6.QtCore import Qt
 from controllers.probleme_controller import ProblemeController
 # --- MODIFICATION : Import du contrôleur des chambres ---
 from controllers.chambre_controller import ChambreController
+from ui.async_loader import AsyncLoader
 
 
 # --- Boîte de dialogue pour signaler un nouveau problème (AMÉLIORÉE) ---
@@ -85,6 +86,7 @@ class NouveauProblemeDialog(QDialog):
 class ProblemesPage(QWidget):
     def __init__(self):
         super().__init__()
+        self.loader = AsyncLoader(self)
         main_layout = QVBoxLayout(self)
         self.setLayout(main_layout)
 
@@ -103,6 +105,7 @@ class ProblemesPage(QWidget):
         self.table_problemes.setSelectionBehavior(QTableWidget.SelectRows)
         self.table_problemes.setColumnHidden(0, True)
         main_layout.addWidget(self.table_problemes)
+        self.loader.show_loading_on(self.table_problemes)
 
         buttons_layout = QHBoxLayout()
         btn_signaler = QPushButton("➕ Signaler un problème")
@@ -122,8 +125,10 @@ class ProblemesPage(QWidget):
         self.charger_problemes()
 
     def charger_problemes(self):
-        """Charge ou recharge les données des problèmes dans le tableau."""
-        result = ProblemeController.liste_problemes()
+        """Charge ou recharge en arrière-plan les données des problèmes dans le tableau."""
+        self.loader.load(ProblemeController.liste_problemes, on_result=self.afficher_problemes)
+
+    def afficher_problemes(self, result):
         if result["success"]:
             problemes = result["data"]
             self.table_problemes.setRowCount(len(problemes))
@@ -9,6 +9,7 @@ from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
 
 from controllers.produit_controller import ProduitController
+from ui.async_loader import AsyncLoader
 
 # Catégories définies dans le schéma de la base de données
 CATEGORIES_PRODUITS = ['Boisson chaude', 'Boisson fraîche', 'Alcool', 'Entrée', 'Plat', 'Dessert', 'Snack']
@@ -21,6 +22,7 @@ class ProduitsPage(QWidget):
 
     def __init__(self, user_id=None):
         super().__init__()
+        self.loader = AsyncLoader(self)
         self.user_id = user_id
         self.init_ui()
         self.load_produits()
@@ -58,11 +60,14 @@ class ProduitsPage(QWidget):
         self.table.setEditTriggers(QTableWidget.NoEditTriggers)
         self.table.setSelectionBehavior(QTableWidget.SelectRows)
         layout.addWidget(self.table)
+        self.loader.show_loading_on(self.table)
 
     def load_produits(self):
-        """Charge tous les produits depuis la base de données et remplit le tableau."""
+        """Charge en arrière-plan tous les produits depuis la base de données, puis remplit le tableau."""
+        self.loader.load(ProduitController.liste_produits, on_result=self.afficher_produits)
+
+    def afficher_produits(self, result):
         self.table.setRowCount(0)
-        result = ProduitController.liste_produits()
 
         if not result.get("success"):
             QMessageBox.warning(self, "Erreur", result.get("error", "Impossible de charger les produits."))
@@ -1,15 +1,18 @@
-from collections import defaultdict
+from functools import partial
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout,
     QComboBox, QDateEdit, QPushButton, QMessageBox,
-    QLineEdit, QFormLayout, QGroupBox, QCheckBox, QTableWidget, QHeaderView, QAbstractItemView, QTableWidgetItem,
+    QLineEdit, QFormLayout, QGroupBox, QCheckBox,
     QDialog, QSpinBox
 )
-from PySide6.QtCore import QDate, Qt
+from PySide6.QtCore import QDate, QTimer
 from PySide6.QtGui import QFont
 from controllers.reservation_controller import ReservationController
 from controllers.client_controller import ClientController
 from models.chambre_model import ChambreModel
+from ui.async_loader import AsyncLoader
+from ui.table_model import ActionButtonsDelegate, RowTableModel, RowTableView, ligne_titre
 
 
 class ReservationsPage(QWidget):
@@ -20,6 +23,7 @@ class ReservationsPage(QWidget):
         self.reservation_controller = ReservationController(user_id)
         # Le modèle de chambre est seulement nécessaire pour le dialogue de création/modification
         self.chambre_model = ChambreModel()
+        self.loader = AsyncLoader(self)
 
         self.layout = QVBoxLayout(self)
         self.setLayout(self.layout)
@@ -41,18 +45,34 @@ class ReservationsPage(QWidget):
         search_label = QLabel("🔍 Rechercher :")
         self.input_search = QLineEdit()
         self.input_search.setPlaceholderText("Nom client, n° chambre, statut...")
-        self.input_search.textChanged.connect(self.refresh_table)
+        # La recherche est faite en base : on attend la fin de la frappe avant de relancer la lecture
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.refresh_table)
+        self.input_search.textChanged.connect(self.search_timer.start)
         action_layout.addWidget(search_label)
         action_layout.addWidget(self.input_search)
         self.layout.addLayout(action_layout)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["ID", "Client", "Chambre", "Arrivée", "Départ", "Statut", "Actions"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_model = RowTableModel([
+            ("ID", lambda r: f"RES-{r['id']}"),
+            ("Client", lambda r: r.get('client', 'N/A')),
+            ("Chambre", lambda r: r.get('chambre', '?')),
+            ("Arrivée", lambda r: r.get('date_arrivee')),
+            ("Départ", lambda r: r.get('date_depart')),
+            ("Statut", lambda r: r.get("statut", "inconnu").capitalize()),
+            ("Actions", lambda r: ""),
+        ], self)
+        self.table_model.fetch_failed.connect(
+            lambda message: QMessageBox.warning(self, "Erreur", message))
+        self.table = RowTableView(self.table_model)
+        actions_delegate = ActionButtonsDelegate(self.actions_reservation, self.table)
+        actions_delegate.clicked.connect(self.executer_action)
+        self.table.setItemDelegateForColumn(6, actions_delegate)
         self.layout.addWidget(self.table)
+        # Le voile ne couvre que la lecture de la première page, pas celles chargées en défilant
+        self.loader.show_loading_on(self.table, channel="page")
 
         self.refresh_table()
 
@@ -64,96 +84,50 @@ class ReservationsPage(QWidget):
 
     def refresh_table(self):
         """
-        Méthode ENTIÈREMENT RÉVISÉE pour être plus efficace et lisible.
+        Relit les réservations en base, page par page (pagination par clé) : la première page est lue
+        en arrière-plan, les suivantes au fil du défilement. La recherche en cours est appliquée en SQL.
         """
-        try:
-            # 1. UN SEUL APPEL pour récupérer toutes les données nécessaires
-            response = self.reservation_controller.list_reservations()
-            if not response.get("success"):
-                QMessageBox.warning(self, "Erreur", response.get("error", "Erreur inconnue"))
-                return
-
-            all_reservations = response.get("data", [])
-
-            # 2. FILTRAGE (recherche) sur les données déjà en mémoire
-            search_text = self.input_search.text().lower().strip()
-            if search_text:
-                reservations_to_display = [
-                    r for r in all_reservations
-                    if search_text in r.get("client", "").lower()
-                       or search_text in r.get("chambre", "").lower()
-                       or search_text in r.get("statut", "").lower()
-                       or search_text in r.get("date_arrivee", "")
-                       or search_text in f"res-{r.get('id', '')}"
-                ]
-            else:
-                reservations_to_display = all_reservations
-
-            # 3. TRI et GROUPEMENT des données filtrées
-            reservations_to_display.sort(key=lambda r: r["date_arrivee"], reverse=True)
-            grouped = defaultdict(list)
-            for r in reservations_to_display:
-                grouped[r["date_arrivee"]].append(r)
-
-            # 4. AFFICHAGE sans aucun appel supplémentaire à la base de données
-            self.table.setRowCount(0)  # On vide la table avant de la remplir
-            total_rows = len(reservations_to_display) + len(grouped)
-            self.table.setRowCount(total_rows)
-
-            current_row = 0
-            for date_str, group in grouped.items():
-                # Ligne de titre pour la date
-                title_item = QTableWidgetItem(f"📅 Arrivées du {date_str}")
-                title_item.setFlags(Qt.ItemIsEnabled)
-                title_item.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                title_item.setBackground(Qt.lightGray)
-                self.table.setSpan(current_row, 0, 1, self.table.columnCount())
-                self.table.setItem(current_row, 0, title_item)
-                current_row += 1
-
-                # Lignes pour chaque réservation de ce groupe
-                for r in group:
-                    # On utilise directement les champs fournis par le modèle
-                    self.table.setItem(current_row, 0, QTableWidgetItem(f"RES-{r['id']}"))
-                    self.table.setItem(current_row, 1, QTableWidgetItem(r.get('client', 'N/A')))
-                    self.table.setItem(current_row, 2, QTableWidgetItem(r.get('chambre', '?')))
-                    self.table.setItem(current_row, 3, QTableWidgetItem(r.get('date_arrivee')))
-                    self.table.setItem(current_row, 4, QTableWidgetItem(r.get('date_depart')))
-
-                    statut = r.get("statut", "inconnu")
-                    self.table.setItem(current_row, 5, QTableWidgetItem(statut.capitalize()))
-
-                    # Création des boutons d'action
-                    self.create_action_buttons(current_row, r['id'], statut)
-                    current_row += 1
-
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur Critique",
-                                 f"Une erreur est survenue lors du chargement des réservations : {e}")
-
-    def create_action_buttons(self, row, reservation_id, statut):
-        """Crée et place les boutons d'action dans une cellule de la table."""
-        cell_widget = QWidget()
-        h_layout = QHBoxLayout(cell_widget)
-        h_layout.setContentsMargins(5, 0, 5, 0)
-        h_layout.setSpacing(5)
+        recherche = self.input_search.text().strip()
+        self.table_model.set_fetcher(partial(self.charger_page, recherche=recherche), self.loader)
 
+    def charger_page(self, after, recherche=""):
+        """
+        Lit une page de réservations (dans le thread du chargeur) et la groupe par date d'arrivée.
+        Retourne (lignes, clé de la page suivante) ; une ligne de titre précède chaque nouvelle date,
+        y compris d'une page à l'autre (la clé `after` porte la date de la dernière ligne affichée).
+        """
+        response = self.reservation_controller.list_reservations_page(
+            after, filtre={"recherche": recherche} if recherche else None)
+        if not response.get("success"):
+            raise Exception(response.get("error", "Erreur inconnue"))
+
+        rows = []
+        date_precedente = after[0] if after else None
+        for r in response.get("data", []):
+            if r["date_arrivee"] != date_precedente:
+                rows.append(ligne_titre(f"📅 Arrivées du {r['date_arrivee']}"))
+                date_precedente = r["date_arrivee"]
+            rows.append(r)
+        return rows, response.get("next")
+
+    @staticmethod
+    def actions_reservation(reservation):
+        """Boutons d'action d'une réservation selon son statut (peints par ActionButtonsDelegate)."""
+        statut = reservation.get("statut", "inconnu")
+        actions = []
         # Bouton Modifier (toujours visible sauf si annulée)
         if statut != "annulée" and statut != "check-out":
-            btn_modifier = QPushButton("📝")
-            btn_modifier.setToolTip("Modifier la réservation")
-            btn_modifier.clicked.connect(lambda _, rid=reservation_id: self.modifier_reservation(rid))
-            h_layout.addWidget(btn_modifier)
-
+            actions.append(("modifier", "📝", "Modifier la réservation"))
         # Bouton Annuler (visible seulement si 'réservée')
         if statut == "réservée":
-            btn_annuler = QPushButton("❌")
-            btn_annuler.setToolTip("Annuler la réservation")
-            btn_annuler.clicked.connect(lambda _, rid=reservation_id: self.annuler_reservation(rid))
-            h_layout.addWidget(btn_annuler)
+            actions.append(("annuler", "❌", "Annuler la réservation"))
+        return actions
 
-        h_layout.addStretch()
-        self.table.setCellWidget(row, 6, cell_widget)
+    def executer_action(self, action, reservation):
+        if action == "modifier":
+            self.modifier_reservation(reservation["id"])
+        elif action == "annuler":
+            self.annuler_reservation(reservation["id"])
 
     def modifier_reservation(self, reservation_id):
         # La logique de modification est complexe, la garder ici est acceptable
@@ -171,14 +145,7 @@ class ReservationsPage(QWidget):
             current_arrivee = QDate.fromString(data["date_arrivee"], "yyyy-MM-dd")
             current_depart = QDate.fromString(data["date_depart"], "yyyy-MM-dd")
 
-            chambres_libres = [
-                ch for ch in self.chambre_model.get_all()
-                if ch["statut"] == "libre" or ch["id"] == current_chambre_id
-            ]
-
-            if not chambres_libres:
-                QMessageBox.information(self, "Info", "Aucune chambre disponible pour modification.")
-                return
+            chambre_courante = self.chambre_model.get_by_id(current_chambre_id)
 
             dialog = QDialog(self)
             dialog.setWindowTitle(f"Modifier réservation #{reservation_id}")
@@ -187,11 +154,6 @@ class ReservationsPage(QWidget):
             # ... (le reste du code de la boîte de dialogue de modification est correct)
             layout.addWidget(QLabel("Chambre :"))
             combo_chambres = QComboBox()
-            id_to_index = {}
-            for i, ch in enumerate(chambres_libres):
-                combo_chambres.addItem(f"{ch['numero']} - {ch['prix_par_nuit']} FCFA/nuit", ch["id"])
-                id_to_index[ch["id"]] = i
-            combo_chambres.setCurrentIndex(id_to_index.get(current_chambre_id, 0))
             layout.addWidget(combo_chambres)
 
             layout.addWidget(QLabel("Date d'arrivée :"))
@@ -204,6 +166,35 @@ class ReservationsPage(QWidget):
             date_depart_edit.setCalendarPopup(True)
             layout.addWidget(date_depart_edit)
 
+            def charger_chambres():
+                # Chambres libres sur les dates choisies, plus la chambre actuelle de la réservation
+                # (sa propre réservation l'exclut de la recherche) ; la validation revérifie les conflits.
+                selection = combo_chambres.currentData() or current_chambre_id
+                arrivee = date_arrivee_edit.date()
+                depart = max(date_depart_edit.date(), arrivee.addDays(1))
+                try:
+                    chambres = self.chambre_model.get_chambres_disponibles(
+                        arrivee.toString("yyyy-MM-dd"), depart.toString("yyyy-MM-dd"))
+                except Exception as e:
+                    QMessageBox.warning(dialog, "Erreur", f"Erreur chargement chambres : {e}")
+                    return
+                if chambre_courante and all(ch["id"] != current_chambre_id for ch in chambres):
+                    chambres.insert(0, chambre_courante)
+
+                combo_chambres.blockSignals(True)
+                combo_chambres.clear()
+                for ch in chambres:
+                    combo_chambres.addItem(f"{ch['numero']} - {ch['prix_par_nuit']} FCFA/nuit", ch["id"])
+                combo_chambres.setCurrentIndex(max(combo_chambres.findData(selection), 0))
+                combo_chambres.blockSignals(False)
+
+            charger_chambres()
+            if combo_chambres.count() == 0:
+                QMessageBox.information(self, "Info", "Aucune chambre disponible pour modification.")
+                return
+            date_arrivee_edit.dateChanged.connect(charger_chambres)
+            date_depart_edit.dateChanged.connect(charger_chambres)
+
             btn_layout = QHBoxLayout()
             btn_valider = QPushButton("Valider")
             btn_annuler = QPushButton("Annuler")
@@ -324,7 +315,6 @@ class ReservationFormDialog(QDialog):
         form_layout = QFormLayout()  # Utilisation d'un QFormLayout pour un meilleur alignement
 
         self.combo_chambres = QComboBox()
-        self.load_chambres()
         form_layout.addRow("Chambre :", self.combo_chambres)
 
         self.date_arrivee = QDateEdit(QDate.currentDate())
@@ -334,6 +324,8 @@ class ReservationFormDialog(QDialog):
         self.date_depart = QDateEdit(QDate.currentDate().addDays(1))
         self.date_depart.setCalendarPopup(True)
         form_layout.addRow("Date de départ :", self.date_depart)
+        # Les chambres proposées dépendent des dates choisies
+        self.load_chambres()
 
         # --- AJOUT : Champs pour adultes et enfants ---
         self.spin_adultes = QSpinBox()
@@ -359,6 +351,8 @@ class ReservationFormDialog(QDialog):
         layout.addLayout(prix_layout)
 
         self.combo_chambres.currentIndexChanged.connect(self.update_prix)
+        self.date_arrivee.dateChanged.connect(self.load_chambres)
+        self.date_depart.dateChanged.connect(self.load_chambres)
         self.date_arrivee.dateChanged.connect(self.update_prix)
         self.date_depart.dateChanged.connect(self.update_prix)
 
@@ -394,14 +388,27 @@ class ReservationFormDialog(QDialog):
 
 
     def load_chambres(self):
+        """Propose les chambres libres sur la période choisie (une seule requête indexée)."""
+        chambre_courante = self.combo_chambres.currentData()
+        date_arrivee_qdate = self.date_arrivee.date()
+        # Une réservation compte au moins une nuit, même si les deux dates sont identiques
+        date_depart_qdate = max(self.date_depart.date(), date_arrivee_qdate.addDays(1))
+
+        self.combo_chambres.blockSignals(True)
         self.combo_chambres.clear()
         try:
-            for chambre in self.chambre_model.get_all():
-                if chambre['statut'] == 'libre':
-                    self.combo_chambres.addItem(f"N° {chambre['numero']} - {chambre['prix_par_nuit']} FCFA/nuit",
-                                                chambre['id'])
+            chambres = self.chambre_model.get_chambres_disponibles(
+                date_arrivee_qdate.toString("yyyy-MM-dd"), date_depart_qdate.toString("yyyy-MM-dd"))
+            for chambre in chambres:
+                self.combo_chambres.addItem(f"N° {chambre['numero']} - {chambre['prix_par_nuit']} FCFA/nuit",
+                                            chambre['id'])
+            index = self.combo_chambres.findData(chambre_courante)
+            if index >= 0:
+                self.combo_chambres.setCurrentIndex(index)
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Erreur chargement chambres : {e}")
+        finally:
+            self.combo_chambres.blockSignals(False)
 
     def update_prix(self):
         chambre_id = self.combo_chambres.currentData()
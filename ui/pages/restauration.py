@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QTableWidget,
-    QTableWidgetItem, QHeaderView, QHBoxLayout, QMessageBox, QDialog,
+    QWidget, QVBoxLayout, QLabel, QPushButton,
+    QHBoxLayout, QMessageBox, QDialog,
     QFormLayout, QComboBox, QSpinBox
 )
 from PySide6.QtGui import QFont
@@ -9,13 +9,17 @@ from controllers.commande_controller import CommandeController
 from controllers.commande_item_controller import CommandeItemController
 from controllers.produit_controller import ProduitController
 from controllers.reservation_controller import ReservationController
+from ui.async_loader import AsyncLoader
+from ui.table_model import ActionButtonsDelegate, RowTableModel, RowTableView
 
 
 class RestaurationPage(QWidget):
     def __init__(self, user_id=None):
         super().__init__()
         self.user_id = user_id
+        self.loader = AsyncLoader(self)
         self.init_ui()
+        self.loader.show_loading_on(self.table)
         self.load_commandes()
 
     def init_ui(self):
@@ -37,42 +41,33 @@ class RestaurationPage(QWidget):
         layout.addLayout(action_layout)
 
         # Tableau des commandes
-        self.table = QTableWidget()
         # --- MODIFICATION : Ajout de la colonne Statut ---
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(
-            ["Client", "Chambre", "Plat/Produit", "Qté", "Prix Total", "Statut", "Actions"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setColumnWidth(3, 60)  # Quantité
-        self.table.setColumnWidth(6, 200)  # Actions (plus large)
+        self.table_model = RowTableModel([
+            ("Client", lambda item: item.get("client_nom", "N/A")),
+            ("Chambre", lambda item: item.get("chambre_numero", "?")),
+            ("Plat/Produit", lambda item: item.get("produit_nom", "Inconnu")),
+            ("Qté", lambda item: item.get("quantite", 0)),
+            ("Prix Total", lambda item: f"{item.get('quantite', 0) * item.get('prix_unitaire_capture', 0):,.0f} FCFA"),
+            ("Statut", lambda item: item.get("commande_statut", "Inconnu")),
+            # Texte affiché quand la commande n'a plus d'action possible
+            ("Actions", lambda item: f"Commande {item.get('commande_statut')}"),
+        ], self)
+        self.table = RowTableView(self.table_model)
+        actions_delegate = ActionButtonsDelegate(self.actions_commande, self.table)
+        actions_delegate.clicked.connect(self.executer_action)
+        self.table.setItemDelegateForColumn(6, actions_delegate)
         layout.addWidget(self.table)
 
     def load_commandes(self):
-        """Charge les articles des commandes du restaurant depuis la base de données."""
-        self.table.setRowCount(0)
-        result = CommandeItemController.liste_items_details_par_lieu("Restaurant")
+        """Charge en arrière-plan les articles des commandes du restaurant depuis la base de données."""
+        self.loader.load(CommandeItemController.liste_items_details_par_lieu, "Restaurant",
+                         on_result=self.afficher_commandes)
 
+    def afficher_commandes(self, result):
         if not result.get("success"):
             QMessageBox.warning(self, "Erreur", result.get("error", "Impossible de charger les commandes."))
             return
-
-        commandes = result.get("data", [])
-        for row, item in enumerate(commandes):
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(item.get("client_nom", "N/A")))
-            self.table.setItem(row, 1, QTableWidgetItem(item.get("chambre_numero", "?")))
-            self.table.setItem(row, 2, QTableWidgetItem(item.get("produit_nom", "Inconnu")))
-            self.table.setItem(row, 3, QTableWidgetItem(str(item.get("quantite", 0))))
-
-            total = item.get("quantite", 0) * item.get("prix_unitaire_capture", 0)
-            self.table.setItem(row, 4, QTableWidgetItem(f"{total:,.0f} FCFA"))
-
-            # --- MODIFICATION : Affichage du statut de la commande ---
-            statut = item.get("commande_statut", "Inconnu")
-            self.table.setItem(row, 5, QTableWidgetItem(statut))
-
-            # --- MODIFICATION : Création des boutons d'action dynamiques ---
-            self.create_action_buttons(row, item)
+        self.table_model.set_rows(result.get("data", []))
 
     def ajouter_commande(self):
         """Ouvre une boîte de dialogue pour ajouter une nouvelle commande."""
@@ -80,41 +75,25 @@ class RestaurationPage(QWidget):
         if dialog.exec():
             self.load_commandes()
 
-    # --- NOUVEAU : Méthode pour créer les boutons d'action en fonction du statut ---
-    def create_action_buttons(self, row, item):
+    # --- Boutons d'action en fonction du statut (peints par ActionButtonsDelegate) ---
+    @staticmethod
+    def actions_commande(item):
         statut = item.get("commande_statut")
-        commande_id = item.get("commande_id")
-        item_id = item.get("item_id")
-
-        cell_widget = QWidget()
-        h_layout = QHBoxLayout(cell_widget)
-        h_layout.setContentsMargins(5, 0, 5, 0)
-        h_layout.setSpacing(5)
-
         if statut == 'Commandé':
-            btn_cuisine = QPushButton("👨‍🍳 En Cuisine")
-            btn_cuisine.clicked.connect(lambda _, cid=commande_id: self.changer_statut_commande(cid, "En cuisine"))
-            h_layout.addWidget(btn_cuisine)
-
-            btn_annuler_item = QPushButton("❌")
-            btn_annuler_item.setToolTip("Annuler cet article de la commande")
-            btn_annuler_item.clicked.connect(lambda _, iid=item_id: self.supprimer_item(iid))
-            h_layout.addWidget(btn_annuler_item)
-
-
-        elif statut == 'En cuisine':
-            btn_recu = QPushButton("✅ Livré")
-            btn_recu.clicked.connect(lambda _, cid=commande_id: self.changer_statut_commande(cid, "Livré"))
-            h_layout.addWidget(btn_recu)
-
+            return [("cuisine", "👨‍🍳 En Cuisine", "Envoyer la commande en cuisine"),
+                    ("supprimer", "❌", "Annuler cet article de la commande")]
+        if statut == 'En cuisine':
+            return [("livre", "✅ Livré", "Marquer la commande comme livrée")]
         # Si le statut est 'Livré' ou 'Annulé', on ne met aucun bouton.
-        else:
-            label_final = QLabel(f"Commande {statut}")
-            label_final.setFont(QFont("Segoe UI", 9, italic=True))
-            h_layout.addWidget(label_final)
-
-        h_layout.addStretch()
-        self.table.setCellWidget(row, 6, cell_widget)
+        return []
+
+    def executer_action(self, action, item):
+        if action == "cuisine":
+            self.changer_statut_commande(item.get("commande_id"), "En cuisine")
+        elif action == "livre":
+            self.changer_statut_commande(item.get("commande_id"), "Livré")
+        elif action == "supprimer":
+            self.supprimer_item(item.get("item_id"))
 
     # --- NOUVEAU : Méthode pour gérer le changement de statut ---
     def changer_statut_commande(self, commande_id, nouveau_statut):
@@ -8,11 +8,13 @@ from PySide6.QtCore import Qt
 
 from controllers.chambre_controller import ChambreController
 from models.types_chambre_model import TypesChambreModel
+from ui.async_loader import AsyncLoader
 
 
 class RoomsPage(QWidget):
     def __init__(self):
         super().__init__()
+        self.loader = AsyncLoader(self)
         self.setStyleSheet("""
             QGroupBox {
                 border: 1px solid #cccccc;
@@ -75,6 +77,7 @@ class RoomsPage(QWidget):
         self.table.setHorizontalHeaderLabels(["Numéro", "Type", "Statut", "Actions"])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.layout.addWidget(self.table)
+        self.loader.show_loading_on(self.table)
 
         self.load_data()
 
@@ -84,8 +87,10 @@ class RoomsPage(QWidget):
         self.btn_add.setText("Fermer le formulaire" if not visible else "Ajouter une chambre")
 
     def load_data(self):
+        self.loader.load(ChambreController.get_all_chambres, on_result=self.afficher_chambres)
+
+    def afficher_chambres(self, result):
         self.table.setRowCount(0)
-        result = ChambreController.get_all_chambres()
         if not result["success"]:
             QMessageBox.warning(self, "Erreur", result["error"])
             return
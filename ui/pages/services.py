@@ -10,12 +10,16 @@ from controllers.reservation_controller import ReservationController
 # Importer les contrôleurs
 from controllers.service_demande_controller import ServiceDemandeController
 from controllers.service_disponible_controller import ServiceDisponibleController
+from ui.async_loader import AsyncLoader
 
 
 class ServicesPage(QWidget):
     def __init__(self, current_user_role: str):
         super().__init__()
         self.current_user_role = current_user_role
+        # Un chargeur par onglet : chacun a son propre état « Chargement… »
+        self.loader_demandes = AsyncLoader(self)
+        self.loader_catalogue = AsyncLoader(self)
 
         # Layout principal
         main_layout = QVBoxLayout(self)
@@ -55,6 +59,7 @@ class ServicesPage(QWidget):
         self.table_demandes.setEditTriggers(QTableWidget.NoEditTriggers)
         self.table_demandes.setSelectionBehavior(QTableWidget.SelectRows)
         layout.addWidget(self.table_demandes)
+        self.loader_demandes.show_loading_on(self.table_demandes)
 
         # Boutons d'action
         buttons_layout = QHBoxLayout()
@@ -94,6 +99,7 @@ class ServicesPage(QWidget):
         self.table_catalogue.setEditTriggers(QTableWidget.NoEditTriggers)
         self.table_catalogue.setSelectionBehavior(QTableWidget.SelectRows)
         layout.addWidget(self.table_catalogue)
+        self.loader_catalogue.show_loading_on(self.table_catalogue)
 
         # Boutons d'action
         buttons_layout = QHBoxLayout()
@@ -119,7 +125,10 @@ class ServicesPage(QWidget):
     def charger_donnees_demandes(self):
         # Pour avoir le nom du service, il faudrait modifier le modèle ServiceDemandeModel
         # pour y inclure une jointure avec services_disponibles.
-        result = ServiceDemandeController.lister_toutes_les_demandes()
+        self.loader_demandes.load(ServiceDemandeController.lister_toutes_les_demandes,
+                                  on_result=self.afficher_demandes)
+
+    def afficher_demandes(self, result):
         if result["success"]:
             demandes = result["data"]
             self.table_demandes.setRowCount(len(demandes))
@@ -195,7 +204,9 @@ class ServicesPage(QWidget):
 
     def charger_donnees_catalogue(self):
         if not hasattr(self, 'table_catalogue'): return
-        result = ServiceDisponibleController.lister_services()
+        self.loader_catalogue.load(ServiceDisponibleController.lister_services, on_result=self.afficher_catalogue)
+
+    def afficher_catalogue(self, result):
         if result["success"]:
             services = result["data"]
             self.table_catalogue.setRowCount(len(services))
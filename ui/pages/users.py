@@ -7,6 +7,7 @@ from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
 
 from controllers.user_controller import UserController
+from ui.async_loader import AsyncLoader
 
 
 class EditUserDialog(QDialog):
@@ -52,6 +53,7 @@ class EditUserDialog(QDialog):
 class UsersPage(QWidget):
     def __init__(self):
         super().__init__()
+        self.loader = AsyncLoader(self)
         self.setStyleSheet("QLabel { color: #2c3e70; }")
         self.layout = QVBoxLayout(self)
         self.setLayout(self.layout)
@@ -69,12 +71,15 @@ class UsersPage(QWidget):
         self.table.setHorizontalHeaderLabels(["Nom complet", "Nom d’utilisateur", "Rôle", "Actif", "Modifier", "Supprimer"])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.layout.addWidget(self.table)
+        self.loader.show_loading_on(self.table)
 
         self.load_users()
 
     def load_users(self):
+        self.loader.load(UserController.get_all_users, on_result=self.afficher_users)
+
+    def afficher_users(self, result):
         self.table.setRowCount(0)
-        result = UserController.get_all_users()
         if not result["success"]:
             QMessageBox.warning(self, "Erreur", result.get("error", "Erreur inconnue"))
             return
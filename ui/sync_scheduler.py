@@ -0,0 +1,143 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/ui/sync_scheduler.py
+import time
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+
+class SyncWorker(QObject):
+    """Worker qui exécute la tâche de synchronisation dans un thread séparé."""
+    finished = Signal(dict)
+    progress = Signal(str)
+
+    def __init__(self, sync_service):
+        super().__init__()
+        self.sync_service = sync_service
+
+    def run(self):
+        """Lance la synchronisation et émet un signal quand c'est terminé."""
+        result = self.sync_service.synchronize(progress=self.progress.emit)
+        self.finished.emit(result)
+
+
+class SyncScheduler(QObject):
+    """
+    Planifie les synchronisations au lieu d'un minuteur fixe :
+    - jamais deux synchros en même temps : une demande pendant une synchro est reportée à sa fin ;
+    - peu après une écriture locale (détectée via l'outbox), avec un délai d'attente (debounce)
+      qui regroupe les écritures rapprochées, sans dépasser MAX_DEBOUNCE ;
+    - au repos, l'intervalle double à chaque synchro sans changement, jusqu'à MAX_INTERVAL ;
+    - en cas d'erreur réseau, nouvel essai avec un délai qui double à chaque échec.
+    """
+    started = Signal()
+    progress = Signal(str)
+    finished = Signal(dict)
+
+    POLL_INTERVAL = 5           # s, lecture du marqueur de l'outbox
+    DEBOUNCE = 3                # s après la dernière écriture locale
+    MAX_DEBOUNCE = 30           # s au plus après la première écriture non synchronisée
+    MIN_INTERVAL = 60           # s entre deux synchros quand il y a de l'activité
+    MAX_INTERVAL = 15 * 60      # s entre deux synchros au repos
+    RETRY_INTERVAL = 30         # s avant le premier nouvel essai après une erreur
+
+    def __init__(self, sync_service, parent=None):
+        super().__init__(parent)
+        self.sync_service = sync_service
+        self.running = False
+        self.pending = False
+        self.idle_interval = self.MIN_INTERVAL
+        self.failures = 0
+        self.first_change_at = None
+        self.thread = None
+        self.worker = None
+
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.timeout.connect(self._start_sync)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self._poll_local_changes)
+        self.last_marker = None
+
+    def start(self):
+        """Première synchro immédiate, puis surveillance des écritures locales."""
+        self.last_marker = self._read_marker()
+        self.poll_timer.start(self.POLL_INTERVAL * 1000)
+        self.request_sync()
+
+    def stop(self):
+        self.poll_timer.stop()
+        self.sync_timer.stop()
+
+    def request_sync(self, delay=0):
+        """Demande une synchro dans `delay` secondes (la plus proche des demandes l'emporte)."""
+        if self.running:
+            self.pending = True
+            return
+        remaining = self.sync_timer.remainingTime() / 1000 if self.sync_timer.isActive() else None
+        if remaining is None or delay < remaining:
+            self.sync_timer.start(int(delay * 1000))
+
+    def _read_marker(self):
+        try:
+            return self.sync_service.local_change_marker()
+        except Exception:
+            return None
+
+    def _poll_local_changes(self):
+        marker = self._read_marker()
+        if marker is None or marker == self.last_marker:
+            return
+        self.last_marker = marker
+        if self.failures:
+            # Le serveur est injoignable : on laisse courir le délai de nouvel essai.
+            return
+
+        now = time.monotonic()
+        if self.first_change_at is None:
+            self.first_change_at = now
+        # Debounce : chaque écriture repousse la synchro, dans la limite de MAX_DEBOUNCE.
+        delay = min(self.DEBOUNCE, max(0, self.first_change_at + self.MAX_DEBOUNCE - now))
+        if self.running:
+            self.pending = True
+        else:
+            self.sync_timer.start(int(delay * 1000))
+
+    def _start_sync(self):
+        if self.running:
+            self.pending = True
+            return
+        self.running = True
+        self.pending = False
+        self.first_change_at = None
+        self.started.emit()
+
+        self.thread = QThread()
+        self.worker = SyncWorker(self.sync_service)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.progress)
+        self.worker.finished.connect(self._on_sync_finished)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.thread.start()
+
+    def _on_sync_finished(self, result):
+        # Les écritures de la synchro elle-même ne font pas bouger le marqueur de l'outbox
+        # (sync_down n'y inscrit rien, sync_up ne fait qu'en supprimer).
+        self.running = False
+
+        if not result.get("success") or result.get("failed_tables"):
+            self.failures += 1
+            delay = min(self.RETRY_INTERVAL * 2 ** (self.failures - 1), self.MAX_INTERVAL)
+        else:
+            self.failures = 0
+            if result.get("sent") or result.get("received"):
+                self.idle_interval = self.MIN_INTERVAL
+            else:
+                self.idle_interval = min(self.idle_interval * 2, self.MAX_INTERVAL)
+            delay = self.DEBOUNCE if self.pending else self.idle_interval
+
+        self.pending = False
+        self.sync_timer.start(int(delay * 1000))
+        self.finished.emit(result)
@@ -0,0 +1,296 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/ui/table_model.py
+from PySide6.QtCore import QAbstractTableModel, QEvent, QModelIndex, QRect, Qt, Signal
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import (
+    QAbstractItemView, QApplication, QHeaderView, QStyle, QStyledItemDelegate, QStyleOptionButton, QTableView,
+    QToolTip
+)
+
+# Nombre de lignes ajoutées à la vue à chaque fetchMore (défilement vers le bas)
+FETCH_PAGE_SIZE = 200
+
+# Clé des lignes de titre (ex. « 📅 Arrivées du ... ») : elles s'étendent sur toute la largeur
+TITRE = "_titre"
+
+
+def ligne_titre(texte):
+    """Ligne de titre de groupe, à insérer parmi les lignes de données d'un RowTableModel."""
+    return {TITRE: texte}
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Modèle de table en lecture seule sur une liste de dictionnaires (les `data` des contrôleurs).
+    `columns` est une liste de (en-tête, accesseur) où l'accesseur reçoit la ligne et retourne le texte.
+    Les lignes sont exposées à la vue par pages de FETCH_PAGE_SIZE (canFetchMore / fetchMore) :
+    la vue ne demande les suivantes qu'en défilant, et seules les cellules visibles sont peintes.
+    Avec set_fetcher, les pages sont lues en base au fil du défilement au lieu d'être toutes en mémoire.
+    """
+    fetch_failed = Signal(str)
+
+    def __init__(self, columns, parent=None, page_size=FETCH_PAGE_SIZE):
+        super().__init__(parent)
+        self.columns = columns
+        self.page_size = page_size
+        self._all_rows = []
+        self._rows = []
+        self._loaded = 0
+        self._filter = None
+        self._fetch = None
+        self._loader = None
+        self._next = None
+        self._fetching = False
+
+    # --- Données ---
+
+    def set_rows(self, rows):
+        """Remplace toutes les lignes (le filtre courant est conservé)."""
+        self._fetch = None
+        self._next = None
+        self._all_rows = list(rows)
+        self._reset()
+
+    def set_fetcher(self, fetch, loader):
+        """
+        Pagination côté base : `fetch(after)` retourne (lignes, clé suivante) et s'exécute en arrière-plan
+        via `loader` (AsyncLoader). La première page est lue sur le canal "page", les suivantes sur
+        le canal "more" quand la vue arrive en bas ; une nouvelle demande remplace la précédente.
+        """
+        self._fetch = fetch
+        self._loader = loader
+        self._loader.cancel("more")
+        self._filter = None
+        self._next = None
+        self._fetching = True
+        self._all_rows = []
+        self._reset()
+        loader.load(fetch, None, on_result=self._first_page, on_error=self._fetch_error, channel="page")
+
+    def _first_page(self, result):
+        rows, self._next = result
+        self._fetching = False
+        self._all_rows = list(rows)
+        self._reset()
+
+    def _next_page(self, result):
+        rows, self._next = result
+        self._fetching = False
+        # Avec un filtre, _rows est une liste distincte : seules les lignes retenues y sont ajoutées
+        retenues = self._filtrer(rows)
+        if not retenues:
+            self._all_rows.extend(rows)
+            # Aucune ligne affichée ne s'ajoute, la vue ne redemandera rien : on lit la page suivante.
+            if self._next is not None:
+                self.fetchMore()
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(retenues) - 1)
+        self._all_rows.extend(rows)
+        if self._rows is not self._all_rows:
+            self._rows.extend(retenues)
+        self._loaded = len(self._rows)
+        self.endInsertRows()
+
+    def _fetch_error(self, message):
+        self._fetching = False
+        self._next = None
+        self.fetch_failed.emit(message)
+
+    def set_filter(self, predicate):
+        """N'affiche que les lignes pour lesquelles `predicate(ligne)` est vrai (None : toutes)."""
+        self._filter = predicate
+        self._reset()
+
+    def _filtrer(self, rows):
+        if self._filter is None:
+            return rows
+        return [row for row in rows if TITRE in row or self._filter(row)]
+
+    def _reset(self):
+        self.beginResetModel()
+        self._rows = self._all_rows if self._filter is None else self._filtrer(self._all_rows)
+        # Pages lues en base : chaque page reçue est exposée en entier
+        self._loaded = len(self._rows) if self._fetch is not None else min(self.page_size, len(self._rows))
+        self.endResetModel()
+
+    def all_rows(self):
+        """Toutes les lignes reçues, avant filtre."""
+        return self._all_rows
+
+    def row_at(self, row):
+        return self._rows[row]
+
+    def is_title(self, row):
+        return TITRE in self._rows[row]
+
+    # --- Interface QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self._fetch is not None:
+            return self._next is not None and not self._fetching
+        return self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self._fetch is not None:
+            if self._next is not None and not self._fetching:
+                self._fetching = True
+                self._loader.load(self._fetch, self._next, on_result=self._next_page,
+                                  on_error=self._fetch_error, channel="more")
+            return
+        count = min(self.page_size, len(self._rows) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if TITRE in row:
+            if role == Qt.DisplayRole and index.column() == 0:
+                return row[TITRE]
+            if role == Qt.FontRole:
+                return QFont("Segoe UI", 10, QFont.Bold)
+            if role == Qt.BackgroundRole:
+                return Qt.lightGray
+            return None
+        if role == Qt.DisplayRole:
+            value = self.columns[index.column()][1](row)
+            return "" if value is None else str(value)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def flags(self, index):
+        if index.isValid() and self.is_title(index.row()):
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+class RowTableView(QTableView):
+    """
+    Vue d'un RowTableModel : hauteur de ligne fixe (pas de calcul par ligne) et lignes de titre
+    étendues sur toute la largeur, y compris pour les lignes ajoutées par fetchMore.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(34)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setMouseTracking(True)
+        model.modelReset.connect(self._on_reset)
+        model.rowsInserted.connect(lambda _parent, first, last: self._apply_spans(first, last))
+
+    def _on_reset(self):
+        self.clearSpans()
+        self._apply_spans(0, self.model().rowCount() - 1)
+
+    def _apply_spans(self, first, last):
+        model = self.model()
+        for row in range(first, last + 1):
+            if model.is_title(row):
+                self.setSpan(row, 0, 1, model.columnCount())
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """
+    Peint les boutons d'action d'une colonne au lieu de créer un widget par ligne.
+    `actions_for(ligne)` retourne la liste des boutons (action, libellé, info-bulle) de la ligne ;
+    sans bouton, le texte de la cellule est affiché en italique. Un clic émet `clicked(action, ligne)`.
+    """
+    clicked = Signal(str, object)
+
+    MARGIN = 5
+    SPACING = 5
+    PADDING = 16
+
+    def __init__(self, actions_for, parent=None):
+        super().__init__(parent)
+        self.actions_for = actions_for
+        self._pressed = None
+
+    def _buttons(self, option, index):
+        model = index.model()
+        if model.is_title(index.row()):
+            return []
+        metrics = option.fontMetrics
+        x = option.rect.left() + self.MARGIN
+        buttons = []
+        for action, label, tooltip in self.actions_for(model.row_at(index.row())):
+            width = metrics.horizontalAdvance(label) + self.PADDING
+            rect = QRect(x, option.rect.top() + 3, width, option.rect.height() - 6)
+            buttons.append((action, label, tooltip, rect))
+            x += width + self.SPACING
+        return buttons
+
+    def paint(self, painter, option, index):
+        buttons = self._buttons(option, index)
+        if not buttons:
+            option.font.setItalic(not index.model().is_title(index.row()))
+            super().paint(painter, option, index)
+            return
+        style = option.widget.style() if option.widget else QApplication.style()
+        for number, (action, label, tooltip, rect) in enumerate(buttons):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.State_Enabled
+            if self._pressed == (index.row(), number):
+                button.state |= QStyle.State_Sunken
+            else:
+                button.state |= QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def _hit(self, option, index, pos):
+        for number, (action, label, tooltip, rect) in enumerate(self._buttons(option, index)):
+            if rect.contains(pos):
+                return number, action
+        return None, None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            number, action = self._hit(option, index, event.position().toPoint())
+            if action is not None:
+                self._pressed = (index.row(), number)
+                option.widget.viewport().update(option.rect)
+                return True
+        elif event.type() == QEvent.MouseButtonRelease and self._pressed is not None:
+            number, action = self._hit(option, index, event.position().toPoint())
+            pressed, self._pressed = self._pressed, None
+            option.widget.viewport().update(option.rect)
+            if action is not None and pressed == (index.row(), number):
+                self.clicked.emit(action, model.row_at(index.row()))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip:
+            number, action = self._hit(option, index, event.pos())
+            if action is not None:
+                QToolTip.showText(event.globalPos(), self._buttons(option, index)[number][2], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def sizeHint(self, option, index):
+        hint = super().sizeHint(option, index)
+        buttons = self._buttons(option, index)
+        if buttons:
+            hint.setWidth(buttons[-1][3].right() - option.rect.left() + self.MARGIN)
+        return hint
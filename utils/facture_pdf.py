@@ -0,0 +1,149 @@
+# /home/soutonnoma/PycharmProjects/HotelManager/utils/facture_pdf.py
+"""
+Mise en page d'une facture PDF avec reportlab, à partir de données déjà chargées.
+Ce module n'importe ni Qt ni les contrôleurs : il est chargé tel quel par les processus
+de l'export par lot (utils/pdf_generator.exporter_factures_pdf).
+"""
+
+import os
+import re
+from datetime import date
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+
+LOGO_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'logo.png')
+
+
+def nom_fichier_facture(facture, client):
+    """Nom du fichier PDF d'une facture (sans les caractères interdits dans un nom de fichier)."""
+    nom = re.sub(r'[\\/:*?"<>|]+', "_", str(client.get('nom') or '')).strip()
+    return f"Facture_{facture['id']}_Client_{nom}.pdf"
+
+
+def construire_facture_pdf(donnees, chemin_pdf):
+    """
+    Écrit la facture dans `chemin_pdf`. `donnees` contient les dictionnaires "reservation", "client",
+    "facture" et "hotel", et les listes "items" et "paiements" (voir FactureModel.get_donnees_pdf).
+    Retourne la taille du fichier en octets.
+    """
+    reservation, client, facture = donnees["reservation"], donnees["client"], donnees["facture"]
+    facture_items, paiements = donnees["items"], donnees["paiements"]
+    hotel = donnees.get("hotel") or {}
+
+    doc = SimpleDocTemplate(chemin_pdf, pagesize=A4, topMargin=20 * mm, bottomMargin=20 * mm)
+    story = []
+    styles = getSampleStyleSheet()
+
+    # En-tête avec logo et infos de l'hôtel
+    logo = Image(LOGO_PATH, width=40 * mm, height=40 * mm) if os.path.exists(LOGO_PATH) else Paragraph("Logo Hôtel",
+                                                                                                       styles['h2'])
+
+    hotel_info_text = f"""
+        <b>{hotel.get('nom', 'Nom de votre Hôtel')}</b><br/>
+        {hotel.get('adresse', 'Adresse de votre hôtel')}<br/>
+        Tél : {hotel.get('telephone', 'Votre téléphone')} | Email : {hotel.get('email', 'Votre email')}<br/>
+        SIRET : {hotel.get('siret', 'Votre SIRET')}
+    """
+    hotel_info_para = Paragraph(hotel_info_text, styles['Normal'])
+
+    header_table = Table([[logo, hotel_info_para]], colWidths=[50 * mm, None])
+    header_table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    story.append(header_table)
+    story.append(Spacer(1, 15 * mm))
+
+    # Titre de la facture et infos client
+    titre_facture = Paragraph(f"FACTURE N° {facture['id']}", styles['h1'])
+    story.append(titre_facture)
+    story.append(Spacer(1, 2 * mm))
+
+    client_info_text = f"""
+        <b>Facturé à :</b><br/>
+        {client.get('nom', '')} {client.get('prenom', '')}<br/>
+        {client.get('adresse', 'Adresse non spécifiée')}<br/>
+        Tél : {client.get('tel', '')}
+    """
+    client_info_para = Paragraph(client_info_text, styles['Normal'])
+
+    facture_details_text = f"""
+        <b>Date de facturation :</b> {date.today().strftime('%d/%m/%Y')}<br/>
+        <b>Réservation N° :</b> {reservation['id']}<br/>
+        <b>Période du séjour :</b> {reservation['date_arrivee']} au {reservation['date_depart']}
+    """
+    facture_details_para = Paragraph(facture_details_text, styles['Normal'])
+
+    info_table = Table([[client_info_para, facture_details_para]], colWidths=['50%', '50%'])
+    info_table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    story.append(info_table)
+    story.append(Spacer(1, 10 * mm))
+
+    # Tableau des lignes de la facture
+    table_data = [
+        ["Description", "Qté", "P.U. (HT)", "Montant (TTC)"]
+    ]
+    for item in facture_items:
+        table_data.append([
+            item['description'],
+            item['quantite'],
+            f"{item['prix_unitaire_ht']:,.0f} FCFA",
+            f"{item['montant_ttc']:,.0f} FCFA"
+        ])
+
+    invoice_table = Table(table_data, colWidths=[None, 25 * mm, 35 * mm, 40 * mm])
+    invoice_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#4a69bd")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    story.append(invoice_table)
+    story.append(Spacer(1, 5 * mm))
+
+    # Section des totaux
+    total_ht = facture.get('montant_total_ht', 0)
+    total_tva = facture.get('montant_total_tva', 0)
+    total_ttc = facture.get('montant_total_ttc', 0)
+    total_paye = facture.get('montant_paye', 0)
+    reste_a_payer = total_ttc - total_paye
+
+    totals_data = [
+        ['Sous-total (HT):', f"{total_ht:,.0f} FCFA"],
+        ['Total TVA:', f"{total_tva:,.0f} FCFA"],
+        ['Total TTC:', f"{total_ttc:,.0f} FCFA"],
+        ['Montant Payé:', f"{total_paye:,.0f} FCFA"],
+        [Paragraph("<b>Reste à Payer:</b>", styles['Normal']),
+         Paragraph(f"<b>{reste_a_payer:,.0f} FCFA</b>", styles['Normal'])]
+    ]
+
+    totals_table = Table(totals_data, colWidths=[None, 40 * mm])
+    totals_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('GRID', (0, 0), (-1, -1), 1, colors.white),  # Grille invisible
+        ('FONTNAME', (0, 4), (1, 4), 'Helvetica-Bold'),
+    ]))
+    story.append(totals_table)
+    story.append(Spacer(1, 10 * mm))
+
+    # Pied de page
+    methodes_paiement = " / ".join(sorted(list({p['methode'] for p in paiements}))) if paiements else "N/A"
+    footer_text = f"Payé par : {methodes_paiement}<br/><br/>Merci de votre confiance et à bientôt !"
+    footer_para = Paragraph(footer_text, ParagraphStyle(name='Footer', alignment=TA_CENTER, fontSize=10))
+    story.append(footer_para)
+
+    doc.build(story)
+    return os.path.getsize(chemin_pdf)